@@ -0,0 +1,50 @@
+/*
+ * _pack565.c — RGB888 → big-endian RGB565 packer for the HAT display.
+ *
+ * Optional accelerator for hat_ui.ST7735S.pack(); loaded with ctypes when
+ * _pack565.so sits next to hat_ui.py, otherwise the Numba/NumPy paths run.
+ * install.sh builds it; by hand:
+ *
+ *     gcc -O3 -shared -fPIC -o _pack565.so _pack565.c
+ *
+ * On ARMv8 (Pi 4/5) the NEON path packs 16 pixels per iteration:
+ * vld3q de-interleaves R/G/B, two vsri inserts merge the fields and
+ * vrev16 swaps to the panel's big-endian byte order.
+ */
+#include <stddef.h>
+#include <stdint.h>
+#ifdef __ARM_NEON
+#include <arm_neon.h>
+#endif
+
+#ifdef __ARM_NEON
+static inline uint8x16_t pack8(uint8x8_t r, uint8x8_t g, uint8x8_t b)
+{
+    uint16x8_t v = vshll_n_u8(r, 8);                /* rrrrrrrr ........ */
+    v = vsriq_n_u16(v, vshll_n_u8(g, 8), 5);        /* rrrrrggg gggggg.. */
+    v = vsriq_n_u16(v, vshll_n_u8(b, 8), 11);       /* rrrrrggg gggbbbbb */
+    return vrev16q_u8(vreinterpretq_u8_u16(v));
+}
+#endif
+
+void pack_rgb565_be(const uint8_t *rgb, uint8_t *out, size_t npix)
+{
+    size_t i = 0;
+#ifdef __ARM_NEON
+    for (; i + 16 <= npix; i += 16) {
+        uint8x16x3_t px = vld3q_u8(rgb + 3 * i);
+        vst1q_u8(out + 2 * i,
+                 pack8(vget_low_u8(px.val[0]), vget_low_u8(px.val[1]),
+                       vget_low_u8(px.val[2])));
+        vst1q_u8(out + 2 * i + 16,
+                 pack8(vget_high_u8(px.val[0]), vget_high_u8(px.val[1]),
+                       vget_high_u8(px.val[2])));
+    }
+#endif
+    for (; i < npix; i++) {
+        const uint8_t *p = rgb + 3 * i;
+        uint16_t v = ((p[0] & 0xF8) << 8) | ((p[1] & 0xFC) << 3) | (p[2] >> 3);
+        out[2 * i]     = v >> 8;
+        out[2 * i + 1] = v & 0xFF;
+    }
+}
@@ -19,6 +19,14 @@ GPIO (BCM): KEY1=21 KEY2=20 KEY3=16
             JOY_UP=6 JOY_DOWN=19 JOY_LEFT=5 JOY_RIGHT=26 JOY_PRESS=13
             SPI: RST=27 DC=25 CS=CE0 BL=24
 
+Scheduling: the render/input thread and the SPI writer are pinned to CPU
+            $HAT_CPU (default 3, empty to disable) and raised to SCHED_FIFO,
+            which needs CAP_SYS_NICE (or root).  For the least jitter,
+            also keep the kernel off that core with isolcpus=3.
+
+SPI clock:  62.5 MHz by default; set $HAT_SPI_HZ (e.g. 40000000) if the
+            panel shows noise on your board.
+
 Standalone test:  python3 hat_ui.py
 With main tool:   python3 obsbot_capture.py --mode headless --hat
 """
@@ -27,9 +35,14 @@ __version__ = "0.1.0"
 
 import time
 import threading
+import queue
 import os
+import io
+import mmap
+import zlib
 import sys
 import math
+import functools
 from pathlib import Path
 
 # ─────────────────────────────────────────────
@@ -49,6 +62,7 @@ except ImportError:
 
 try:
     from PIL import Image, ImageDraw, ImageFont
+    import PIL
     PIL_OK = True
 except ImportError:
     PIL_OK = False
@@ -65,6 +79,22 @@ try:
 except ImportError:
     NP_OK = False
 
+try:
+    import numba
+    NUMBA_OK = True
+except ImportError:
+    NUMBA_OK = False
+
+# Optional NEON packer — build with install.sh (see _pack565.c)
+try:
+    import ctypes
+    _pack565 = ctypes.CDLL(str(Path(__file__).with_name("_pack565.so")))
+    _pack565.pack_rgb565_be.argtypes = (ctypes.c_char_p, ctypes.c_void_p, ctypes.c_size_t)
+    _pack565.pack_rgb565_be.restype  = None
+    PACK565_OK = True
+except (ImportError, OSError, AttributeError):
+    PACK565_OK = False
+
 # Import format table from main module (graceful — works standalone too)
 try:
     from obsbot_capture import OUTPUT_FORMATS, N_FORMATS
@@ -73,6 +103,20 @@ except ImportError:
                        "note":"~220Mbps","est_mbps":220,"cpu_warn":False}]
     N_FORMATS = 1
 
+
+def _format_mbps(fmt):
+    """Estimated bitrate of a format — est_mbps, else parsed from its note."""
+    if fmt.get("est_mbps"):
+        return fmt["est_mbps"]
+    try:
+        note = fmt.get("note", "")
+        return int([w for w in note.replace("~","").split() if "Mbps" in w][0].replace("Mbps",""))
+    except Exception:
+        return 50
+
+
+FORMAT_MBPS = tuple(_format_mbps(f) for f in OUTPUT_FORMATS)
+
 # ─────────────────────────────────────────────
 #  GPIO Pin Definitions (BCM)
 # ─────────────────────────────────────────────
@@ -89,6 +133,11 @@ ALL_INPUT_PINS = [
     PIN_KEY1, PIN_KEY2, PIN_KEY3,
     PIN_JOY_UP, PIN_JOY_DOWN, PIN_JOY_LEFT, PIN_JOY_RIGHT, PIN_JOY_PRESS,
 ]
+PIN_IDX = {pin: i for i, pin in enumerate(ALL_INPUT_PINS)}
+
+# BCM283x GPIO block — GPLEV0 holds the level of GPIO 0–31 in one word
+GPIO_MEM = "/dev/gpiomem"
+GPLEV0   = 0x34
 
 # ─────────────────────────────────────────────
 #  ST7735S SPI Display Driver
@@ -101,12 +150,54 @@ VMCTR1=0xC5;  GMCTRP1=0xE0; GMCTRN1=0xE1
 
 PIN_RST=27; PIN_DC=25; PIN_BL=24
 LCD_W=128; LCD_H=128; COL_OFFSET=2
+STRIPE_H=8      # rows per dirty-tracking stripe in write_frame()
+HAT_CPU=os.environ.get("HAT_CPU", "3")
+SPI_HZ=62_500_000           # override with $HAT_SPI_HZ
+SPI_HZ_SAFE=40_000_000
+HAT_RT_PRIO=10
 
 
 def _rgb565(r, g, b):
     return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
 
 
+if NUMBA_OK:
+    @numba.njit(cache=True, boundscheck=False)
+    def _pack_rgb565_be(px, out, ri=0, bi=2):
+        """
+        Pack 24-bit pixels into big-endian RGB565 in a single pass.
+        ri/bi are the red and blue byte offsets: 0/2 for RGB, 2/0 for BGR.
+        """
+        for i in range(out.shape[0] // 2):
+            v = ((px[i*3+ri] & 0xF8) << 8) | ((px[i*3+1] & 0xFC) << 3) | (px[i*3+bi] >> 3)
+            out[2*i]   = v >> 8
+            out[2*i+1] = v & 0xFF
+
+
+def _pin_thread():
+    """Pin the calling thread to HAT_CPU and make it SCHED_FIFO if allowed."""
+    try:
+        cpu = int(HAT_CPU)
+        if cpu in os.sched_getaffinity(0):
+            os.sched_setaffinity(0, {cpu})
+    except (AttributeError, ValueError, OSError):
+        pass
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(HAT_RT_PRIO))
+    except (AttributeError, OSError):
+        pass
+
+
+def _pack_rgb565_np(px, out, ri=0, bi=2):
+    """Vectorised numpy fallback for _pack_rgb565_be()."""
+    arr = px.reshape(-1, 3)
+    r = arr[:, ri].astype(np.uint16)
+    g = arr[:, 1].astype(np.uint16)
+    b = arr[:, bi].astype(np.uint16)
+    # Big Endian view writes high byte first
+    out.view(">u2")[:] = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
 class ST7735S:
     def __init__(self):
         if not GPIO_OK: raise RuntimeError("RPi.GPIO not available")
@@ -117,8 +208,23 @@ class ST7735S:
             GPIO.setup(p, GPIO.OUT)
         self.spi = spidev.SpiDev()
         self.spi.open(0, 0)
-        self.spi.max_speed_hz = 40_000_000
+        try:
+            self.spi.max_speed_hz = int(os.environ.get("HAT_SPI_HZ", SPI_HZ))
+        except (ValueError, OSError) as e:
+            print(f"[HAT] SPI clock rejected ({e}) — using {SPI_HZ_SAFE // 1_000_000} MHz")
+            self.spi.max_speed_hz = SPI_HZ_SAFE
         self.spi.mode = 0
+        # spidev >= 3.4 takes any buffer of any length and chunks it in C
+        self._xfer = getattr(self.spi, "writebytes2", None)
+        # Packed RGB565 frame, allocated once and reused every frame
+        self._pack_out = self.new_buffer()
+        self._stripe_crc = [None] * (LCD_H // STRIPE_H)
+        self._win = [None, None]    # last CASET / RASET ranges sent
+        # Copy of what the panel shows, for narrowing dirty stripes to the
+        # changed columns; only trusted once a full frame has gone out
+        self._shadow = np.zeros((LCD_H, LCD_W*2), np.uint8) if NP_OK else None
+        self._crop   = self.new_buffer() if NP_OK else None  # narrowed-run staging
+        self._narrow = False
         self._init_display()
         self.backlight(True)
 
@@ -127,7 +233,9 @@ class ST7735S:
 
     def _data(self, d):
         GPIO.output(PIN_DC, 1)
-        d = [d] if isinstance(d, int) else list(d)
+        d = bytes([d]) if isinstance(d, int) else bytes(d)
+        if self._xfer:
+            self._xfer(d); return
         for i in range(0, len(d), 4096): self.spi.writebytes(d[i:i+4096])
 
     def _reset(self):
@@ -164,39 +272,122 @@ class ST7735S:
         GPIO.output(PIN_BL, 1 if on else 0)
 
     def set_window(self, x0, y0, x1, y1):
+        # The panel keeps CASET/RASET until changed — only resend what moved
         x0+=COL_OFFSET; x1+=COL_OFFSET
-        self._cmd(CASET); self._data([0x00,x0,0x00,x1])
-        self._cmd(RASET); self._data([0x00,y0,0x00,y1])
+        if self._win[0] != (x0, x1):
+            self._cmd(CASET); self._data([0x00,x0,0x00,x1])
+            self._win[0] = (x0, x1)
+        if self._win[1] != (y0, y1):
+            self._cmd(RASET); self._data([0x00,y0,0x00,y1])
+            self._win[1] = (y0, y1)
         self._cmd(RAMWR)
 
-    def display_image(self, img):
+    @staticmethod
+    def new_buffer():
+        """Allocate a buffer for one packed 128×128 RGB565 frame."""
+        if NP_OK:
+            return np.empty(LCD_W * LCD_H * 2, dtype=np.uint8)
+        return bytearray(LCD_W * LCD_H * 2)
+
+    def pack(self, img, out):
+        """Convert a PIL image to big-endian RGB565 bytes in ``out``."""
         if img.size != (LCD_W, LCD_H):
             img = img.resize((LCD_W, LCD_H))
-        self.set_window(0, 0, LCD_W-1, LCD_H-1)
-        px  = img.convert("RGB").tobytes()
-
-        if NP_OK:
-            # Vectorized numpy implementation (approx 100x faster)
-            arr = np.frombuffer(px, dtype=np.uint8).reshape(-1, 3)
-            r = arr[:, 0].astype(np.uint16)
-            g = arr[:, 1].astype(np.uint16)
-            b = arr[:, 2].astype(np.uint16)
-            v = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-            # Big Endian: High byte first
-            res = np.empty((arr.shape[0], 2), dtype=np.uint8)
-            res[:, 0] = (v >> 8).astype(np.uint8)
-            res[:, 1] = (v & 0xFF).astype(np.uint8)
-            buf = res.tobytes()
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        px  = img.tobytes()
+
+        # Shift/mask beats byte-swapped 256-entry LUTs on both paths: the
+        # gathers cost more than the arithmetic they replace (numba ~5x,
+        # numpy ~2-3x slower with LUTs), so the packing stays computed.
+        if PACK565_OK:
+            dst = (ctypes.c_ubyte * len(out)).from_buffer(out)
+            _pack565.pack_rgb565_be(px, ctypes.addressof(dst), LCD_W * LCD_H)
+        elif NUMBA_OK:
+            _pack_rgb565_be(np.frombuffer(px, dtype=np.uint8), out)
+        elif NP_OK:
+            _pack_rgb565_np(np.frombuffer(px, dtype=np.uint8), out)
         else:
-            buf = bytearray(LCD_W * LCD_H * 2)
             for i in range(LCD_W * LCD_H):
                 r=px[i*3]; g=px[i*3+1]; b=px[i*3+2]
                 v=_rgb565(r,g,b)
-                buf[i*2]=(v>>8)&0xFF; buf[i*2+1]=v&0xFF
+                out[i*2]=(v>>8)&0xFF; out[i*2+1]=v&0xFF
+        return out
+
+    def pack_bgr(self, bgr, out):
+        """Pack a 128×128 BGR uint8 array (cv2 layout) to RGB565 in ``out``."""
+        px = bgr.reshape(-1)
+        if NUMBA_OK:
+            _pack_rgb565_be(px, out, 2, 0)
+        else:
+            _pack_rgb565_np(px, out, 2, 0)
+        return out
+
+    def write_frame(self, buf):
+        """
+        Push a packed full-screen frame over SPI.  The frame is split into
+        STRIPE_H-row stripes and only stripes whose CRC changed since the
+        last frame are sent — an unchanged frame costs no bus time at all.
+        With numpy, each run of dirty stripes is further cropped to the
+        columns that differ from the shadow copy of the panel.
+        """
+        data   = memoryview(buf)
+        stride = LCD_W * 2 * STRIPE_H
+        dirty  = []
+        for i, prev in enumerate(self._stripe_crc):
+            crc = zlib.crc32(data[i*stride:(i+1)*stride])
+            if crc != prev:
+                self._stripe_crc[i] = crc
+                dirty.append(i)
+
+        # Send each run of adjacent dirty stripes as one window
+        run = 0
+        while run < len(dirty):
+            end = run
+            while end + 1 < len(dirty) and dirty[end + 1] == dirty[end] + 1:
+                end += 1
+            y0, y1 = dirty[run] * STRIPE_H, (dirty[end] + 1) * STRIPE_H
+            run = end + 1
+            if self._shadow is None:
+                self.set_window(0, y0, LCD_W-1, y1-1)
+                GPIO.output(PIN_DC, 1)
+                self._write(data[y0*LCD_W*2:y1*LCD_W*2])
+                continue
+            rows = np.frombuffer(data, np.uint8).reshape(LCD_H, LCD_W*2)[y0:y1]
+            x0, x1 = 0, LCD_W - 1
+            if self._narrow:
+                cols = np.flatnonzero((rows != self._shadow[y0:y1]).any(axis=0))
+                if cols.size == 0:
+                    continue
+                x0, x1 = int(cols[0]) // 2, int(cols[-1]) // 2
+            self._shadow[y0:y1] = rows
+            self.set_window(x0, y0, x1, y1-1)
+            GPIO.output(PIN_DC, 1)
+            if x1 - x0 == LCD_W - 1:
+                self._write(data[y0*LCD_W*2:y1*LCD_W*2])
+                continue
+            span = (x1 - x0 + 1) * 2
+            crop = self._crop[:(y1 - y0) * span]
+            np.copyto(crop.reshape(y1 - y0, span), rows[:, x0*2:(x1+1)*2])
+            self._write(memoryview(crop))
+        if self._shadow is not None and len(dirty) == len(self._stripe_crc):
+            self._narrow = True
+
+    def invalidate(self):
+        """Forget the on-panel contents so the next write_frame() sends it all."""
+        self._stripe_crc = [None] * len(self._stripe_crc)
+        self._win = [None, None]
+        self._narrow = False
+
+    def _write(self, data):
+        if self._xfer:
+            self._xfer(data)
+        else:
+            for i in range(0, len(data), 4096):
+                self.spi.writebytes(bytes(data[i:i+4096]))
 
-        GPIO.output(PIN_DC, 1)
-        for i in range(0, len(buf), 4096):
-            self.spi.writebytes(list(buf[i:i+4096]))
+    def display_image(self, img):
+        self.write_frame(self.pack(img, self._pack_out))
 
     def fill(self, color=(0,0,0)):
         self.display_image(Image.new("RGB",(LCD_W,LCD_H),color))
@@ -228,6 +419,10 @@ PAGES = ["LIVE", "STATUS", "EXPOSURE", "WHITE BAL", "FOCUS", "DISPLAY", "AUDIO",
 N_PAGES = len(PAGES)
 PAGE_COLORS = [C_RED, C_WHITE, C_AMBER, C_CYAN, C_GREEN, C_CYAN, C_GREEN, C_MAGENTA, C_LGRAY]
 
+# Scale ticks under the WHITE BAL (2000–10000 K) and FOCUS bars
+WB_TICKS    = [(3+int(((k-2000)/8000)*(LCD_W-48)), lbl) for k, lbl in [(3200,"3.2"),(5600,"D"),(6500,"6.5")]]
+FOCUS_TICKS = [3+int(frac*(LCD_W-48)) for frac in (0.25, 0.5, 0.75)]
+
 
 # ─────────────────────────────────────────────
 #  Frame Grabber — live camera feed for HAT
@@ -248,8 +443,12 @@ class FrameGrabber:
         self._stop       = threading.Event()
         self._thread     = None
         self._frame      = None
+        self._bgr        = None     # same frame as a 128x128 BGR array (numpy path)
         self._ok         = False
         self._fed        = False
+        self._gen        = 0        # bumped per fed frame (HatUI dirty check)
+        self._M          = None     # crop+scale affine for the current source shape
+        self._M_shape    = None
         self._placeholder = self._make_placeholder()
 
     def _make_placeholder(self):
@@ -267,21 +466,44 @@ class FrameGrabber:
         if bgr_frame is None or not CV2_OK:
             return
         try:
-            rgb  = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
-            h, w = rgb.shape[:2]
-            sq   = min(h, w)
-            y0   = (h - sq) // 2
-            x0   = (w - sq) // 2
-            pil  = Image.fromarray(
-                rgb[y0:y0+sq, x0:x0+sq]
-            ).resize((LCD_W, LCD_H), Image.BILINEAR)
+            if NP_OK:
+                small = cv2.warpAffine(bgr_frame, self._affine(bgr_frame.shape),
+                                       (LCD_W, LCD_H), flags=cv2.INTER_LINEAR)
+                rgb   = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+                pil   = Image.frombuffer("RGB", (LCD_W, LCD_H), rgb, "raw", "RGB", 0, 1)
+            else:
+                small = None
+                rgb  = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
+                h, w = rgb.shape[:2]
+                sq   = min(h, w)
+                y0   = (h - sq) // 2
+                x0   = (w - sq) // 2
+                pil  = Image.fromarray(
+                    rgb[y0:y0+sq, x0:x0+sq]
+                ).resize((LCD_W, LCD_H), Image.BILINEAR)
             with self._lock:
                 self._frame = pil
+                self._bgr   = small
                 self._ok    = True
                 self._fed   = True
+                self._gen  += 1
         except Exception:
             pass
 
+    def _affine(self, shape):
+        """Center-crop + downscale to LCD size as one affine map (cached per shape)."""
+        if shape[:2] != self._M_shape:
+            h, w  = shape[:2]
+            sq    = min(h, w)
+            y0    = (h - sq) // 2
+            x0    = (w - sq) // 2
+            scale = LCD_W / sq
+            # Pixel-centre aligned: dst + 0.5 = scale * (src - origin + 0.5)
+            self._M = np.array([[scale, 0, scale * (0.5 - x0) - 0.5],
+                                [0, scale, scale * (0.5 - y0) - 0.5]], np.float32)
+            self._M_shape = shape[:2]
+        return self._M
+
     def start(self):
         """Start background thread — it waits for feed_frame() before opening camera."""
         if not CV2_OK:
@@ -328,13 +550,28 @@ class FrameGrabber:
         cap.release()
 
     def get(self) -> "Image.Image":
+        """
+        Latest frame (or the placeholder).  The image is shared, not copied —
+        feed_frame() swaps in a fresh one — so callers that draw on it must
+        take their own .copy() first.
+        """
+        with self._lock:
+            return self._frame if self._frame is not None else self._placeholder
+
+    def get_bgr(self):
+        """Latest frame as a 128x128 BGR array, or None.  Shared — read only."""
         with self._lock:
-            return self._frame.copy() if self._frame is not None else self._placeholder.copy()
+            return self._bgr
 
     @property
     def ready(self) -> bool:
         return self._ok
 
+    @property
+    def gen(self) -> int:
+        """Frame counter — changes whenever get() would return a new image."""
+        return self._gen
+
     def stop(self):
         self._stop.set()
         if self._thread:
@@ -345,9 +582,10 @@ class FrameGrabber:
 #  GPIO Input Handler
 # ─────────────────────────────────────────────
 class HatInput:
-    DEBOUNCE_MS    = 70
-    HOLD_DELAY_MS  = 400
-    HOLD_REPEAT_MS = 110
+    # Integer nanoseconds on the monotonic clock — immune to NTP steps
+    DEBOUNCE_NS    = 70_000_000
+    HOLD_DELAY_NS  = 400_000_000
+    HOLD_REPEAT_NS = 110_000_000
 
     def __init__(self):
         if not GPIO_OK: raise RuntimeError("RPi.GPIO not available")
@@ -355,42 +593,83 @@ class HatInput:
         GPIO.setwarnings(False)
         for pin in ALL_INPUT_PINS:
             GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        self._last  = {p: True for p in ALL_INPUT_PINS}
-        self._ptime = {p: 0.0  for p in ALL_INPUT_PINS}
-        self._rtime = {p: 0.0  for p in ALL_INPUT_PINS}
-        self._etime = {p: 0.0  for p in ALL_INPUT_PINS}
+        # Per-pin state, indexed like ALL_INPUT_PINS (see PIN_IDX)
+        n = len(ALL_INPUT_PINS)
+        self._last  = [True] * n
+        self._ptime = [0] * n
+        self._rtime = [0] * n
+        self._etime = [0] * n
+        self._mem   = self._map_levels()
+
+    @staticmethod
+    def _map_levels():
+        """
+        Map the BCM283x GPIO registers so every pin level comes from a
+        single word read.  Pi 5 routes the header through RP1, which has
+        a different register layout — there we stay on GPIO.input().
+        """
+        try:
+            with open("/proc/device-tree/compatible", "rb") as f:
+                if b"bcm2712" in f.read():
+                    return None
+            fd = os.open(GPIO_MEM, os.O_RDONLY | os.O_SYNC)
+            try:
+                return mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ)
+            finally:
+                os.close(fd)
+        except (OSError, ValueError):
+            return None
+
+    def _read_levels(self):
+        """Return the GPIO 0–31 levels as one int (bit set = high)."""
+        if self._mem is not None:
+            return int.from_bytes(self._mem[GPLEV0:GPLEV0+4], "little")
+        lvl = 0
+        for pin in ALL_INPUT_PINS:
+            if GPIO.input(pin) != GPIO.LOW:
+                lvl |= 1 << pin
+        return lvl
 
     def get_events(self):
-        now    = time.time()
+        now    = time.monotonic_ns()
         events = []
-        repeat_pins = {PIN_JOY_UP, PIN_JOY_DOWN}
+        repeat_pins = (PIN_IDX[PIN_JOY_UP], PIN_IDX[PIN_JOY_DOWN])
+        lvl    = self._read_levels()
 
-        for pin in ALL_INPUT_PINS:
-            pressed = (GPIO.input(pin) == GPIO.LOW)
-            was     = not self._last[pin]
+        for i, pin in enumerate(ALL_INPUT_PINS):
+            pressed = not (lvl >> pin) & 1
+            was     = not self._last[i]
             if pressed and not was:
-                if (now - self._etime[pin]) * 1000 > self.DEBOUNCE_MS:
+                if now - self._etime[i] > self.DEBOUNCE_NS:
                     events.append((pin, 'press'))
-                    self._ptime[pin] = self._rtime[pin] = self._etime[pin] = now
-            elif pressed and was and pin in repeat_pins:
-                held_ms   = (now - self._ptime[pin]) * 1000
-                repeat_ms = (now - self._rtime[pin]) * 1000
-                if held_ms > self.HOLD_DELAY_MS and repeat_ms > self.HOLD_REPEAT_MS:
+                    self._ptime[i] = self._rtime[i] = self._etime[i] = now
+            elif pressed and was and i in repeat_pins:
+                if (now - self._ptime[i] > self.HOLD_DELAY_NS
+                        and now - self._rtime[i] > self.HOLD_REPEAT_NS):
                     events.append((pin, 'repeat'))
-                    self._rtime[pin] = now
-            self._last[pin] = (not pressed)  # True=released
+                    self._rtime[i] = now
+            self._last[i] = (not pressed)  # True=released
         return events
 
 
 # ─────────────────────────────────────────────
 #  Drawing helpers
 # ─────────────────────────────────────────────
+_RES_SHORT = {"3840x2160": "4K", "1920x1080": "1080p", "1280x720": "720p"}
+
+def _short_res(res):
+    """Display name for a resolution string ("3840x2160" → "4K")."""
+    return _RES_SHORT.get(res, res)
+
+
 def _bar(draw, x, y, w, h, frac, fg, bg=C_BAR_BG, outline=None):
     frac = max(0.0, min(1.0, frac))
-    draw.rectangle([x, y, x+w, y+h], fill=bg)
     filled = int(frac * w)
+    # Filled and empty parts are drawn side by side — no pixel is painted twice
     if filled > 0:
         draw.rectangle([x, y, x+filled, y+h], fill=fg)
+    if filled < w:
+        draw.rectangle([x+filled+1 if filled > 0 else x, y, x+w, y+h], fill=bg)
     if outline:
         draw.rectangle([x, y, x+w, y+h], outline=outline)
 
@@ -403,26 +682,34 @@ def _db_bar(draw, x, y, w, h, level):
     frac = (db+60)/60
     fill = int(frac*w)
     g_e  = int(w*0.60); a_e = int(w*0.80)
-    draw.rectangle([x, y, x+w, y+h], fill=C_BAR_BG)
     if fill > 0:
         draw.rectangle([x, y, x+min(fill,g_e), y+h], fill=C_GREEN)
     if fill > g_e:
         draw.rectangle([x+g_e, y, x+min(fill,a_e), y+h], fill=C_AMBER)
     if fill > a_e:
         draw.rectangle([x+a_e, y, x+fill, y+h], fill=C_RED)
+    if fill < w:
+        draw.rectangle([x+fill+1 if fill > 0 else x, y, x+w, y+h], fill=C_BAR_BG)
     if 0 < fill < w:
         draw.line([x+fill, y, x+fill, y+h], fill=C_WHITE, width=1)
 
 
+_DARK_MASKS = {}
+
 def _dark_box(img, x, y, w, h, alpha=180):
     """
-    Composite a dark semi-transparent rectangle onto a PIL image.
-    Used for overlay panels on top of live video.
+    Darken a rectangle of a PIL image in place, as if a black layer at
+    ``alpha`` were composited over it.  Used for overlay panels on top of
+    live video.  Only the box is touched — a constant L mask (cached per
+    size/alpha) drives a black paste instead of a full-frame RGBA composite.
     """
-    overlay = Image.new("RGBA", img.size, (0,0,0,0))
-    draw    = ImageDraw.Draw(overlay)
-    draw.rectangle([x, y, x+w, y+h], fill=(0,0,0,alpha))
-    return Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
+    box  = (x, y, min(x+w+1, img.width), min(y+h+1, img.height))
+    size = (box[2]-box[0], box[3]-box[1])
+    mask = _DARK_MASKS.get((size, alpha))
+    if mask is None:
+        mask = _DARK_MASKS[(size, alpha)] = Image.new("L", size, alpha)
+    img.paste((0, 0, 0), box, mask)
+    return img
 
 
 # ─────────────────────────────────────────────
@@ -441,6 +728,11 @@ class HatUI:
     in the bottom-right corner so you always have eyes on the shot.
     """
 
+    # DISPLAY page toggles: (label, state attribute, default)
+    _DISPLAY_ITEMS = (("Guides",    "show_guides",    True),
+                      ("Histogram", "show_histogram", False),
+                      ("Peaking",   "focus_peaking",  False))
+
     def __init__(self, state):
         self.state    = state
         self.display  = None
@@ -448,7 +740,10 @@ class HatUI:
         self.grabber  = None
         self._stop    = threading.Event()
         self._thread  = None
+        self._tx_thread = None
         self._page    = 1       # start on STATUS; navigate left for LIVE
+        self._state_gen = 0     # bumped on every input event
+        self._last_key  = None  # _frame_key() of the last frame sent
         self._sub     = 0       # sub-cursor within a page
 
         # Live view HUD overlay toggle
@@ -459,8 +754,42 @@ class HatUI:
         self._flash_t   = 0.0
         self._flash_col = C_WHITE
 
+        # Per-frame clock, sampled once at the top of each render
+        self._tnow  = 0.0
+        self._blink = True      # 2 Hz REC blink phase
+        self._disk  = None      # (time, key, info) — see _disk_info()
+
+        # Bordered live thumbnails by (w, h); rebuilt only for new frames
+        self._thumbs    = {}
+        self._thumb_key = None
+
         # Fonts
         self._font_lg = self._font_md = self._font_sm = self._font_xs = None
+        self._glyphs  = {}      # (font id, char) → (L mask | None, advance)
+        self._label   = functools.lru_cache(maxsize=256)(self._build_label)
+        self._width   = functools.lru_cache(maxsize=256)(self._measure)
+
+        # Page body renderers, indexed like PAGES (LIVE has its own path)
+        by_name = {
+            "STATUS":   self._pg_status,
+            "EXPOSURE": self._pg_exposure,
+            "WHITE BAL":self._pg_wb,
+            "FOCUS":    self._pg_focus,
+            "DISPLAY":  self._pg_display,
+            "AUDIO":    self._pg_audio,
+            "FORMAT":   self._pg_format,
+            "STORAGE":  self._pg_storage,
+        }
+        self._page_renderers = [by_name.get(p) for p in PAGES]
+        self._page_chrome = None  # per page: (standby top bar, nav strip) images
+        self._rec_dot = None      # pixel indices of the clean-LIVE REC dot
+        self._rec_bars = None     # REC top bar with its dot, [dim, lit]
+        self._warmup   = None     # (accent, WARMING UP screen) — never drawn on
+        self._tx_q     = None     # packed frames for the SPI writer (start())
+        self._tx_bufs  = None     # two ping-pong frame buffers (start())
+        self._tx_idx   = 0
+        x0 = (LCD_W - N_PAGES*8)//2
+        self._dot_centers = [(x0 + i*8 + 3, LCD_H - 3) for i in range(N_PAGES)]
 
     # ─── Lifecycle ────────────────────────────────────────────────────
     def _load_fonts(self):
@@ -473,16 +802,81 @@ class HatUI:
         path = next((p for p in candidates if os.path.exists(p)), None)
         try:
             if path:
-                self._font_lg = ImageFont.truetype(path, 16)
-                self._font_md = ImageFont.truetype(path, 12)
-                self._font_sm = ImageFont.truetype(path, 10)
-                self._font_xs = ImageFont.truetype(path, 8)
+                # One read from disk; every size is built from the same bytes
+                data = Path(path).read_bytes()
+                self._font_lg = ImageFont.truetype(io.BytesIO(data), 16)
+                self._font_md = ImageFont.truetype(io.BytesIO(data), 12)
+                self._font_sm = ImageFont.truetype(io.BytesIO(data), 10)
+                self._font_xs = ImageFont.truetype(io.BytesIO(data), 8)
                 return
         except Exception:
             pass
         d = ImageFont.load_default()
         self._font_lg = self._font_md = self._font_sm = self._font_xs = d
 
+    def _warm_glyphs(self):
+        """Rasterise the characters every page uses so frame one is cached."""
+        chars = "0123456789:/.%+-#°KABCDEFGHIJLMNOPQRSTUVWXYZ ●○"
+        for font in dict.fromkeys((self._font_lg, self._font_md, self._font_sm, self._font_xs)):
+            for ch in chars:
+                self._glyph(font, ch)
+
+    def _glyph(self, font, ch):
+        key = (id(font), ch)
+        g   = self._glyphs.get(key)
+        if g is None:
+            _, _, r, b = font.getbbox(ch)
+            mask = None
+            if r > 0 and b > 0:
+                mask = Image.new("L", (r, b), 0)
+                ImageDraw.Draw(mask).text((0, 0), ch, fill=255, font=font)
+            g = self._glyphs[key] = (mask, font.getlength(ch))
+        return g
+
+    def _text(self, draw, xy, text, fill=None, font=None):
+        """
+        Draw text from cached per-character masks — FreeType runs once per
+        glyph, after that a label is a handful of bitmap blits.
+        """
+        if font is None:
+            draw.text(xy, text, fill=fill, font=font)
+            return
+        x, y = xy
+        if x == int(x):
+            # Whole label as one mask — static strings stay hot in the LRU
+            mask = self._label(font, text)
+            if mask is not None:
+                draw.bitmap((int(x), y), mask, fill=fill)
+            return
+        for ch in text:
+            mask, adv = self._glyph(font, ch)
+            if mask is not None:
+                draw.bitmap((int(x + 0.5), y), mask, fill=fill)
+            x += adv
+
+    def _measure(self, font, text, em=6):
+        """Advance width of ``text`` in pixels (``em`` per char without a font)."""
+        if font is None:
+            return len(text) * em
+        return int(sum(self._glyph(font, ch)[1] for ch in text) + 0.5)
+
+    def _build_label(self, font, text):
+        """Merge the glyph masks of ``text`` into one L mask (None if blank)."""
+        placed, x = [], 0.0
+        for ch in text:
+            mask, adv = self._glyph(font, ch)
+            if mask is not None:
+                placed.append((int(x + 0.5), mask))
+            x += adv
+        if not placed:
+            return None
+        w = max(off + m.width for off, m in placed)
+        h = max(m.height for _, m in placed)
+        label = Image.new("L", (w, h), 0)
+        for off, m in placed:
+            label.paste(255, (off, 0, off + m.width, m.height), m)
+        return label
+
     def start(self):
         missing = [n for n, ok in [("RPi.GPIO",GPIO_OK),("spidev",SPI_OK),("Pillow",PIL_OK)] if not ok]
         if missing:
@@ -492,12 +886,23 @@ class HatUI:
             self.display = ST7735S()
             self.inp     = HatInput()
             self._load_fonts()
+            self._warm_glyphs()
             self.display.fill(C_BG)
 
             # Reusable PIL buffers to avoid allocation loop
             self._canvas = Image.new("RGB", (LCD_W, LCD_H), C_BG)
             self._draw   = ImageDraw.Draw(self._canvas)
-            self._thumb_border = Image.new("RGB", (42, 32), C_MGRAY)
+            self._build_page_chrome()
+            if NP_OK:
+                dot = Image.new("L", (LCD_W, LCD_H), 0)
+                ImageDraw.Draw(dot).ellipse([LCD_W-12, 2, LCD_W-3, 11], fill=255)
+                self._rec_dot = np.flatnonzero(np.asarray(dot))
+
+            # SPI writer thread consumes packed frames while the render
+            # thread composes the next one.  Two buffers ping-pong so the
+            # writer never sees a frame that is being re-packed.
+            self._tx_q     = queue.Queue(maxsize=1)
+            self._tx_bufs  = [ST7735S.new_buffer(), ST7735S.new_buffer()]
 
             # Grabber created here but NOT started — the GUI calls
             # grabber.start() after it has its first frame, avoiding conflict
@@ -511,6 +916,8 @@ class HatUI:
             return False
 
         self._stop.clear()
+        self._tx_thread = threading.Thread(target=self._tx_loop, daemon=True, name="HatSPI")
+        self._tx_thread.start()
         self._thread = threading.Thread(target=self._run, daemon=True, name="HatUI")
         self._thread.start()
         return True
@@ -518,6 +925,7 @@ class HatUI:
     def stop(self):
         self._stop.set()
         if self._thread: self._thread.join(timeout=3)
+        if self._tx_thread: self._tx_thread.join(timeout=3)
         if self.grabber: self.grabber.stop()
         if self.display:
             try:
@@ -530,7 +938,7 @@ class HatUI:
 
     def flash(self, msg, color=C_WHITE):
         self._flash_msg = msg
-        self._flash_t   = time.time()
+        self._flash_t   = time.monotonic()
         self._flash_col = color
 
     # ─── V4L2 / main module lazy import ───────────────────────────────
@@ -548,6 +956,8 @@ class HatUI:
         dev = s.device
 
         events = self.inp.get_events()
+        if events:
+            self._state_gen += 1
         for pin, etype in events:
 
             # KEY1 — Record / Stop — sets trigger, GUI loop acts on it
@@ -670,7 +1080,7 @@ class HatUI:
             try:    idx = res_list.index(s.resolution)
             except: idx = 0
             s.resolution = res_list[(idx+1) % len(res_list)]
-            label = s.resolution.replace("3840x2160","4K").replace("1920x1080","1080p").replace("1280x720","720p")
+            label = _short_res(s.resolution)
             self.flash(label, C_MAGENTA)
         elif page == "FORMAT_FPS":  # internal placeholder (not reached)
             pass
@@ -754,18 +1164,86 @@ class HatUI:
     def _run(self):
         import traceback
         INTERVAL = 1.0 / 15
+        _pin_thread()
         while not self._stop.is_set():
-            t0 = time.time()
+            t0 = time.monotonic()
             try:
                 self._handle_input()
-                self.display.display_image(self._render())
+                key = self._frame_key(t0)
+                # Skip the render entirely when nothing it draws has changed;
+                # if the writer is still busy, drop the frame and retry next tick
+                if key != self._last_key and not self._tx_q.full():
+                    out = self._tx_bufs[self._tx_idx]
+                    buf = self._render_live_raw(out)
+                    if buf is None:
+                        buf = self.display.pack(self._render(), out)
+                    self._tx_q.put_nowait(buf)
+                    self._tx_idx ^= 1
+                    self._last_key = key
             except Exception as e:
                 print(f"[HAT] Error: {e}")
                 traceback.print_exc()
-            time.sleep(max(0, INTERVAL - (time.time() - t0)))
+            time.sleep(max(0, INTERVAL - (time.monotonic() - t0)))
+
+    def _render_live_raw(self, out):
+        """
+        Clean LIVE view packed straight from the grabber's BGR frame into
+        ``out`` — no PIL image, no colour conversion.  Returns None when the
+        current page needs the PIL renderer instead.
+        """
+        if (PAGES[self._page] != "LIVE" or self._show_hud
+                or not (self.grabber and self.grabber.ready)):
+            return None
+        bgr = self.grabber.get_bgr()
+        if bgr is None:
+            return None
+        self.display.pack_bgr(bgr, out)
+        self._tick()
+        if self.state.recording and self._blink:
+            out.view(">u2")[self._rec_dot] = _rgb565(*C_RED)
+        return out
+
+    def _frame_key(self, now):
+        """
+        Snapshot of everything a render depends on — an equal key means the
+        frame would come out identical.  The half-second clock term covers
+        blinking and slow-changing readouts; while recording (running
+        timecode) or flashing, every tick is a new frame.
+        """
+        s = self.state
+        if s.recording or self._flash_msg:
+            return now
+        live = self.grabber.gen if self.grabber else 0
+        snap = tuple(tuple(v) if isinstance(v, list) else v for v in vars(s).values())
+        return (self._page, self._state_gen, live, int(now * 2), snap)
+
+    def _tx_loop(self):
+        """Own the SPI bus: send each packed frame the render thread queues."""
+        _pin_thread()
+        last_full = 0.0
+        while not self._stop.is_set():
+            try:
+                buf = self._tx_q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                # Resend the whole frame every 500 ms so a glitched transfer
+                # never sticks on screen behind the dirty-stripe check
+                now = time.monotonic()
+                if now - last_full >= 0.5:
+                    self.display.invalidate()
+                    last_full = now
+                self.display.write_frame(buf)
+            except Exception as e:
+                print(f"[HAT] SPI error: {e}")
 
     # ─── Top-level renderer ───────────────────────────────────────────
+    def _tick(self):
+        self._tnow  = time.monotonic()
+        self._blink = not int(self._tnow * 2) & 1
+
     def _render(self):
+        self._tick()
         s    = self.state
         page = PAGES[self._page]
         acc  = PAGE_COLORS[self._page]
@@ -779,25 +1257,28 @@ class HatUI:
     #  LIVE PAGE — full 128×128 camera feed + optional HUD overlay
     # ─────────────────────────────────────────────────────────────────
     def _render_live(self, s, acc):
-        # Show waiting screen until first frame arrives
+        # Show waiting screen until first frame arrives (drawn once per accent)
         if not (self.grabber and self.grabber.ready):
+            if self._warmup and self._warmup[0] == acc:
+                return self._warmup[1]
             img  = Image.new("RGB", (LCD_W, LCD_H), C_BG)
             draw = ImageDraw.Draw(img)
             draw.rectangle([0, 0, LCD_W-1, LCD_H-1], outline=C_MGRAY)
             draw.line([0, 0, LCD_W, LCD_H], fill=(40,40,60), width=1)
             draw.line([LCD_W, 0, 0, LCD_H], fill=(40,40,60), width=1)
-            draw.text((28, 44), "LIVE FEED", fill=C_MGRAY, font=self._font_sm)
-            draw.text((18, 58), "WARMING UP", fill=C_MGRAY, font=self._font_sm)
+            self._text(draw, (28, 44), "LIVE FEED", fill=C_MGRAY, font=self._font_sm)
+            self._text(draw, (18, 58), "WARMING UP", fill=C_MGRAY, font=self._font_sm)
             self._nav_dots_only(draw, acc)
+            self._warmup = (acc, img)
             return img
-        # Live frame available
-        img = self.grabber.get()
+        # Live frame available — copy, the overlay below draws on it
+        img = self.grabber.get().copy()
 
         if not self._show_hud:
             # ── CLEAN MODE: just the video + a tiny REC dot ──────────
             draw = ImageDraw.Draw(img)
             if s.recording:
-                blink = int(time.time()*2)%2==0
+                blink = self._blink
                 if blink:
                     draw.ellipse([LCD_W-12, 2, LCD_W-3, 11], fill=C_RED)
             return img
@@ -811,22 +1292,26 @@ class HatUI:
 
         # ── TOP BAR: REC + timecode ───────────────────────────────
         if s.recording:
-            blink = int(time.time()*2)%2==0
-            draw.rectangle([0,0,LCD_W,16], fill=(*C_RED, 200) if blink else (*C_RED_DIM, 200))
-            draw.text((3, 2),  "●", fill=C_WHITE, font=self._font_sm)
-            draw.text((14, 2), s.rec_timecode, fill=C_WHITE, font=self._font_sm)
+            if self._rec_bars:
+                img.paste(self._rec_bars[self._blink], (0, 0))
+            else:
+                blink = self._blink
+                draw.rectangle([0,0,LCD_W,16], fill=(*C_RED, 200) if blink else (*C_RED_DIM, 200))
+                self._text(draw, (3, 2),  "●", fill=C_WHITE, font=self._font_sm)
+            self._text(draw, (14, 2), s.rec_timecode, fill=C_WHITE, font=self._font_sm)
         else:
-            draw.text((3, 3), "○  STANDBY", fill=C_LGRAY, font=self._font_sm)
+            self._text(draw, (3, 3), "○  STANDBY", fill=C_LGRAY, font=self._font_sm)
 
         clip_str = f"#{s.clip_number:04d}"
-        draw.text((LCD_W - len(clip_str)*6 - 2, 3), clip_str, fill=acc, font=self._font_sm)
+        self._text(draw, (LCD_W - self._width(self._font_sm, clip_str) - 2, 3), clip_str,
+                   fill=acc, font=self._font_sm)
 
         # ── FOCUS BAR: thin horizontal bar at top of bottom strip ──
         pct      = s.focus_pct
         bar_y    = LCD_H - 37
         bar_col  = C_GREEN if not s.auto_focus else C_MGRAY
         af_label = "AF" if s.auto_focus else f"MF {pct}%"
-        draw.text((3, bar_y), af_label, fill=bar_col, font=self._font_xs)
+        self._text(draw, (3, bar_y), af_label, fill=bar_col, font=self._font_xs)
         _bar(draw, 28, bar_y+1, LCD_W-32, 6, pct/100, bar_col)
 
         # ── AUDIO METERS: dual bars ───────────────────────────────
@@ -835,29 +1320,29 @@ class HatUI:
         rv = levels[1] if len(levels)>1 else 0.0
         ay = LCD_H - 27
         if s.audio_enabled and not s.audio_muted:
-            draw.text((3, ay), "L", fill=C_MGRAY, font=self._font_xs)
+            self._text(draw, (3, ay), "L", fill=C_MGRAY, font=self._font_xs)
             _db_bar(draw, 14, ay, LCD_W-17, 7, lv)
             ay += 9
-            draw.text((3, ay), "R", fill=C_MGRAY, font=self._font_xs)
+            self._text(draw, (3, ay), "R", fill=C_MGRAY, font=self._font_xs)
             _db_bar(draw, 14, ay, LCD_W-17, 7, rv)
         else:
             mute_str = "MIC MUTED" if s.audio_muted else "No mic"
-            draw.text((3, ay+2), mute_str, fill=C_RED if s.audio_muted else C_MGRAY, font=self._font_xs)
+            self._text(draw, (3, ay+2), mute_str, fill=C_RED if s.audio_muted else C_MGRAY, font=self._font_xs)
 
         # ── BOTTOM STRIP: key settings summary ───────────────────
         by = LCD_H - 14
         ae_str = "AE" if s.auto_exp else f"{s.shutter_angle:.0f}°"
         wb_str = "AWB" if s.auto_wb else f"{s.wb_temp}K"
         n = {0:"Proxy",1:"LT",2:"Standard",3:"HQ"}
-        draw.text((3,  by), ae_str,                         fill=C_AMBER,   font=self._font_xs)
-        draw.text((36, by), wb_str,                         fill=C_CYAN,    font=self._font_xs)
-        draw.text((76, by), s.format_label[:10],            fill=C_MAGENTA, font=self._font_xs)
+        self._text(draw, (3,  by), ae_str,                         fill=C_AMBER,   font=self._font_xs)
+        self._text(draw, (36, by), wb_str,                         fill=C_CYAN,    font=self._font_xs)
+        self._text(draw, (76, by), s.format_label[:10],            fill=C_MAGENTA, font=self._font_xs)
 
         # ── Page dots at very bottom ─────────────────────────────
         self._nav_dots_only(draw, acc)
 
         # ── Flash message on top ─────────────────────────────────
-        if self._flash_msg and (time.time() - self._flash_t) < 1.5:
+        if self._flash_msg and (self._tnow - self._flash_t) < 1.5:
             self._draw_flash(draw)
         else:
             self._flash_msg = ""
@@ -879,20 +1364,13 @@ class HatUI:
 
         self._top_bar(draw, s, acc)
 
-        {
-            "STATUS":   self._pg_status,
-            "EXPOSURE": self._pg_exposure,
-            "WHITE BAL":self._pg_wb,
-            "FOCUS":    self._pg_focus,
-            "DISPLAY":  self._pg_display,
-            "AUDIO":    self._pg_audio,
-            "FORMAT":   self._pg_format,
-            "STORAGE":  self._pg_storage,
-        }.get(page, lambda d, s: None)(draw, s)
+        body = self._page_renderers[self._page]
+        if body:
+            body(draw, s)
 
         self._nav_strip(draw, acc)
 
-        if self._flash_msg and (time.time() - self._flash_t) < 1.5:
+        if self._flash_msg and (self._tnow - self._flash_t) < 1.5:
             self._draw_flash(draw)
         else:
             self._flash_msg = ""
@@ -902,152 +1380,187 @@ class HatUI:
     def _paste_thumbnail(self, img, x, y, w, h):
         """Paste a small live camera thumbnail onto the page image."""
         if not self.grabber: return
-        frame = self.grabber.get()
-        thumb = frame.resize((w, h), Image.BILINEAR)
-        # Thin border
-        if w == 40 and h == 30:
-            # Reuse persistent border buffer for standard size
-            self._thumb_border.paste(thumb, (1, 1))
-            img.paste(self._thumb_border, (x-1, y-1))
-        else:
-            border = Image.new("RGB", (w+2, h+2), C_MGRAY)
-            border.paste(thumb, (1, 1))
-            img.paste(border, (x-1, y-1))
+        border = self._thumbs.get((w, h))
+        if border is None:
+            border = self._thumbs[(w, h)] = Image.new("RGB", (w+2, h+2), C_MGRAY)
+        key = (self.grabber.gen, w, h)
+        if key != self._thumb_key:
+            border.paste(self._thumbnail(w, h), (1, 1))
+            self._thumb_key = key
+        img.paste(border, (x-1, y-1))
+
+    def _thumbnail(self, w, h):
+        """Downscale the latest frame to w x h (INTER_AREA when OpenCV is there)."""
+        if CV2_OK and NP_OK:
+            bgr = getattr(self.grabber, "get_bgr", lambda: None)()
+            if bgr is not None:
+                small = cv2.cvtColor(cv2.resize(bgr, (w, h), interpolation=cv2.INTER_AREA),
+                                     cv2.COLOR_BGR2RGB)
+            else:
+                small = cv2.resize(np.asarray(self.grabber.get()), (w, h),
+                                   interpolation=cv2.INTER_AREA)
+            return Image.frombuffer("RGB", (w, h), small, "raw", "RGB", 0, 1)
+        return self.grabber.get().resize((w, h), Image.BILINEAR)
 
     # ─── Chrome for non-LIVE pages ────────────────────────────────────
+    def _build_page_chrome(self):
+        """Pre-render the standby / REC top bars and nav strip of every page."""
+        chrome = []
+        for i in range(N_PAGES):
+            img  = Image.new("RGB", (LCD_W, LCD_H), C_BG)
+            draw = ImageDraw.Draw(img)
+            self._standby_bar(draw, PAGE_COLORS[i])
+            self._draw_nav_strip(draw, PAGE_COLORS[i], i)
+            chrome.append((img.crop((0, 0, LCD_W, 17)),
+                           img.crop((0, LCD_H-11, LCD_W, LCD_H))))
+        self._page_chrome = chrome
+        bars = []
+        for col in (C_RED_DIM, C_RED):
+            img = Image.new("RGB", (LCD_W, 17), col)
+            self._text(ImageDraw.Draw(img), (3, 2), "●", fill=C_WHITE, font=self._font_sm)
+            bars.append(img)
+        self._rec_bars = bars
+
     def _top_bar(self, draw, s, acc):
         if s.recording:
-            blink = int(time.time()*2)%2==0
-            draw.rectangle([0,0,LCD_W,16], fill=C_RED if blink else C_RED_DIM)
-            draw.text((3,2), "●", fill=C_WHITE, font=self._font_sm)
-            draw.text((14,2), s.rec_timecode, fill=C_WHITE, font=self._font_sm)
+            if self._rec_bars:
+                self._canvas.paste(self._rec_bars[self._blink], (0, 0))
+            else:
+                blink = self._blink
+                draw.rectangle([0,0,LCD_W,16], fill=C_RED if blink else C_RED_DIM)
+                self._text(draw, (3,2), "●", fill=C_WHITE, font=self._font_sm)
+            self._text(draw, (14,2), s.rec_timecode, fill=C_WHITE, font=self._font_sm)
+        elif self._page_chrome:
+            self._canvas.paste(self._page_chrome[self._page][0], (0, 0))
         else:
-            draw.rectangle([0,0,LCD_W,16], fill=C_TOPBAR)
-            draw.line([0,0,LCD_W,0], fill=acc, width=2)
-            draw.text((3,3), "○  STANDBY", fill=C_MGRAY, font=self._font_sm)
+            self._standby_bar(draw, acc)
         clip_str = f"#{s.clip_number:04d}"
-        draw.text((LCD_W-len(clip_str)*6-2, 3), clip_str, fill=acc, font=self._font_sm)
+        self._text(draw, (LCD_W-self._width(self._font_sm, clip_str)-2, 3), clip_str,
+                   fill=acc, font=self._font_sm)
+
+    def _standby_bar(self, draw, acc):
+        draw.rectangle([0,0,LCD_W,16], fill=C_TOPBAR)
+        draw.line([0,0,LCD_W,0], fill=acc, width=2)
+        self._text(draw, (3,3), "○  STANDBY", fill=C_MGRAY, font=self._font_sm)
 
     def _nav_strip(self, draw, acc):
+        if self._page_chrome:
+            self._canvas.paste(self._page_chrome[self._page][1], (0, LCD_H-11))
+        else:
+            self._draw_nav_strip(draw, acc, self._page)
+
+    def _draw_nav_strip(self, draw, acc, page):
         y = LCD_H - 11
         draw.rectangle([0, y, LCD_W, LCD_H], fill=C_TOPBAR)
-        name = PAGES[self._page]
-        tx   = max(2, (LCD_W - len(name)*6)//2)
-        draw.text((tx, y+1), name, fill=acc, font=self._font_xs)
-        self._nav_dots_only(draw, acc)
-
-    def _nav_dots_only(self, draw, acc):
-        dot_y   = LCD_H - 3
-        x_start = (LCD_W - N_PAGES*8)//2
-        for i in range(N_PAGES):
-            cx  = x_start + i*8 + 3
-            col = acc if i==self._page else C_MGRAY
-            r   = 2 if i==self._page else 1
+        name = PAGES[page]
+        tx   = max(2, (LCD_W - self._width(self._font_xs, name))//2)
+        self._text(draw, (tx, y+1), name, fill=acc, font=self._font_xs)
+        self._nav_dots_only(draw, acc, page)
+
+    def _nav_dots_only(self, draw, acc, page=None):
+        page = self._page if page is None else page
+        for i, (cx, dot_y) in enumerate(self._dot_centers):
+            col = acc if i==page else C_MGRAY
+            r   = 2 if i==page else 1
             draw.ellipse([cx-r, dot_y-r, cx+r, dot_y+r], fill=col)
 
     def _draw_flash(self, draw):
         lines  = self._flash_msg.split("\n")
         lh     = 13
         box_h  = len(lines)*lh + 10
-        box_w  = max(len(l) for l in lines)*7 + 16
+        box_w  = max(self._width(self._font_sm, l, 7) for l in lines) + 16
         bx = (LCD_W-box_w)//2
         by = (LCD_H-box_h)//2
         draw.rectangle([bx-1,by-1,bx+box_w+1,by+box_h+1],
                        fill=C_BG, outline=self._flash_col)
         for i, line in enumerate(lines):
-            draw.text((bx+8, by+5+i*lh), line, fill=self._flash_col, font=self._font_sm)
+            self._text(draw, (bx+8, by+5+i*lh), line, fill=self._flash_col, font=self._font_sm)
 
     # ─── Page renderers ───────────────────────────────────────────────
     def _pg_status(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
-        res = s.resolution.replace("3840x2160","4K").replace("1920x1080","1080p").replace("1280x720","720p")
-        draw.text((3,y), f"{res}  {s.fps}fps", fill=C_WHITE, font=sm); y+=14
-        draw.text((3,y), s.format_label, fill=C_MAGENTA, font=sm); y+=13
+        res = _short_res(s.resolution)
+        self._text(draw, (3,y), f"{res}  {s.fps}fps", fill=C_WHITE, font=sm); y+=14
+        self._text(draw, (3,y), s.format_label, fill=C_MAGENTA, font=sm); y+=13
         ae = "AE" if s.auto_exp else f"{s.shutter_angle:.0f}°"
         gain = s.gain if s.gain is not None else 0
-        draw.text((3,y), f"EXP  {ae}   ISO~{gain*10}", fill=C_AMBER, font=xs); y+=12
+        self._text(draw, (3,y), f"EXP  {ae}   ISO~{gain*10}", fill=C_AMBER, font=xs); y+=12
         wb = "AWB" if s.auto_wb else f"{s.wb_temp or 5600}K"
-        draw.text((3,y), f"WB   {wb}", fill=C_CYAN, font=xs); y+=12
+        self._text(draw, (3,y), f"WB   {wb}", fill=C_CYAN, font=xs); y+=12
         af = "AF" if s.auto_focus else f"MF {s.focus_pct}%"
         pk = "  PKG" if getattr(s,'focus_peaking',False) else ""
-        draw.text((3,y), f"FOC  {af}{pk}", fill=C_GREEN, font=xs); y+=12
+        self._text(draw, (3,y), f"FOC  {af}{pk}", fill=C_GREEN, font=xs); y+=12
         if not s.audio_enabled:   aud, ac = "No mic", C_MGRAY
         elif s.audio_muted:       aud, ac = "MUTED",  C_RED
         else:
             mg = s.mic_gain_db if s.mic_gain_db is not None else 0
             sign = "+" if mg >= 0 else ""
             aud, ac = f"Mic  {sign}{mg}dB", C_GREEN
-        draw.text((3,y), aud, fill=ac, font=xs)
-        draw.text((3, LCD_H-22), "K1=REC  K3=format", fill=C_MGRAY, font=xs)
+        self._text(draw, (3,y), aud, fill=ac, font=xs)
+        self._text(draw, (3, LCD_H-22), "K1=REC  K3=format", fill=C_MGRAY, font=xs)
 
     def _pg_exposure(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
         sel_exp  = self._sub == 0; sel_gain = self._sub == 1
         sh_col   = C_AMBER if sel_exp  else C_LGRAY
         g_col    = C_CYAN  if sel_gain else C_LGRAY
-        draw.text((3,y), "SHUTTER", fill=sh_col, font=xs); y+=10
-        draw.text((3,y), "AUTO" if s.auto_exp else f"{s.shutter_angle:.0f}°", fill=sh_col, font=self._font_lg); y+=20
-        _bar(draw, 3, y, LCD_W-48, 8, s.shutter_angle/360,
+        angle    = s.shutter_angle
+        self._text(draw, (3,y), "SHUTTER", fill=sh_col, font=xs); y+=10
+        self._text(draw, (3,y), "AUTO" if s.auto_exp else f"{angle:.0f}°", fill=sh_col, font=self._font_lg); y+=20
+        _bar(draw, 3, y, LCD_W-48, 8, angle/360,
              C_AMBER if not s.auto_exp else C_MGRAY, outline=C_AMBER if sel_exp else None)
         m = 3+int(0.5*(LCD_W-48)); draw.line([m,y,m,y+8], fill=C_WHITE, width=1)
         y += 12
         gain = s.gain if s.gain is not None else 0
-        draw.text((3,y), f"ISO  ~{gain*10}", fill=g_col, font=sm); y+=12
+        self._text(draw, (3,y), f"ISO  ~{gain*10}", fill=g_col, font=sm); y+=12
         _bar(draw, 3, y, LCD_W-48, 7, gain/500,
              C_CYAN if sel_gain else C_MGRAY, outline=C_CYAN if sel_gain else None)
         cursor = "▲▼ Shutter" if sel_exp else "▲▼ ISO"
-        draw.text((3, LCD_H-22), cursor, fill=C_AMBER if sel_exp else C_CYAN, font=xs)
-        draw.text((3, LCD_H-13), "K2=AE  K3=switch", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-22), cursor, fill=C_AMBER if sel_exp else C_CYAN, font=xs)
+        self._text(draw, (3, LCD_H-13), "K2=AE  K3=switch", fill=C_MGRAY, font=xs)
 
     def _pg_wb(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
-        draw.text((3,y), "AUTO" if s.auto_wb else "MANUAL",
-                  fill=C_GREEN if s.auto_wb else C_WHITE, font=sm); y+=14
+        self._text(draw, (3,y), "AUTO" if s.auto_wb else "MANUAL",
+                         fill=C_GREEN if s.auto_wb else C_WHITE, font=sm); y+=14
         wb = s.wb_temp if s.wb_temp is not None else 5600
-        draw.text((3,y), f"{wb} K", fill=C_CYAN, font=self._font_lg); y+=20
+        self._text(draw, (3,y), f"{wb} K", fill=C_CYAN, font=self._font_lg); y+=20
         _bar(draw, 3, y, LCD_W-48, 10, (wb-2000)/8000, C_CYAN); y+=11
-        for k, lbl in [(3200,"3.2"),(5600,"D"),(6500,"6.5")]:
-            mx = 3+int(((k-2000)/8000)*(LCD_W-48))
+        for mx, lbl in WB_TICKS:
             draw.line([mx,y-11,mx,y-1], fill=C_WHITE, width=1)
-            draw.text((mx-4,y), lbl, fill=C_MGRAY, font=xs)
+            self._text(draw, (mx-4,y), lbl, fill=C_MGRAY, font=xs)
         y+=11
-        draw.text((3,y), "2K", fill=C_MGRAY, font=xs)
-        draw.text((3, LCD_H-22), "▲▼ = Kelvin", fill=C_CYAN, font=xs)
-        draw.text((3, LCD_H-13), "K2=AWB  K3=preset  ●=lock", fill=C_MGRAY, font=xs)
+        self._text(draw, (3,y), "2K", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-22), "▲▼ = Kelvin", fill=C_CYAN, font=xs)
+        self._text(draw, (3, LCD_H-13), "K2=AWB  K3=preset  ●=lock", fill=C_MGRAY, font=xs)
 
     def _pg_focus(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
-        draw.text((3,y), "AUTO FOCUS" if s.auto_focus else "MANUAL FOCUS",
-                  fill=C_GREEN if s.auto_focus else C_AMBER, font=sm); y+=14
-        draw.text((3,y), "NEAR", fill=C_MGRAY, font=xs)
-        draw.text((LCD_W-70,y), "FAR", fill=C_MGRAY, font=xs); y+=10
+        self._text(draw, (3,y), "AUTO FOCUS" if s.auto_focus else "MANUAL FOCUS",
+                         fill=C_GREEN if s.auto_focus else C_AMBER, font=sm); y+=14
+        self._text(draw, (3,y), "NEAR", fill=C_MGRAY, font=xs)
+        self._text(draw, (LCD_W-70,y), "FAR", fill=C_MGRAY, font=xs); y+=10
         pct = s.focus_pct
         _bar(draw, 3, y, LCD_W-48, 14, pct/100, C_GREEN if not s.auto_focus else C_MGRAY)
-        draw.text((LCD_W//2-28, y+2), f"{pct:3d}%", fill=C_WHITE, font=xs)
-        for frac in [0.25,0.5,0.75]:
-            tx = 3+int(frac*(LCD_W-48))
+        self._text(draw, (LCD_W//2-28, y+2), f"{pct:3d}%", fill=C_WHITE, font=xs)
+        for tx in FOCUS_TICKS:
             draw.line([tx,y+14,tx,y+18], fill=C_MGRAY, width=1)
         y+=22
         f = s.focus if s.focus is not None else 0
         fm = s.focus_max if s.focus_max is not None else 255
-        draw.text((3,y), f"val {f}/{fm}", fill=C_MGRAY, font=xs); y+=12
+        self._text(draw, (3,y), f"val {f}/{fm}", fill=C_MGRAY, font=xs); y+=12
         pk_on = getattr(s,'focus_peaking',False)
-        draw.text((3,y), f"Peaking  {'ON ●' if pk_on else 'OFF'}",
-                  fill=C_GREEN if pk_on else C_MGRAY, font=xs)
-        draw.text((3, LCD_H-22), "▲▼ = pull focus", fill=C_GREEN if not s.auto_focus else C_MGRAY, font=xs)
-        draw.text((3, LCD_H-13), "K2=AF  K3=peak  ●=AF lock", fill=C_MGRAY, font=xs)
+        self._text(draw, (3,y), f"Peaking  {'ON ●' if pk_on else 'OFF'}",
+                         fill=C_GREEN if pk_on else C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-22), "▲▼ = pull focus", fill=C_GREEN if not s.auto_focus else C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-13), "K2=AF  K3=peak  ●=AF lock", fill=C_MGRAY, font=xs)
 
     def _pg_display(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
-        draw.text((3,y), "GUI DISPLAY", fill=C_CYAN, font=sm); y+=16
-
-        items = [
-            ("Guides",    getattr(s, 'show_guides', True)),
-            ("Histogram", getattr(s, 'show_histogram', False)),
-            ("Peaking",   getattr(s, 'focus_peaking', False))
-        ]
+        self._text(draw, (3,y), "GUI DISPLAY", fill=C_CYAN, font=sm); y+=16
 
-        for i, (label, val) in enumerate(items):
+        for i, (label, attr, default) in enumerate(self._DISPLAY_ITEMS):
+            val = getattr(s, attr, default)
             selected = (i == self._sub)
             col = C_WHITE if selected else C_MGRAY
             prefix = "▶ " if selected else "  "
@@ -1055,36 +1568,36 @@ class HatUI:
             stat_col = C_GREEN if val else C_RED_DIM
             if selected: stat_col = C_GREEN if val else C_RED
 
-            draw.text((3, y), f"{prefix}{label}", fill=col, font=sm)
-            draw.text((LCD_W-36, y), status, fill=stat_col, font=sm)
+            self._text(draw, (3, y), f"{prefix}{label}", fill=col, font=sm)
+            self._text(draw, (LCD_W-36, y), status, fill=stat_col, font=sm)
             y += 16
 
-        draw.text((3, LCD_H-22), "▲▼ = select", fill=C_MGRAY, font=xs)
-        draw.text((3, LCD_H-13), "K2/● = toggle  K3=next", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-22), "▲▼ = select", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-13), "K2/● = toggle  K3=next", fill=C_MGRAY, font=xs)
 
     def _pg_audio(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
         if not s.audio_enabled:
-            draw.text((3,y+10), "No mic detected", fill=C_MGRAY, font=sm); return
+            self._text(draw, (3,y+10), "No mic detected", fill=C_MGRAY, font=sm); return
         if s.audio_muted:
             draw.rectangle([3,y,LCD_W-48,y+14], fill=(50,0,0))
-            draw.text((6,y+1), "MIC  MUTED", fill=C_RED, font=sm)
+            self._text(draw, (6,y+1), "MIC  MUTED", fill=C_RED, font=sm)
         else:
-            draw.text((3,y), "MIC  LIVE", fill=C_GREEN, font=sm)
+            self._text(draw, (3,y), "MIC  LIVE", fill=C_GREEN, font=sm)
         y+=18
         levels = s.audio_levels if s.audio_levels else [0.0,0.0]
         lv = levels[0] if len(levels)>0 else 0.0
         rv = levels[1] if len(levels)>1 else 0.0
-        draw.text((3,y), "L", fill=C_LGRAY, font=xs)
+        self._text(draw, (3,y), "L", fill=C_LGRAY, font=xs)
         _db_bar(draw, 14, y, LCD_W-60, 9, lv); y+=12
-        draw.text((3,y), "R", fill=C_LGRAY, font=xs)
+        self._text(draw, (3,y), "R", fill=C_LGRAY, font=xs)
         _db_bar(draw, 14, y, LCD_W-60, 9, rv); y+=13
-        draw.text((14,y),"-60",fill=C_MGRAY,font=xs)
-        draw.text((45,y),"-12",fill=C_MGRAY,font=xs)
-        draw.text((60,y),"-6", fill=C_MGRAY,font=xs); y+=11
+        self._text(draw, (14,y),"-60",fill=C_MGRAY,font=xs)
+        self._text(draw, (45,y),"-12",fill=C_MGRAY,font=xs)
+        self._text(draw, (60,y),"-6", fill=C_MGRAY,font=xs); y+=11
         mg = s.mic_gain_db if s.mic_gain_db is not None else 0
         sign = "+" if mg >= 0 else ""
-        draw.text((3,y), f"Gain  {sign}{mg} dB", fill=C_WHITE, font=sm); y+=12
+        self._text(draw, (3,y), f"Gain  {sign}{mg} dB", fill=C_WHITE, font=sm); y+=12
         mid = (LCD_W-50)//2
         draw.rectangle([3,y,LCD_W-48,y+8], fill=C_BAR_BG)
         draw.line([3+mid,y,3+mid,y+8], fill=C_MGRAY, width=1)
@@ -1094,20 +1607,20 @@ class HatUI:
             draw.rectangle([3+mid,y,3+fill_x,y+8], fill=C_GREEN)
         else:
             draw.rectangle([3+fill_x,y,3+mid,y+8], fill=C_AMBER)
-        draw.text((3, LCD_H-22), "▲▼ = gain ±3dB", fill=C_MGRAY, font=xs)
-        draw.text((3, LCD_H-13), "K2=mute  K3=reset  ●=mute", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-22), "▲▼ = gain ±3dB", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-13), "K2=mute  K3=reset  ●=mute", fill=C_MGRAY, font=xs)
 
     def _pg_format(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
         fmt = OUTPUT_FORMATS[s.output_format_idx]
 
-        draw.text((3,y), "FORMAT", fill=C_LGRAY, font=xs); y+=10
-        draw.text((3,y), fmt["label"], fill=C_MAGENTA, font=sm); y+=13
-        draw.text((3,y), fmt["note"],  fill=C_LGRAY,   font=xs); y+=11
+        self._text(draw, (3,y), "FORMAT", fill=C_LGRAY, font=xs); y+=10
+        self._text(draw, (3,y), fmt["label"], fill=C_MAGENTA, font=sm); y+=13
+        self._text(draw, (3,y), fmt["note"],  fill=C_LGRAY,   font=xs); y+=11
         ext_col = C_CYAN if fmt["ext"]=="mp4" else (C_AMBER if fmt["ext"]=="mov" else C_GREEN)
-        draw.text((3,y), f".{fmt['ext'].upper()}", fill=ext_col, font=sm)
+        self._text(draw, (3,y), f".{fmt['ext'].upper()}", fill=ext_col, font=sm)
         if fmt.get("cpu_warn") and "3840" in s.resolution:
-            draw.text((34,y), "! 4K slow", fill=C_RED, font=xs)
+            self._text(draw, (34,y), "! 4K slow", fill=C_RED, font=xs)
         y+=14
 
         # Format selection strip
@@ -1119,63 +1632,70 @@ class HatUI:
             draw.rectangle([sx, y, sx+strip_w-2, y+10],
                            fill=C_MAGENTA if active else C_BAR_BG)
             lbl = f["key"][:3].upper()
-            draw.text((sx+1, y+1), lbl,
-                      fill=C_WHITE if active else C_MGRAY, font=xs)
+            self._text(draw, (sx+1, y+1), lbl,
+                             fill=C_WHITE if active else C_MGRAY, font=xs)
         y+=14
 
-        draw.text((3,y), "FPS", fill=C_LGRAY, font=xs)
-        draw.text((28,y), str(s.fps), fill=C_WHITE, font=sm); y+=14
-        res = s.resolution.replace("3840x2160","4K").replace("1920x1080","1080p").replace("1280x720","720p")
-        draw.text((3,y), "RES", fill=C_LGRAY, font=xs)
-        draw.text((28,y), res, fill=C_WHITE, font=sm)
+        self._text(draw, (3,y), "FPS", fill=C_LGRAY, font=xs)
+        self._text(draw, (28,y), str(s.fps), fill=C_WHITE, font=sm); y+=14
+        res = _short_res(s.resolution)
+        self._text(draw, (3,y), "RES", fill=C_LGRAY, font=xs)
+        self._text(draw, (28,y), res, fill=C_WHITE, font=sm)
 
-        draw.text((3, LCD_H-22), "▲▼=format  K2=cycle", fill=C_MGRAY, font=xs)
-        draw.text((3, LCD_H-13), "K3=res  ●=fps", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-22), "▲▼=format  K2=cycle", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-13), "K3=res  ●=fps", fill=C_MGRAY, font=xs)
 
     def _pg_storage(self, draw, s):
         y  = 20; xs = self._font_xs; sm = self._font_sm
-        draw.text((3,y), "CLIP  NUM", fill=C_LGRAY, font=xs)
-        draw.text((65,y), f"{s.clip_number:04d}", fill=C_CYAN, font=sm); y+=14
-        draw.text((3,y), "FILE", fill=C_LGRAY, font=xs); y+=10
-        draw.text((3,y), s.clip_name[:18], fill=C_WHITE, font=xs); y+=12
-        draw.text((3,y), "PATH", fill=C_LGRAY, font=xs); y+=10
+        self._text(draw, (3,y), "CLIP  NUM", fill=C_LGRAY, font=xs)
+        self._text(draw, (65,y), f"{s.clip_number:04d}", fill=C_CYAN, font=sm); y+=14
+        self._text(draw, (3,y), "FILE", fill=C_LGRAY, font=xs); y+=10
+        self._text(draw, (3,y), s.clip_name[:18], fill=C_WHITE, font=xs); y+=12
+        self._text(draw, (3,y), "PATH", fill=C_LGRAY, font=xs); y+=10
         out = str(s.output_dir)
         if len(out) > 18: out = "…"+out[-17:]
-        draw.text((3,y), out, fill=C_LGRAY, font=xs); y+=14
+        self._text(draw, (3,y), out, fill=C_LGRAY, font=xs); y+=14
         try:
-            stat     = os.statvfs(str(s.output_dir))
-            free_gb  = (stat.f_bavail*stat.f_frsize)/(1024**3)
-            total_gb = (stat.f_blocks*stat.f_frsize)/(1024**3)
-            used_pct = 1.0-(stat.f_bavail/max(stat.f_blocks,1))
-            draw.text((3,y), f"FREE  {free_gb:.1f}/{total_gb:.0f} GB", fill=C_WHITE, font=xs); y+=11
+            free_gb, total_gb, used_pct, mins = self._disk_info(s)
+            self._text(draw, (3,y), f"FREE  {free_gb:.1f}/{total_gb:.0f} GB", fill=C_WHITE, font=xs); y+=11
             _bar(draw, 3, y, LCD_W-50, 7, used_pct,
                  C_RED if used_pct>0.9 else (C_AMBER if used_pct>0.7 else C_GREEN)); y+=10
 
-            # Use centralized logic if available
-            if hasattr(s, "remaining_storage_info"):
-                _, mins = s.remaining_storage_info
-            else:
-                # Robust fallback logic
-                fmt  = OUTPUT_FORMATS[s.output_format_idx]
-                mbps = fmt.get("est_mbps")
-                # Fallback to note parsing only if est_mbps is missing
-                if not mbps:
-                    note = fmt.get("note", "")
-                    try:
-                        mbps = int([w for w in note.replace("~","").split() if "Mbps" in w][0].replace("Mbps",""))
-                    except Exception:
-                        mbps = 50
-
-                if "720" in str(s.resolution): mbps = max(1, mbps//3)
-                elif "1080" in str(s.resolution): mbps = max(1, mbps//2)
-
-                mins = int((free_gb*8000/mbps)/60) if mbps else 0
-
             h,m  = divmod(mins,60)
-            draw.text((3,y), f"{h}h {m:02d}m remaining", fill=C_MGRAY, font=xs)
+            self._text(draw, (3,y), f"{h}h {m:02d}m remaining", fill=C_MGRAY, font=xs)
         except Exception:
-            draw.text((3,y), "Disk info N/A", fill=C_MGRAY, font=xs)
-        draw.text((3, LCD_H-13), "K3=reset clip#", fill=C_MGRAY, font=xs)
+            self._text(draw, (3,y), "Disk info N/A", fill=C_MGRAY, font=xs)
+        self._text(draw, (3, LCD_H-13), "K3=reset clip#", fill=C_MGRAY, font=xs)
+
+    def _disk_info(self, s):
+        """
+        (free GB, total GB, used fraction, minutes left) for the output
+        drive.  The filesystem is queried at most once a second, or sooner
+        when the path, format or resolution changes.
+        """
+        key = (str(s.output_dir), s.output_format_idx, s.resolution)
+        if self._disk and self._disk[1] == key and self._tnow - self._disk[0] < 1.0:
+            return self._disk[2]
+
+        stat     = os.statvfs(str(s.output_dir))
+        free_gb  = (stat.f_bavail*stat.f_frsize)/(1024**3)
+        total_gb = (stat.f_blocks*stat.f_frsize)/(1024**3)
+        used_pct = 1.0-(stat.f_bavail/max(stat.f_blocks,1))
+
+        # Use centralized logic if available
+        if hasattr(s, "remaining_storage_info"):
+            _, mins = s.remaining_storage_info
+        else:
+            # Fallback: bitrate table built at import
+            mbps = FORMAT_MBPS[s.output_format_idx]
+            if "720" in str(s.resolution): mbps = max(1, mbps//3)
+            elif "1080" in str(s.resolution): mbps = max(1, mbps//2)
+
+            mins = int((free_gb*8000/mbps)/60) if mbps else 0
+
+        info = (free_gb, total_gb, used_pct, mins)
+        self._disk = (self._tnow, key, info)
+        return info
 
 
 # ─────────────────────────────────────────────
@@ -1216,6 +1736,10 @@ class _MockState:
 if __name__ == "__main__":
     print("HAT UI standalone test")
     print(f"  GPIO={GPIO_OK}  SPI={SPI_OK}  PIL={PIL_OK}  CV2={CV2_OK}")
+    if PIL_OK:
+        # Pillow-SIMD versions carry a .postN suffix
+        simd = ".post" in PIL.__version__
+        print(f"  Pillow {PIL.__version__}{' (SIMD)' if simd else ''}")
     missing = [n for n,ok in [("RPi.GPIO",GPIO_OK),("spidev",SPI_OK),("Pillow",PIL_OK)] if not ok]
     if missing:
         print(f"\nInstall: pip3 install {' '.join(missing)}")
@@ -64,6 +64,35 @@ fi
 
 pip3 install --break-system-packages -r requirements.txt
 
+# Optional: Pillow-SIMD (NEON-vectorised drop-in for Pillow) for the HAT renderer.
+# Opt-in because it builds from source: PILLOW_SIMD=1 bash install.sh
+if [ "$IS_PI" = true ] && [ "${PILLOW_SIMD:-0}" = "1" ]; then
+    sudo apt-get install -y libjpeg-dev zlib1g-dev libfreetype6-dev
+    pip3 uninstall -y --break-system-packages pillow
+    if CC="cc -O3 -mcpu=native" pip3 install --break-system-packages --no-cache-dir pillow-simd; then
+        echo -e "${GREEN}  ✓ Pillow-SIMD installed${RESET}"
+    else
+        echo -e "${YELLOW}  Pillow-SIMD build failed — reinstalling Pillow${RESET}"
+        pip3 install --break-system-packages Pillow
+    fi
+fi
+
+# Optional: libjpeg-turbo decoder for the GUI preview (OpenCV decodes without it)
+if command -v apt-get &> /dev/null; then
+    sudo apt-get install -y libturbojpeg0 || true
+fi
+pip3 install --break-system-packages PyTurboJPEG || \
+    echo -e "${YELLOW}  PyTurboJPEG not installed — preview uses OpenCV's MJPEG decoder${RESET}"
+
+# Optional NEON RGB565 packer for the HAT (hat_ui.py falls back without it)
+if command -v gcc &>/dev/null; then
+    if gcc -O3 -shared -fPIC -o _pack565.so _pack565.c; then
+        echo -e "${GREEN}  ✓ Built _pack565.so${RESET}"
+    else
+        echo -e "${YELLOW}  _pack565.so build failed — HAT uses the Python packer${RESET}"
+    fi
+fi
+
 # ── USB bandwidth for 4K UVC ─────────────────────────────────
 if [ "$IS_PI" = true ]; then
     echo -e "${CYAN}[3/4] Configuring USB and SPI…${RESET}"
@@ -12,6 +12,8 @@ Usage:
 __version__ = "0.1.0"
 
 import argparse
+import collections
+import concurrent.futures
 import subprocess
 import threading
 import time
@@ -20,7 +22,15 @@ import sys
 import signal
 import json
 import datetime
+import errno
 import shutil
+import functools
+import importlib
+import importlib.util
+import math
+import re
+import shlex
+import struct
 from pathlib import Path
 
 # ─────────────────────────────────────────────
@@ -32,18 +42,17 @@ try:
 except ImportError:
     CV2_OK = False
 
-try:
-    from rich.console import Console
-    from rich.live import Live
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.text import Text
-    from rich.layout import Layout
-    from rich.columns import Columns
-    from rich import box
-    RICH_OK = True
-except ImportError:
-    RICH_OK = False
+def _have(module):
+    """True if ``module`` is importable — found without importing it."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ValueError:                      # in sys.modules without a __spec__
+        return True
+
+
+# rich, sounddevice and the HAT stack (PIL, numba) are only needed by some
+# modes: check they exist now, import them on first use (see _sounddevice)
+RICH_OK = _have("rich")
 
 try:
     import numpy as np
@@ -52,16 +61,31 @@ except ImportError:
     NP_OK = False
 
 try:
-    import sounddevice as sd
-    SD_OK = True
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJFLAG_FASTDCT, TJFLAG_FASTUPSAMPLE
+    TURBO_OK = True
 except ImportError:
-    SD_OK = False
+    TURBO_OK = False
 
 try:
-    from hat_ui import HatUI
-    HAT_OK = True
+    import fcntl
+    FCNTL_OK = True
 except ImportError:
-    HAT_OK = False
+    FCNTL_OK = False
+
+SD_OK  = _have("sounddevice")
+HAT_OK = _have("hat_ui")
+
+
+def _sounddevice():
+    """sounddevice, imported on first use — PortAudio init is slow to load."""
+    global SD_OK
+    if "sd" not in globals():
+        try:
+            globals()["sd"] = importlib.import_module("sounddevice")
+        except (ImportError, OSError):      # OSError: PortAudio library missing
+            SD_OK = False
+            return None
+    return globals()["sd"]
 
 # ─────────────────────────────────────────────
 #  Constants & Defaults
@@ -69,8 +93,17 @@ except ImportError:
 DEFAULT_DEVICE   = "/dev/video0"
 DEFAULT_FPS      = 30
 DEFAULT_RES      = "3840x2160"       # 4K
+PREVIEW_RES      = "1920x1080"       # GUI preview capture; FFmpeg records DEFAULT_RES
+PREVIEW_TEE      = (960, 540)        # raw BGR preview FFmpeg pipes back while recording
+STORAGE_TTL      = 2.0               # seconds a free-space probe is reused
+CONFIG_SAVE_INTERVAL = 1.0           # seconds between autosave checks
+PEAKING_INTERVAL = 1 / 20            # seconds between focus-peaking mask updates
+HISTOGRAM_INTERVAL = 1 / 10          # seconds between histogram updates
+FFMPEG_PIPE_SIZE = 1 << 20           # FFmpeg stdin/stdout buffers (kernel default is 64 KiB)
 OUTPUT_DIR       = Path.home() / "obsbot_footage"
 CONFIG_FILE      = Path.home() / ".obsbot_cinepi.json"
+FFMPEG_PATH      = shutil.which("ffmpeg")      # None when not installed
+V4L2_CTL_PATH    = shutil.which("v4l2-ctl")
 
 # V4L2 control names as reported by v4l2-ctl
 V4L2_EXPOSURE      = "exposure_time_absolute"
@@ -99,7 +132,16 @@ COLOR_AMBER  = (0, 165, 255)
 #  Pi 5 note: H.264/H.265 encoding is software-only (no HW encoder for
 #  arbitrary input). At 4K these codecs push the CPU hard — use 1080p
 #  if you see dropped frames.  ProRes is I-frame only and encodes easily.
+#  H.264 HW uses the V4L2 M2M codec block where one exists (Pi 4 and
+#  earlier, up to 1080p); menus grey it out when FFmpeg lacks the encoder.
 # ─────────────────────────────────────────────
+# Realtime tuning for the software encoders: no B-frames, short lookahead,
+# slice / wavefront threading so every core works on the current frame
+X264_REALTIME = ["-tune","zerolatency",
+                 "-x264-params","sliced-threads=1:sync-lookahead=0:rc-lookahead=10:ref=1:bframes=0"]
+X265_REALTIME = ["-x265-params",
+                 "pools=*:frame-threads=3:wpp=1:pmode=0:rd=2:rect=0:amp=0:bframes=0"]
+
 OUTPUT_FORMATS = [
     {
         "key":      "h264_high",
@@ -109,7 +151,7 @@ OUTPUT_FORMATS = [
         "est_mbps": 50,
         "cpu_warn": True,           # flag for 4K CPU warning
         "vcodec":   "libx264",
-        "vparams":  ["-crf","18","-preset","faster","-pix_fmt","yuv420p"],
+        "vparams":  ["-crf","18","-preset","faster","-pix_fmt","yuv420p"] + X264_REALTIME,
         "acodec":   "aac",
         "abitrate": "256k",
         "mflags":   ["-movflags","+faststart"],
@@ -122,7 +164,7 @@ OUTPUT_FORMATS = [
         "est_mbps": 20,
         "cpu_warn": True,
         "vcodec":   "libx264",
-        "vparams":  ["-crf","23","-preset","faster","-pix_fmt","yuv420p"],
+        "vparams":  ["-crf","23","-preset","faster","-pix_fmt","yuv420p"] + X264_REALTIME,
         "acodec":   "aac",
         "abitrate": "192k",
         "mflags":   ["-movflags","+faststart"],
@@ -135,7 +177,7 @@ OUTPUT_FORMATS = [
         "est_mbps": 25,
         "cpu_warn": True,
         "vcodec":   "libx265",
-        "vparams":  ["-crf","20","-preset","faster","-pix_fmt","yuv420p"],
+        "vparams":  ["-crf","20","-preset","faster","-pix_fmt","yuv420p"] + X265_REALTIME,
         "acodec":   "aac",
         "abitrate": "256k",
         "mflags":   ["-movflags","+faststart"],
@@ -148,7 +190,7 @@ OUTPUT_FORMATS = [
         "est_mbps": 50,
         "cpu_warn": True,
         "vcodec":   "libx264",
-        "vparams":  ["-crf","18","-preset","faster","-pix_fmt","yuv420p"],
+        "vparams":  ["-crf","18","-preset","faster","-pix_fmt","yuv420p"] + X264_REALTIME,
         "acodec":   "aac",
         "abitrate": "256k",
         "mflags":   [],
@@ -192,11 +234,32 @@ OUTPUT_FORMATS = [
         "abitrate": None,
         "mflags":   ["-movflags","+faststart"],
     },
+    {
+        "key":      "h264_hw",
+        "label":    "H.264 HW",
+        "ext":      "mp4",
+        "note":     "~20Mbps · hardware encoder",
+        "est_mbps": 20,
+        "cpu_warn": False,
+        "vcodec":   "h264_v4l2m2m",
+        "vparams":  ["-b:v","20M","-pix_fmt","yuv420p",
+                     "-num_output_buffers","32","-num_capture_buffers","32"],
+        # FFmpeg lists the encoder even on boards without the codec block
+        # (Pi 5), so also require its encode node; it tops out at 1080p
+        "needs_dev":  "/dev/video11",
+        "max_height": 1080,
+        "acodec":   "aac",
+        "abitrate": "256k",
+        "mflags":   ["-movflags","+faststart"],
+    },
 ]
 N_FORMATS = len(OUTPUT_FORMATS)
 
 # Quick lookup by key
 FORMAT_BY_KEY = {f["key"]: f for f in OUTPUT_FORMATS}
+FORMAT_IDX_BY_KEY = {f["key"]: i for i, f in enumerate(OUTPUT_FORMATS)}
+FORMAT_KEYS = tuple(FORMAT_BY_KEY)       # --format choices, in menu order
+_FORMAT_HELP = "Output format: " + ", ".join(f"{f['key']} ({f['label']})" for f in OUTPUT_FORMATS)
 DEFAULT_FORMAT_IDX = 0   # h264_high — best for Filmora out of the box
 
 # ─────────────────────────────────────────────
@@ -206,15 +269,24 @@ AUDIO_SAMPLE_RATE  = 48000   # 48kHz — broadcast standard
 AUDIO_CHANNELS     = 2       # stereo
 AUDIO_METER_DECAY  = 0.85    # peak hold decay per frame (0–1)
 OBSBOT_USB_NAMES   = ["obsbot", "meet", "usb audio"]  # substrings to match
+ASOUND_DIR         = Path("/proc/asound")   # kernel ALSA card / PCM tables
+AUDIO_CPU          = os.environ.get("AUDIO_CPU", "0")    # meter thread core; empty to disable
+AUDIO_RT_PRIO      = 10      # SCHED_FIFO priority for the meter (needs CAP_SYS_NICE)
+FFMPEG_CPUS        = os.environ.get("FFMPEG_CPUS", "")   # e.g. "1-3"; empty = all cores
 
 # ─────────────────────────────────────────────
 #  Camera State
 # ─────────────────────────────────────────────
+# Clip files: CLIP_YYYYMMDD_####.ext (see CameraState.clip_name)
+_CLIP_NAME_RE = re.compile(r"CLIP_(\d{8})_(\d+)(?:\.|$)")
+
+
 class CameraState:
     def __init__(self):
         self.mode        = "gui"        # "gui", "headless", "diag"
         self.device      = DEFAULT_DEVICE
         self.resolution  = DEFAULT_RES
+        self.preview_resolution = PREVIEW_RES
         self.fps         = DEFAULT_FPS
         self.exposure    = 500          # absolute value (~1/200s at 100fps clock)
         self.gain        = 100          # 0–1000+ depending on camera
@@ -232,17 +304,24 @@ class CameraState:
         self.rec_start   = None
         self.clip_number = 1
         self.output_dir  = OUTPUT_DIR
+        self._storage_cache = (0.0, None, 0)   # (monotonic, output_dir, free bytes)
         self.ffmpeg_proc = None
+        self.preview_tap = None      # PreviewTap on FFmpeg's stdout while recording (GUI)
+        self.ffmpeg_log  = None      # headless FFmpeg stderr log, open for the session
         self.record_trigger = False  # HAT sets this; GUI loop acts on it
+        self.encoder_threads = 0     # FFmpeg -threads (0 = auto); --encoder-threads
         # ── Audio ──────────────────────────────
         self.audio_device   = None    # ALSA hw: string, detected at startup
         self.audio_device_sd = None   # sounddevice index for metering
+        self.audio_input_channels = AUDIO_CHANNELS  # meter channels, set at detection
         self.audio_enabled  = True    # False if no mic found
         self.audio_muted    = False
         self.mic_gain_db    = 0       # software gain offset in dB (-20 to +20)
         self.audio_levels   = [0.0, 0.0]   # live RMS L/R (0–1)
         self.audio_peaks    = [0.0, 0.0]   # peak hold L/R
         self.load_config()
+        self._saved     = self._config_data()   # what the config file holds
+        self._last_save = 0.0
 
     def load_config(self):
         if CONFIG_FILE.exists():
@@ -271,8 +350,8 @@ class CameraState:
             except (OSError, json.JSONDecodeError) as e:
                 print(f"[WARN] Failed to load config: {e}")
 
-    def save_config(self):
-        data = {
+    def _config_data(self) -> dict:
+        return {
             "exposure":          self.exposure,
             "gain":              self.gain,
             "wb_temp":           self.wb_temp,
@@ -282,6 +361,14 @@ class CameraState:
             "auto_focus":        self.auto_focus,
             "mic_gain_db":       self.mic_gain_db,
         }
+
+    def save_config(self, force=True):
+        """
+        Atomically write the config.  force=False (autosave) skips the
+        fsync — an SD-card flush can stall the UI loop for tens of ms and
+        the rename alone is enough for settings; exit paths keep it.
+        """
+        data = self._config_data()
         try:
             # Atomic write pattern with restrictive permissions (0o600)
             tmp_path = str(CONFIG_FILE) + ".tmp"
@@ -289,10 +376,22 @@ class CameraState:
             with os.fdopen(fd, 'w') as f:
                 json.dump(data, f, indent=2)
                 f.flush()
-                os.fsync(fd)
+                if force:
+                    os.fsync(fd)
             os.replace(tmp_path, CONFIG_FILE)
+            self._saved = data
         except OSError as e:
             print(f"[WARN] Failed to save config: {e}")
+        self._last_save = time.monotonic()
+
+    def autosave(self):
+        """Called from the UI loops: save changed settings at most once per interval."""
+        now = time.monotonic()
+        if now - self._last_save < CONFIG_SAVE_INTERVAL:
+            return
+        self._last_save = now
+        if self._config_data() != self._saved:
+            self.save_config(force=False)
 
     @property
     def rec_timecode(self):
@@ -338,25 +437,33 @@ class CameraState:
         fm = self.focus_max if self.focus_max is not None else 255
         return int((f / max(fm, 1)) * 100)
 
+    def _free_bytes(self) -> int:
+        """
+        Free bytes at output_dir, or its nearest existing parent on first
+        run.  The statvfs() result is reused for STORAGE_TTL seconds — the
+        overlays ask every frame, the disk fills over minutes.
+        """
+        now = time.monotonic()
+        stamp, checked_dir, free = self._storage_cache
+        if checked_dir == self.output_dir and now - stamp < STORAGE_TTL:
+            return free
+
+        p = self.output_dir
+        while not p.exists() and p.parent != p:
+            p = p.parent
+        if not p.exists():
+            raise FileNotFoundError(str(self.output_dir))
+
+        # Use shutil for cross-platform disk usage
+        _, _, free = shutil.disk_usage(str(p))
+        self._storage_cache = (now, self.output_dir, free)
+        return free
+
     @property
     def remaining_storage_info(self):
         """Returns tuple (free_gb, remaining_minutes) or (0, 0) on error."""
         try:
-            if not self.output_dir.exists():
-                # If output directory doesn't exist yet, check parent
-                # This prevents "0 mins remaining" on first run
-                p = self.output_dir
-                while not p.exists() and p.parent != p:
-                    p = p.parent
-                if not p.exists():
-                    return (0, 0)
-                path_to_check = p
-            else:
-                path_to_check = self.output_dir
-
-            # Use shutil for cross-platform disk usage
-            total, used, free = shutil.disk_usage(str(path_to_check))
-            free_gb = free / (1024**3)
+            free_gb = self._free_bytes() / (1024**3)
 
             # Estimate bitrate from format definition
             fmt  = self.output_format
@@ -381,37 +488,18 @@ class CameraState:
         Scan output directory for existing clips from today to find the next available number.
         Prevents overwriting files if the app is restarted.
         """
-        if not self.output_dir.exists():
-            return
-
         today_str = datetime.datetime.now().strftime("%Y%m%d")
         max_num = 0
 
-        # Pattern: CLIP_YYYYMMDD_####.ext
-        # We look for files starting with CLIP_{today}_
-        prefix = f"CLIP_{today_str}_"
-
+        # One getdents pass; DirEntry names are plain str, no Path or stat per file
         try:
-            for f in self.output_dir.iterdir():
-                # Extract the #### part
-                # f.name might be CLIP_20250220_0001.mp4
-                try:
-                    if f.name.startswith(prefix):
-                        # Standard format is CLIP_YYYYMMDD_####.ext
-                        # We use rsplit to handle dots in filenames gracefully if needed,
-                        # but simpler is assuming standard structure.
-                        parts = f.stem.split('_')
-                        # Expecting ["CLIP", "YYYYMMDD", "####"]
-                        if len(parts) >= 3:
-                            num_part = parts[-1]  # Should be ####
-                            if num_part.isdigit():
-                                num = int(num_part)
-                                if num > max_num:
-                                    max_num = num
-                except ValueError:
-                    pass
+            with os.scandir(self.output_dir) as it:
+                for entry in it:
+                    m = _CLIP_NAME_RE.match(entry.name)
+                    if m and m.group(1) == today_str:
+                        max_num = max(max_num, int(m.group(2)))
         except OSError:
-            pass
+            return
 
         if max_num > 0:
             self.clip_number = max_num + 1
@@ -420,24 +508,168 @@ class CameraState:
 # ─────────────────────────────────────────────
 #  V4L2 Control Layer
 # ─────────────────────────────────────────────
+# struct v4l2_queryctrl / v4l2_control and their ioctl numbers (_IOWR('V', n))
+_V4L2_QUERYCTRL = struct.Struct("=II32siiiiI2I")
+_V4L2_CONTROL   = struct.Struct("=Ii")
+VIDIOC_G_CTRL    = (3 << 30) | (_V4L2_CONTROL.size   << 16) | (ord("V") << 8) | 27
+VIDIOC_S_CTRL    = (3 << 30) | (_V4L2_CONTROL.size   << 16) | (ord("V") << 8) | 28
+VIDIOC_QUERYCTRL = (3 << 30) | (_V4L2_QUERYCTRL.size << 16) | (ord("V") << 8) | 36
+V4L2_CTRL_FLAG_DISABLED   = 0x0001
+V4L2_CTRL_FLAG_NEXT_CTRL  = 0x80000000
+V4L2_CTRL_TYPE_CTRL_CLASS = 6
+
+
+def _ctrl_var(name: bytes) -> str:
+    """Driver control name → v4l2-ctl style, e.g. b'Focus, Absolute' → 'focus_absolute'."""
+    text = name.split(b"\0", 1)[0].decode("ascii", "replace").lower()
+    return re.sub(r"[^a-z0-9]+", "_", text).strip("_")
+
+
+class V4L2Device:
+    """
+    Camera controls over ioctls on one fd kept open for the session —
+    the same calls v4l2-ctl makes, without a fork+exec per control.
+    Controls are enumerated once and looked up by their v4l2-ctl name.
+    """
+    def __init__(self, device):
+        self.device   = device
+        self.fd       = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+        self.controls = self._enumerate()   # name → (id, min, max, step, default)
+
+    def _enumerate(self):
+        controls = {}
+        qid = V4L2_CTRL_FLAG_NEXT_CTRL
+        while True:
+            buf = bytearray(_V4L2_QUERYCTRL.size)
+            struct.pack_into("=I", buf, 0, qid)
+            try:
+                fcntl.ioctl(self.fd, VIDIOC_QUERYCTRL, buf)
+            except OSError:
+                break   # EINVAL once past the last control
+            cid, ctype, name, lo, hi, step, default, flags, _, _ = _V4L2_QUERYCTRL.unpack(buf)
+            qid = cid | V4L2_CTRL_FLAG_NEXT_CTRL
+            if ctype != V4L2_CTRL_TYPE_CTRL_CLASS and not flags & V4L2_CTRL_FLAG_DISABLED:
+                controls[_ctrl_var(name)] = (cid, lo, hi, step, default)
+        return controls
+
+    def query(self, control):
+        """(id, min, max, step, default) for a control, or None if the camera lacks it."""
+        return self.controls.get(control)
+
+    def get(self, control):
+        ctrl = self.controls.get(control)
+        if ctrl is None:
+            return None
+        buf = bytearray(_V4L2_CONTROL.pack(ctrl[0], 0))
+        fcntl.ioctl(self.fd, VIDIOC_G_CTRL, buf)
+        return _V4L2_CONTROL.unpack(buf)[1]
+
+    def set(self, control, value):
+        ctrl = self.controls.get(control)
+        if ctrl is None:
+            return False
+        fcntl.ioctl(self.fd, VIDIOC_S_CTRL, bytearray(_V4L2_CONTROL.pack(ctrl[0], int(value))))
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+_v4l2_devices = {}
+# Held across the ioctls as well as open/close, so one thread (HAT, key
+# handlers) can't close an fd while another is mid-call on it
+_v4l2_lock    = threading.RLock()
+# errnos meaning the device itself went away, not that it refused a value
+_V4L2_GONE    = frozenset((errno.ENODEV, errno.ENXIO, errno.EBADF))
+
+def _v4l2_device(device):
+    """Shared V4L2Device for ``device``, or None to fall back to v4l2-ctl."""
+    if not FCNTL_OK:
+        return None
+    with _v4l2_lock:
+        dev = _v4l2_devices.get(device)
+        if dev is None:
+            try:
+                dev = _v4l2_devices[device] = V4L2Device(device)
+            except OSError:
+                return None
+        return dev
+
+def _v4l2_failed(device, err):
+    """
+    After a failed ioctl (lock held).  A rejected value — EINVAL, ERANGE,
+    EBUSY, EACCES, e.g. gain while auto-exposure is on — keeps the fd; only
+    an unplugged device is closed and forgotten, so the next call reopens.
+    """
+    if err.errno not in _V4L2_GONE:
+        return
+    dev = _v4l2_devices.pop(device, None)
+    if dev is not None:
+        try:
+            dev.close()
+        except OSError:
+            pass
+
 def v4l2_set(device, control, value):
-    """Set a V4L2 control via v4l2-ctl."""
+    """Set a V4L2 control (ioctl, or v4l2-ctl if the device can't be opened)."""
+    with _v4l2_lock:
+        dev = _v4l2_device(device)
+        if dev is not None:
+            try:
+                return dev.set(control, value)
+            except OSError as e:
+                _v4l2_failed(device, e)
+                return False
     cmd = ["v4l2-ctl", f"--device={device}", f"--set-ctrl={control}={value}"]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            check=False)
+    return result.returncode == 0
+
+def v4l2_set_many(device, pairs):
+    """
+    Set several controls in order.  The v4l2-ctl fallback batches them into
+    one --set-ctrl=a=1,b=2 call; it applies them sorted by name, so callers
+    split writes that depend on each other (auto modes before values).
+    """
+    if not pairs:
+        return True
+    dev = _v4l2_device(device)
+    if dev is not None:
+        results = [v4l2_set(device, c, v) for c, v in pairs]   # try all, even after a failure
+        return all(results)
+    ctrls = ",".join(f"{c}={v}" for c, v in pairs)
+    result = subprocess.run(["v4l2-ctl", f"--device={device}", f"--set-ctrl={ctrls}"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
     return result.returncode == 0
 
 def v4l2_get(device, control):
     """Get a V4L2 control value. Returns int or None."""
+    with _v4l2_lock:
+        dev = _v4l2_device(device)
+        if dev is not None:
+            try:
+                return dev.get(control)
+            except OSError as e:
+                _v4l2_failed(device, e)
+                return None
     cmd = ["v4l2-ctl", f"--device={device}", f"--get-ctrl={control}"]
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode == 0:
         # Output: "exposure_time_absolute: 500"
         try:
-            return int(result.stdout.strip().split(":")[1].strip())
-        except Exception:
+            return int(result.stdout.partition(":")[2])
+        except ValueError:
             return None
     return None
 
+def v4l2_query_controls(device):
+    """
+    Camera controls from VIDIOC_QUERYCTRL, keyed by v4l2-ctl name →
+    (id, min, max, step, default).  None when the device can't be opened.
+    """
+    dev = _v4l2_device(device)
+    return dict(dev.controls) if dev is not None else None
+
 def v4l2_list_controls(device):
     """Return raw output of all controls for debugging."""
     result = subprocess.run(
@@ -446,61 +678,99 @@ def v4l2_list_controls(device):
     )
     return result.stdout
 
+# v4l2-ctl --list-ctrls:
+#   "focus_absolute 0x009a090a (int) : min=0 max=1023 step=1 default=0 ..."
+_FOCUS_RANGE_RE = re.compile(rb"^\s*focus_absolute\b[^\n]*?\bmin=(-?\d+)[^\n]*?\bmax=(-?\d+)", re.M)
+# arecord -l: "card 2: OBSBOT_Meet2 [OBSBOT Meet2], device 0: USB Audio [USB Audio]"
+_ALSA_CARD_RE = re.compile(
+    rb"^card\s+(\d+):[^\n]*?(?:" + b"|".join(re.escape(n.encode()) for n in OBSBOT_USB_NAMES) + rb")",
+    re.M | re.I)
+# /proc/asound/cards: " 2 [Meet2          ]: USB-Audio - OBSBOT Meet2"
+_ASOUND_CARD_RE = re.compile(rb"^\s*(\d+) \[(\S+)\s*\]: [^\n]*? - ([^\n]*)$", re.M)
+# /proc/asound/pcm:   "02-00: USB Audio : USB Audio : capture 1"
+_ASOUND_PCM_RE = re.compile(rb"^(\d+)-(\d+): ([^:\n]*?) : ([^:\n]*?) :[^\n]*\bcapture\b", re.M)
+
+
 def detect_focus_range(state: CameraState):
     """Query the camera for its focus_absolute min/max and update state."""
-    result = subprocess.run(
+    dev = _v4l2_device(state.device)
+    if dev is not None:
+        ctrl = dev.query(V4L2_FOCUS_ABS)
+        if ctrl is not None:
+            state.focus_max = ctrl[2]
+            state.focus = max(ctrl[1], min(state.focus, state.focus_max))
+        return
+    out = subprocess.run(
         ["v4l2-ctl", f"--device={state.device}", "--list-ctrls"],
-        capture_output=True, text=True
-    )
-    for line in result.stdout.splitlines():
-        if "focus_absolute" in line and "max=" in line:
-            try:
-                parts = {k: int(v) for k, v in
-                         (p.split("=") for p in line.split() if "=" in p)}
-                state.focus_max = parts.get("max", FOCUS_MAX)
-                # Clamp current focus value to detected range
-                state.focus = max(parts.get("min", 0),
-                                  min(state.focus, state.focus_max))
-            except Exception:
-                pass
-            break
+        capture_output=True, check=False
+    ).stdout
+    m = _FOCUS_RANGE_RE.search(out or b"")
+    if m:
+        state.focus_max = int(m.group(2))
+        # Clamp current focus value to detected range
+        state.focus = max(int(m.group(1)), min(state.focus, state.focus_max))
 
 def apply_camera_settings(state: CameraState):
     """Push current state to camera via V4L2."""
     dev = state.device
 
-    # Exposure mode first
-    exp_auto_val = 3 if state.auto_exp else 1
-    v4l2_set(dev, V4L2_EXPOSURE_AUTO, exp_auto_val)
+    # Auto modes first — manual values are rejected while auto is on
+    v4l2_set_many(dev, [
+        (V4L2_EXPOSURE_AUTO, 3 if state.auto_exp else 1),
+        (V4L2_WB_AUTO,       1 if state.auto_wb else 0),
+        (V4L2_FOCUS_AUTO,    1 if state.auto_focus else 0),
+    ])
 
+    values = [(V4L2_GAIN, state.gain)]
     if not state.auto_exp:
-        v4l2_set(dev, V4L2_EXPOSURE, state.exposure)
-
-    # Gain
-    v4l2_set(dev, V4L2_GAIN, state.gain)
-
-    # White balance
-    v4l2_set(dev, V4L2_WB_AUTO, 1 if state.auto_wb else 0)
+        values.append((V4L2_EXPOSURE, state.exposure))
     if not state.auto_wb:
-        v4l2_set(dev, V4L2_WB_TEMP, state.wb_temp)
-
-    # Focus
-    v4l2_set(dev, V4L2_FOCUS_AUTO, 1 if state.auto_focus else 0)
+        values.append((V4L2_WB_TEMP, state.wb_temp))
     if not state.auto_focus:
-        v4l2_set(dev, V4L2_FOCUS_ABS, state.focus)
+        values.append((V4L2_FOCUS_ABS, state.focus))
+    v4l2_set_many(dev, values)
 
 # ─────────────────────────────────────────────
 #  Audio Detection & Metering Engine
 # ─────────────────────────────────────────────
+def _asound_capture_list():
+    """
+    ALSA capture devices in arecord -l's "card N: ..., device M: ..." form,
+    built from /proc/asound — two file reads instead of a fork/exec.
+    None when the tables aren't there (no ALSA, or not Linux).
+    """
+    try:
+        cards = (ASOUND_DIR / "cards").read_bytes()
+        pcm   = (ASOUND_DIR / "pcm").read_bytes()
+    except OSError:
+        return None
+    names = {int(m[1]): (m[2], m[3].strip()) for m in _ASOUND_CARD_RE.finditer(cards)}
+    lines = []
+    for m in _ASOUND_PCM_RE.finditer(pcm):
+        card = int(m[1])
+        card_id, card_name = names.get(card, (b"?", b"?"))
+        lines.append(b"card %d: %s [%s], device %d: %s [%s]\n"
+                     % (card, card_id, card_name, int(m[2]), m[3], m[4]))
+    return b"".join(lines)
+
+
+def _alsa_capture_listing():
+    """arecord -l style device list — /proc/asound, else arecord itself."""
+    out = _asound_capture_list()
+    if out is None:
+        out = subprocess.run(["arecord", "-l"], capture_output=True, check=False).stdout
+    return out or b""
+
+
 def detect_audio_device(state: CameraState):
     """
-    Find the OBSBOT's ALSA audio device by scanning arecord -l output.
+    Find the OBSBOT's ALSA audio device by scanning the capture device list.
     Sets state.audio_device (ALSA hw:X,0 string) and state.audio_device_sd
     (sounddevice index).  Falls back to default input if not found.
     """
     # ── ALSA device string for FFmpeg ──
     try:
-        result = subprocess.run(["arecord", "-l"], capture_output=True, text=True)
+        out = _alsa_capture_listing()
     except FileNotFoundError:
         print("[AUDIO] 'arecord' not found — audio input disabled")
         state.audio_device  = None
@@ -508,17 +778,10 @@ def detect_audio_device(state: CameraState):
         return
 
     alsa_card = None
-    for line in result.stdout.splitlines():
-        low = line.lower()
-        if any(name in low for name in OBSBOT_USB_NAMES):
-            # Line looks like: "card 2: OBSBOT_Meet2 [OBSBOT Meet2], device 0: ..."
-            try:
-                card_num = int(line.split("card")[1].split(":")[0].strip())
-                alsa_card = f"hw:{card_num},0"
-                print(f"[AUDIO] Found OBSBOT mic → ALSA {alsa_card}")
-            except Exception:
-                pass
-            break
+    m = _ALSA_CARD_RE.search(out)
+    if m:
+        alsa_card = f"hw:{int(m.group(1))},0"
+        print(f"[AUDIO] Found OBSBOT mic → ALSA {alsa_card}")
 
     if alsa_card is None:
         print("[AUDIO] No mic found — recording video-only")
@@ -530,7 +793,8 @@ def detect_audio_device(state: CameraState):
     state.audio_device = alsa_card
 
     # ── sounddevice index for live metering ──
-    if SD_OK:
+    sd = _sounddevice() if SD_OK else None
+    if sd is not None:
         try:
             devices = sd.query_devices()
             for i, dev in enumerate(devices):
@@ -538,28 +802,68 @@ def detect_audio_device(state: CameraState):
                     low = dev["name"].lower()
                     if any(name in low for name in OBSBOT_USB_NAMES):
                         state.audio_device_sd = i
+                        state.audio_input_channels = min(AUDIO_CHANNELS, dev["max_input_channels"])
                         print(f"[AUDIO] Meter device → [{i}] {dev['name']}")
                         return
             # Fallback: use default input
             state.audio_device_sd = sd.default.device[0]
+            if state.audio_device_sd is not None and state.audio_device_sd >= 0:
+                state.audio_input_channels = min(
+                    AUDIO_CHANNELS, devices[state.audio_device_sd]["max_input_channels"])
         except Exception as e:
             print(f"[AUDIO] sounddevice probe failed: {e}")
             state.audio_device_sd = None
 
 
+def _parse_cpus(spec: str) -> set:
+    """CPU list in taskset syntax ("0", "1-3", "0,2") → the allowed subset of it."""
+    cpus = set()
+    try:
+        for part in filter(None, spec.replace(" ", "").split(",")):
+            lo, _, hi = part.partition("-")
+            cpus.update(range(int(lo), int(hi or lo) + 1))
+        return cpus & os.sched_getaffinity(0)
+    except (AttributeError, ValueError, OSError):
+        return set()
+
+
+def _pin_realtime(tid: int, cpu_spec: str, prio: int) -> None:
+    """Pin thread `tid` to cpu_spec and make it SCHED_FIFO where allowed."""
+    cpus = _parse_cpus(cpu_spec)
+    try:
+        if cpus:
+            os.sched_setaffinity(tid, cpus)
+        os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(prio))
+    except (AttributeError, OSError):
+        pass
+
+
+def _ffmpeg_taskset() -> list:
+    """`taskset` prefix confining FFmpeg to $FFMPEG_CPUS, or [] when unset."""
+    cpus = _parse_cpus(FFMPEG_CPUS)
+    if not cpus or not shutil.which("taskset"):
+        return []
+    # taskset execs FFmpeg in place, so the pid and stdin "q" still reach it
+    return ["taskset", "-c", ",".join(map(str, sorted(cpus)))]
+
+
 class AudioMeter:
     """
-    Background thread that reads from the mic via sounddevice and
-    updates state.audio_levels / state.audio_peaks in real time.
-    Runs independently of FFmpeg — purely for the visual meters.
+    Background thread that opens the mic via sounddevice and updates
+    state.audio_levels / state.audio_peaks in real time from the stream
+    callback.  Runs independently of FFmpeg — purely for the visual meters.
     """
+    BLOCK = 1024  # samples per callback (~21 ms at 48 kHz)
+
     def __init__(self, state: CameraState):
         self.state   = state
         self._stop   = threading.Event()
         self._thread = None
+        self._peaks  = None
+        self._pinned = False
 
     def start(self):
-        if not SD_OK:
+        if not SD_OK or _sounddevice() is None:
             return
         if self.state.audio_device_sd is None or self.state.audio_device_sd < 0:
             print("[AUDIO] No meter device — levels will show 0")
@@ -571,28 +875,35 @@ class AudioMeter:
     def stop(self):
         self._stop.set()
 
+    def _callback(self, indata, frames, _time, _status):
+        """PortAudio's thread: meter one block straight from its buffer."""
+        if not self._pinned:
+            # Short blocks every ~21 ms: keep the encoder threads from starving it
+            _pin_realtime(0, AUDIO_CPU, AUDIO_RT_PRIO)
+            self._pinned = True
+        # RMS of every channel in one multiply-reduce pass, 64-bit
+        # accumulators so 16-bit squares can't overflow; scaled to 0–1
+        sq  = np.einsum("ij,ij->j", indata, indata, dtype=np.int64)
+        rms = np.sqrt(sq / frames) * (1.0 / 32768.0)
+        # Peak hold with decay
+        self._peaks = np.maximum(rms, self._peaks * AUDIO_METER_DECAY)
+        n = len(rms)
+        self.state.audio_levels[:n] = rms.tolist()
+        self.state.audio_peaks[:n]  = self._peaks.tolist()
+
     def _run(self):
-        BLOCK = 1024  # samples per callback
+        channels = self.state.audio_input_channels
+        self._peaks = np.zeros(channels, np.float32)
         try:
-            with sd.InputStream(
+            with _sounddevice().InputStream(
                 device=self.state.audio_device_sd,
-                channels=min(AUDIO_CHANNELS,
-                             sd.query_devices(self.state.audio_device_sd)["max_input_channels"]),
+                channels=channels,
                 samplerate=AUDIO_SAMPLE_RATE,
-                blocksize=BLOCK,
-                dtype="float32",
-            ) as stream:
-                while not self._stop.is_set():
-                    data, _ = stream.read(BLOCK)
-                    # RMS per channel
-                    for ch in range(data.shape[1]):
-                        rms = float(np.sqrt(np.mean(data[:, ch] ** 2)))
-                        self.state.audio_levels[ch] = rms
-                        # Peak hold with decay
-                        if rms > self.state.audio_peaks[ch]:
-                            self.state.audio_peaks[ch] = rms
-                        else:
-                            self.state.audio_peaks[ch] *= AUDIO_METER_DECAY
+                blocksize=self.BLOCK,
+                dtype="int16",      # the mic's native PCM — no float upconvert
+                callback=self._callback,
+            ):
+                self._stop.wait()
         except Exception as e:
             print(f"[AUDIO] Meter error: {e}")
 
@@ -602,27 +913,84 @@ def audio_gain_linear(state: CameraState) -> float:
     return 10 ** (state.mic_gain_db / 20.0)
 
 
+@functools.lru_cache(maxsize=64)
+def _volume_filter(gain_db) -> str:
+    """FFmpeg volume filter for a mic gain in dB (gain moves in 3 dB steps)."""
+    return f"volume={10 ** (gain_db / 20.0):.4f}"
+
+
 def list_audio_devices():
     """Print all ALSA capture devices for diagnostics."""
     try:
-        result = subprocess.run(["arecord", "-l"], capture_output=True, text=True)
-        return result.stdout
+        return _alsa_capture_listing().decode(errors="replace")
     except FileNotFoundError:
         return "  'arecord' not found (alsa-utils missing?)"
 # ─────────────────────────────────────────────
 #  FFmpeg Recording Engine
 # ─────────────────────────────────────────────
-def build_ffmpeg_cmd(state: CameraState, output_path: str) -> list:
+@functools.lru_cache(maxsize=1)
+def ffmpeg_encoders() -> frozenset:
+    """Names of the video/audio encoders this FFmpeg build has (queried once)."""
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, timeout=5, check=False)
+    except (OSError, subprocess.TimeoutExpired):
+        return frozenset()
+    # Lines look like: " V....D libx264              libx264 H.264 ..."
+    return frozenset(parts[1] for parts in map(str.split, result.stdout.splitlines())
+                     if len(parts) > 1 and len(parts[0]) == 6)
+
+
+@functools.lru_cache(maxsize=8)
+def tool_version(*argv):
+    """First line a tool prints for ``argv`` (e.g. "ffmpeg", "-version"), or None if it fails."""
+    try:
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=5, check=False)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.partition("\n")[0].strip()
+
+
+def format_available(fmt) -> bool:
+    """
+    True unless the format's encoder device is missing, or FFmpeg was
+    queried and lacks its video encoder.
+    """
+    if "needs_dev" in fmt and not os.path.exists(fmt["needs_dev"]):
+        return False
+    encoders = ffmpeg_encoders()
+    return not encoders or fmt["vcodec"] in encoders
+
+
+def format_refusal(state: CameraState):
+    """Why the selected hardware format can't record at these settings, or None."""
+    fmt = state.output_format
+    if "needs_dev" in fmt and not os.path.exists(fmt["needs_dev"]):
+        return f"{fmt['label']}: no hardware encoder on this board ({fmt['needs_dev']} missing)"
+    if "max_height" in fmt and int(state.resolution.split("x")[1]) > fmt["max_height"]:
+        return (f"{fmt['label']} encodes up to {fmt['max_height']}p — "
+                f"use --res 1920x1080 or another format")
+    return None
+
+
+def build_ffmpeg_cmd(state: CameraState, output_path: str, preview=None) -> list:
     """
     Build the FFmpeg command. FFmpeg always opens the V4L2 device directly —
     the GUI releases the camera first, FFmpeg records, then GUI reopens.
     This avoids the 700MB/s pipe bottleneck of passing raw 4K frames.
+    preview: optional (w, h) — adds a second, downscaled raw BGR output on
+    stdout so the GUI keeps a live picture while FFmpeg owns the camera.
     """
     fmt = state.output_format
 
     cmd = [
         "ffmpeg", "-y",
         # ── Video input via V4L2 ─────────────────────────────────────
+        # A deeper demux queue lets capture keep dequeuing while the
+        # encoder threads are busy (ProRes bursts) instead of dropping
+        "-thread_queue_size", "32",
         "-f", "v4l2",
         "-input_format", "mjpeg",
         "-video_size", state.resolution,
@@ -642,7 +1010,8 @@ def build_ffmpeg_cmd(state: CameraState, output_path: str) -> list:
         ]
 
     # ── Video encode ─────────────────────────────────────────────────
-    cmd += ["-vcodec", fmt["vcodec"]] + fmt["vparams"]
+    threads = getattr(state, "encoder_threads", 0)   # 0 = one per core
+    cmd += ["-vcodec", fmt["vcodec"], "-threads", str(threads)] + fmt["vparams"]
     cmd += [
         "-colorspace",      "bt709",
         "-color_primaries", "bt709",
@@ -656,8 +1025,7 @@ def build_ffmpeg_cmd(state: CameraState, output_path: str) -> list:
             cmd += ["-b:a", fmt["abitrate"]]
         cmd += ["-ar", str(AUDIO_SAMPLE_RATE), "-ac", str(AUDIO_CHANNELS)]
         if abs(state.mic_gain_db) > 0.1:
-            gain = audio_gain_linear(state)
-            cmd += ["-af", f"volume={gain:.4f}"]
+            cmd += ["-af", _volume_filter(state.mic_gain_db)]
     else:
         cmd += ["-an"]
 
@@ -669,8 +1037,61 @@ def build_ffmpeg_cmd(state: CameraState, output_path: str) -> list:
         "-metadata", f"comment=Format:{fmt['label']}",
         output_path,
     ]
+    if preview:
+        pw, ph = preview
+        cmd += [
+            "-map", "0:v", "-vf", f"scale={pw}:{ph}",
+            "-pix_fmt", "bgr24", "-f", "rawvideo", "pipe:1",
+        ]
     return cmd
 
+
+def _grow_pipe(pipe, size: int = FFMPEG_PIPE_SIZE) -> None:
+    """Best-effort enlarge a pipe's kernel buffer (Linux F_SETPIPE_SZ)."""
+    if not FCNTL_OK or pipe is None:
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), getattr(fcntl, "F_SETPIPE_SZ", 1031), size)
+    except (OSError, ValueError, TypeError):
+        pass   # not Linux, above /proc/sys/fs/pipe-max-size, or not a real pipe
+
+
+class PreviewTap:
+    """
+    Drains FFmpeg's raw BGR preview output while recording and keeps only
+    the newest frame, so a slow GUI loop never back-pressures the encoder.
+    """
+    def __init__(self, pipe, w: int, h: int):
+        self._pipe  = pipe
+        self._shape = (h, w, 3)
+        self._size  = w * h * 3
+        self._lock  = threading.Lock()
+        self._frame = None
+        self._seq   = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                buf = self._pipe.read(self._size)
+            except (OSError, ValueError):
+                break
+            if not buf or len(buf) < self._size:
+                break   # EOF — FFmpeg stopped
+            frame = np.frombuffer(buf, np.uint8).reshape(self._shape)
+            with self._lock:
+                self._frame = frame
+                self._seq  += 1
+
+    def latest(self) -> tuple:
+        """(sequence number, newest frame or None)."""
+        with self._lock:
+            return self._seq, self._frame
+
+    def join(self, timeout: float = 1.0):
+        self._thread.join(timeout)
+
 def start_recording(state: CameraState, cap=None) -> bool:
     """
     Start FFmpeg recording.
@@ -679,6 +1100,10 @@ def start_recording(state: CameraState, cap=None) -> bool:
     """
     if state.recording:
         return False
+    refusal = format_refusal(state)
+    if refusal:
+        print(f"[REC] {refusal}")
+        return False
 
     state.output_dir.mkdir(parents=True, exist_ok=True)
     output_path = str(state.output_dir / state.clip_name)
@@ -688,36 +1113,42 @@ def start_recording(state: CameraState, cap=None) -> bool:
         cap.release()
         time.sleep(0.3)   # give the driver a moment to fully release
 
-    cmd = build_ffmpeg_cmd(state, output_path)
+    # GUI: FFmpeg also pipes back a small preview so the window stays live
+    preview = PREVIEW_TEE if cap is not None and NP_OK else None
+    cmd = build_ffmpeg_cmd(state, output_path, preview)
     print(f"[REC] Starting: {output_path}")
     print(f"[REC] Format: {state.format_label}  codec: {state.output_format['vcodec']}")
 
-    stderr_file = None
-    if state.mode == "headless":
+    stderr_file = _ffmpeg_log(state) if state.mode == "headless" else None
+    if stderr_file is not None:
         try:
-            log_path = state.output_dir / "ffmpeg.log"
-            stderr_file = open(log_path, "a")
             stderr_file.write(f"\n[{datetime.datetime.now()}] Starting recording {state.clip_name}\n")
             stderr_file.flush()
         except Exception as e:
-            print(f"[WARN] Failed to open log file: {e}")
+            print(f"[WARN] Failed to write log file: {e}")
 
     try:
-        try:
-            state.ffmpeg_proc = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.DEVNULL,
-                stderr=stderr_file,
-            )
-        finally:
-            if stderr_file:
-                stderr_file.close()
+        state.ffmpeg_proc = subprocess.Popen(
+            _ffmpeg_taskset() + cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE if preview else subprocess.DEVNULL,
+            stderr=stderr_file,
+            bufsize=FFMPEG_PIPE_SIZE,
+        )
+        # A 960x540 BGR preview frame is ~1.5 MB — don't make FFmpeg
+        # block every 64 KiB waiting for the tap to catch up
+        _grow_pipe(state.ffmpeg_proc.stdin)
+        if preview:
+            _grow_pipe(state.ffmpeg_proc.stdout)
+        # Start draining before the settle sleep — one frame outgrows the pipe
+        if preview:
+            state.preview_tap = PreviewTap(state.ffmpeg_proc.stdout, *preview)
 
         time.sleep(0.8)
         if state.ffmpeg_proc.poll() is not None:
             print(f"[ERROR] FFmpeg exited immediately (code {state.ffmpeg_proc.returncode})")
             state.ffmpeg_proc = None
+            state.preview_tap = None
             return False
 
         state.recording  = True
@@ -732,6 +1163,27 @@ def start_recording(state: CameraState, cap=None) -> bool:
         return False
 
 
+def _ffmpeg_log(state: CameraState):
+    """Headless FFmpeg stderr log — opened on the first clip, reused for the session."""
+    if state.ffmpeg_log is None:
+        try:
+            state.ffmpeg_log = open(state.output_dir / "ffmpeg.log", "a", buffering=1)
+        except Exception as e:
+            print(f"[WARN] Failed to open log file: {e}")
+    return state.ffmpeg_log
+
+
+def close_ffmpeg_log(state: CameraState) -> None:
+    """Close the session's FFmpeg log (each FFmpeg keeps its own copy of the fd)."""
+    log = getattr(state, "ffmpeg_log", None)
+    if log is not None:
+        state.ffmpeg_log = None
+        try:
+            log.close()
+        except OSError:
+            pass
+
+
 def stop_recording(state: CameraState, cap=None, cap_w=3840, cap_h=2160, cap_fps=30) -> None:
     """
     Stop FFmpeg gracefully then reopen the camera for the GUI preview.
@@ -743,8 +1195,10 @@ def stop_recording(state: CameraState, cap=None, cap_w=3840, cap_h=2160, cap_fps
     if state.ffmpeg_proc.poll() is None:
         try:
             try:
-                state.ffmpeg_proc.stdin.write(b"q")
-                state.ffmpeg_proc.stdin.flush()
+                # Straight to the pipe fd: nothing else is ever buffered on
+                # stdin, and a raw write can't re-enter the BufferedWriter
+                # if the SIGINT handler lands here too
+                os.write(state.ffmpeg_proc.stdin.fileno(), b"q")
             except (BrokenPipeError, AttributeError):
                 print("[WARN] FFmpeg stdin broken (already exited?)")
 
@@ -766,6 +1220,11 @@ def stop_recording(state: CameraState, cap=None, cap_w=3840, cap_h=2160, cap_fps
     else:
         print(f"[WARN] FFmpeg had already exited (code {state.ffmpeg_proc.returncode})")
 
+    tap = getattr(state, "preview_tap", None)
+    if tap is not None:
+        tap.join()   # ends at FFmpeg's EOF
+        state.preview_tap = None
+
     state.recording   = False
     state.rec_start   = None
     state.clip_number += 1
@@ -776,16 +1235,241 @@ def stop_recording(state: CameraState, cap=None, cap_w=3840, cap_h=2160, cap_fps
     if cap is not None:
         time.sleep(0.5)   # let FFmpeg fully release the device
         cap.open(state.device, cv2.CAP_V4L2)
-        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH,  cap_w)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, cap_h)
-        cap.set(cv2.CAP_PROP_FPS, cap_fps)
+        setup_capture(cap, cap_w, cap_h, cap_fps)
         print("[GUI] Preview resumed.")
 
+# ─────────────────────────────────────────────
+#  Key Bindings (shared by GUI and headless)
+# ─────────────────────────────────────────────
+def _step(value, step, lo, hi):
+    """Nudge ``value`` by ``step``, clamped only in the direction of travel."""
+    return min(value + step, hi) if step > 0 else max(value + step, lo)
+
+
+def _key_exposure(state, step):
+    state.exposure = _step(state.exposure, step, 50, 10000)
+    if not state.auto_exp:
+        v4l2_set(state.device, V4L2_EXPOSURE, state.exposure)
+    return f"EXP {state.exposure}", COLOR_WHITE
+
+
+def _key_gain(state, step):
+    state.gain = _step(state.gain, step, 0, 500)
+    v4l2_set(state.device, V4L2_GAIN, state.gain)
+    return f"ISO ~{state.gain * 10}", COLOR_WHITE
+
+
+def _key_wb(state, step):
+    state.wb_temp = _step(state.wb_temp, step, 2000, 10000)
+    if not state.auto_wb:
+        v4l2_set(state.device, V4L2_WB_TEMP, state.wb_temp)
+    return f"WB {state.wb_temp}K", COLOR_WHITE
+
+
+def _key_auto_exp(state):
+    state.auto_exp = not state.auto_exp
+    v4l2_set(state.device, V4L2_EXPOSURE_AUTO, 3 if state.auto_exp else 1)
+    return ("AUTO EXPOSURE", COLOR_GREEN) if state.auto_exp else ("MANUAL EXP", COLOR_AMBER)
+
+
+def _key_auto_wb(state):
+    state.auto_wb = not state.auto_wb
+    v4l2_set(state.device, V4L2_WB_AUTO, 1 if state.auto_wb else 0)
+    return ("AUTO WB", COLOR_GREEN) if state.auto_wb else ("MANUAL WB", COLOR_AMBER)
+
+
+def _key_auto_focus(state):
+    state.auto_focus = not state.auto_focus
+    v4l2_set(state.device, V4L2_FOCUS_AUTO, 1 if state.auto_focus else 0)
+    if not state.auto_focus:             # seed manual position from camera
+        current = v4l2_get(state.device, V4L2_FOCUS_ABS)
+        if current is not None:
+            state.focus = current
+    return ("AUTOFOCUS", COLOR_GREEN) if state.auto_focus else ("MANUAL FOCUS", COLOR_AMBER)
+
+
+def _key_focus(state, step):
+    if state.auto_focus:
+        return None
+    state.focus = _step(state.focus, step, FOCUS_MIN, state.focus_max)
+    v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
+    return f"FOCUS {state.focus_pct}%", COLOR_WHITE
+
+
+def _key_mute(state):
+    state.audio_muted = not state.audio_muted
+    return ("MIC MUTED", COLOR_RED) if state.audio_muted else ("MIC LIVE", COLOR_GREEN)
+
+
+def _key_mic_gain(state, step):
+    state.mic_gain_db = _step(state.mic_gain_db, step, -20, 20)
+    return f"MIC {state.mic_gain_db}dB", COLOR_WHITE
+
+
+def _key_toggle(attr, label):
+    """Handler flipping a boolean overlay flag on the state."""
+    def handler(state):
+        on = not getattr(state, attr)
+        setattr(state, attr, on)
+        return f"{label} {'ON' if on else 'OFF'}", COLOR_GREEN if on else COLOR_RED
+    return handler
+
+
+# key → handler(state) → (toast text, colour) or None. Record, help, format
+# and quit touch the mode's own loop state and stay in the loops.
+KEY_ACTIONS = {
+    "e": functools.partial(_key_exposure, step=50),
+    "d": functools.partial(_key_exposure, step=-50),
+    "g": functools.partial(_key_gain, step=10),
+    "f": functools.partial(_key_gain, step=-10),
+    "w": functools.partial(_key_wb, step=100),
+    "s": functools.partial(_key_wb, step=-100),
+    "a": _key_auto_exp,
+    "b": _key_auto_wb,
+    "t": _key_auto_focus,
+    "]": functools.partial(_key_focus, step=FOCUS_STEP_COARSE),
+    "[": functools.partial(_key_focus, step=-FOCUS_STEP_COARSE),
+    ".": functools.partial(_key_focus, step=FOCUS_STEP_FINE),
+    ",": functools.partial(_key_focus, step=-FOCUS_STEP_FINE),
+    "m": _key_mute,
+    "+": functools.partial(_key_mic_gain, step=3),
+    "=": functools.partial(_key_mic_gain, step=3),
+    "-": functools.partial(_key_mic_gain, step=-3),
+}
+
+# The preview window adds its overlay toggles; keyed by waitKey code
+GUI_KEY_ACTIONS = {ord(k): fn for k, fn in KEY_ACTIONS.items()}
+GUI_KEY_ACTIONS.update({
+    ord("k"): _key_toggle("focus_peaking",  "PEAKING"),
+    ord("l"): _key_toggle("show_guides",    "GUIDES"),
+    ord("j"): _key_toggle("show_histogram", "HISTOGRAM"),
+})
+
+
 # ─────────────────────────────────────────────
 #  GUI Mode (OpenCV)
 # ─────────────────────────────────────────────
+def preview_size(state: CameraState) -> tuple:
+    """
+    (w, h) the GUI asks the camera for: the preview resolution, but never
+    more than the recording resolution.  FFmpeg opens the device itself
+    at state.resolution, so the preview size doesn't limit recording.
+    """
+    try:
+        pw, ph = map(int, state.preview_resolution.split("x"))
+        rw, rh = map(int, state.resolution.split("x"))
+    except (AttributeError, ValueError):
+        return 1920, 1080
+    return (pw, ph) if pw * ph <= rw * rh else (rw, rh)
+
+
+@functools.lru_cache(maxsize=1)
+def _jpeg_decoder():
+    """Shared TurboJPEG decoder, or None when PyTurboJPEG / libturbojpeg is missing."""
+    if not TURBO_OK:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        print(f"[GUI] libturbojpeg unavailable ({e}) — OpenCV decodes MJPEG")
+        return None
+
+
+def setup_capture(cap, w, h, fps):
+    """
+    Configure an open VideoCapture for MJPEG preview.  With TurboJPEG
+    available OpenCV hands back the compressed frames (CONVERT_RGB off)
+    and read_frame() decodes them with libjpeg-turbo's SIMD paths.
+    """
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    # One V4L2 buffer: the default four queue ~66 ms of stale frames at 60 fps
+    # between shutter and window. If a slow frame ever starves the driver
+    # and frames drop, 2 trades one frame of latency back for headroom.
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH,  w)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    if _jpeg_decoder() is not None:
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
+
+def read_frame(cap):
+    """cap.read(), decoding raw MJPEG buffers to BGR when passthrough is on."""
+    ret, frame = cap.read()
+    if not ret or frame is None or frame.ndim == 3:
+        return ret, frame
+    tj = _jpeg_decoder()
+    if tj is None:
+        return False, None
+    try:
+        return True, tj.decode(frame, pixel_format=TJPF_BGR,
+                               flags=TJFLAG_FASTDCT | TJFLAG_FASTUPSAMPLE)
+    except OSError:
+        return False, None   # corrupt frame — counted like a failed grab
+
+
+class CaptureThread:
+    """
+    GUI preview producer: a daemon thread that keeps reading the camera and
+    overwrites a single slot with the newest frame, so slow UI work never
+    leaves frames queueing in the driver.  Hold `lock` while releasing or
+    reopening the capture (recording start/stop); while recording the
+    thread idles because FFmpeg owns the device.
+    """
+    def __init__(self, state: CameraState, cap, w: int, h: int):
+        self.state   = state
+        self.cap     = cap
+        self.lock    = threading.Lock()   # guards cap
+        self._w, self._h = w, h
+        self._slot   = threading.Lock()   # guards the frame slot
+        self._frame  = None
+        self._seq    = 0
+        self._stop   = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="CaptureThread")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def latest(self) -> tuple:
+        """(sequence number, newest frame or None)."""
+        with self._slot:
+            return self._seq, self._frame
+
+    def _run(self):
+        fail_count = 0
+        while not self._stop.is_set():
+            with self.lock:
+                if self.state.recording:
+                    ret, frame = None, None
+                else:
+                    ret, frame = read_frame(self.cap)
+                    if not ret or frame is None:
+                        fail_count += 1
+                        if fail_count % 30 == 1:
+                            print(f"[WARN] Frame grab failed (x{fail_count})")
+                        if fail_count > 100:
+                            print("[ERROR] Reopening camera…")
+                            self.cap.release()
+                            time.sleep(1.0)
+                            self.cap.open(self.state.device, cv2.CAP_V4L2)
+                            setup_capture(self.cap, self._w, self._h, self.state.fps)
+                            fail_count = 0
+            if ret and frame is not None:
+                fail_count = 0
+                with self._slot:
+                    self._frame = frame
+                    self._seq  += 1
+            else:
+                time.sleep(0.03 if ret is None else 0.05)
+
+
 def run_gui(state: CameraState, hat=None):
     if not CV2_OK:
         print("[ERROR] OpenCV not found. Install: pip3 install opencv-python-headless")
@@ -796,12 +1480,11 @@ def run_gui(state: CameraState, hat=None):
 
     print("[GUI] Opening camera preview… (press H for help)")
 
+    # Preview at preview_resolution — decoding 4K MJPEG just to scale it
+    # down for the window is the single biggest preview cost
+    cap_w, cap_h = preview_size(state)
     cap = cv2.VideoCapture(state.device, cv2.CAP_V4L2)
-    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
-    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)       # don't queue stale frames
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH,  3840)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 2160)
-    cap.set(cv2.CAP_PROP_FPS, state.fps)
+    setup_capture(cap, cap_w, cap_h, state.fps)
 
     if not cap.isOpened():
         print(f"[ERROR] Cannot open camera {state.device}")
@@ -812,17 +1495,17 @@ def run_gui(state: CameraState, hat=None):
     actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     print(f"[GUI] Camera opened: {actual_w}×{actual_h} @ {state.fps}fps")
 
-    # Warmup — drain the initial buffer, camera needs a moment to negotiate MJPEG
+    # Warmup — poll until the first frame decodes; a healthy camera answers
+    # within a frame or two, a sick one gets the same 3 s as before
     print("[GUI] Warming up camera…")
-    for _ in range(10):
-        cap.grab()
-    # Now do a proper read to confirm frames are coming
-    for attempt in range(30):
-        ret, frame = cap.read()
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < 3.0:
+        ret, frame = read_frame(cap)
         if ret and frame is not None:
-            print(f"[GUI] First frame received ({frame.shape[1]}×{frame.shape[0]}) after {attempt+1} attempts")
+            print(f"[GUI] First frame received ({frame.shape[1]}×{frame.shape[0]}) "
+                  f"after {(time.monotonic() - t0) * 1000:.0f} ms")
             break
-        time.sleep(0.1)
+        time.sleep(0.02)
     else:
         print("[ERROR] Camera opened but no frames received after 3 seconds.")
         print("        Try: v4l2-ctl --device={state.device} --list-formats-ext")
@@ -833,13 +1516,17 @@ def run_gui(state: CameraState, hat=None):
     # Detect camera focus range before applying settings
     detect_focus_range(state)
 
+    # Query FFmpeg's encoders now, off the render loop — the format menu
+    # would otherwise fork `ffmpeg -encoders` the first time P is pressed
+    threading.Thread(target=ffmpeg_encoders, daemon=True).start()
+
     # Detect and start audio
     detect_audio_device(state)
     meter = AudioMeter(state)
     meter.start()
 
-    # Preview at half-res for performance
-    PW, PH = actual_w // 2, actual_h // 2
+    # Window at the capture size, halved if the camera gave us more than 1080p
+    PW, PH = (actual_w // 2, actual_h // 2) if actual_w > 1920 else (actual_w, actual_h)
 
     apply_camera_settings(state)
 
@@ -849,13 +1536,17 @@ def run_gui(state: CameraState, hat=None):
     # show_peaking, show_guides, show_histogram are now in state
     format_menu_timer = 0.0
     blink_state    = True
-    blink_timer    = time.time()
+    blink_timer    = time.monotonic()
     storage_timer  = 0.0
     storage_info   = (0, 0)  # free_gb, mins
+    peak_timer     = 0.0
+    hist_timer     = 0.0
+    last_hud_sig   = None
+    hud_labels     = []
 
     # Toast state
     toast_msg = "Press 'H' for Help"
-    toast_timer = time.time()
+    toast_timer = time.monotonic()
     toast_duration = 5.0
     toast_color = COLOR_WHITE
 
@@ -863,7 +1554,7 @@ def run_gui(state: CameraState, hat=None):
         nonlocal toast_msg, toast_timer, toast_duration, toast_color
         toast_msg = msg
         toast_color = color
-        toast_timer = time.time()
+        toast_timer = time.monotonic()
         toast_duration = duration
 
     cv2.namedWindow("ObsBot CineRig", cv2.WINDOW_NORMAL)
@@ -875,137 +1566,133 @@ def run_gui(state: CameraState, hat=None):
         hat.grabber.start()
         print("[HAT] Frame grabber started — feeding from GUI")
 
-    fail_count = 0
+    # Camera reads run on their own thread; the loop below takes the newest
+    capture = CaptureThread(state, cap, actual_w, actual_h)
+    capture.start()
+
+    # Per-frame working buffers, allocated once
+    display_buf = np.empty((PH, PW, 3), np.uint8)
+    gray_buf    = np.empty((PH, PW), np.uint8)
+
     last_frame = None
+    grab_seq   = 0
+    tap_seq    = 0
+    # pollKey (OpenCV ≥ 4.5) pumps window events without waitKey's 1 ms sleep
+    poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
     while True:
-        # While recording, FFmpeg owns the camera — don't try to read from it
+        fresh = True
+        # While recording, FFmpeg owns the camera — show its preview tap instead
         if state.recording:
             if state.ffmpeg_proc and state.ffmpeg_proc.poll() is not None:
                 print(f"[WARN] FFmpeg died (code {state.ffmpeg_proc.returncode})")
-                stop_recording(state, cap=cap, cap_w=actual_w, cap_h=actual_h, cap_fps=state.fps)
+                with capture.lock:
+                    stop_recording(state, cap=cap, cap_w=actual_w, cap_h=actual_h,
+                                   cap_fps=state.fps)
                 show_toast("REC FAILED", COLOR_RED, 4.0)
             else:
-                time.sleep(0.033)
-                if last_frame is None:
-                    continue
-                frame = last_frame
+                tap = state.preview_tap
+                seq, tapped = tap.latest() if tap else (tap_seq, None)
+                if tapped is not None and seq != tap_seq:
+                    tap_seq = seq
+                    frame = last_frame = tapped
+                else:
+                    fresh = False
+                    time.sleep(0.01 if tap else 0.033)
+                    if last_frame is None:
+                        continue
+                    frame = last_frame
         else:
-            ret, frame = cap.read()
-            if not ret or frame is None:
-                fail_count += 1
-                if fail_count % 30 == 1:
-                    print(f"[WARN] Frame grab failed (x{fail_count})")
-                if fail_count > 100:
-                    print("[ERROR] Reopening camera…")
-                    cap.release()
-                    time.sleep(1.0)
-                    cap.open(state.device, cv2.CAP_V4L2)
-                    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
-                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                    cap.set(cv2.CAP_PROP_FRAME_WIDTH,  actual_w)
-                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, actual_h)
-                    cap.set(cv2.CAP_PROP_FPS, state.fps)
-                    fail_count = 0
-                time.sleep(0.05)
+            seq, frame = capture.latest()
+            if frame is None or seq == grab_seq:
+                time.sleep(0.005)   # nothing new from the camera yet
                 continue
-            fail_count = 0
+            grab_seq   = seq
             last_frame = frame
 
+        now = time.monotonic()               # one clock read for all HUD timers
+
         # ── HAT record trigger ───────────────────────────────────────
         if state.record_trigger:
             state.record_trigger = False
             if state.recording:
                 n = state.clip_number
-                stop_recording(state, cap=cap,
-                               cap_w=actual_w, cap_h=actual_h, cap_fps=state.fps)
+                with capture.lock:
+                    stop_recording(state, cap=cap,
+                                   cap_w=actual_w, cap_h=actual_h, cap_fps=state.fps)
                 show_toast(f"CLIP {n:04d} SAVED", COLOR_GREEN)
             else:
-                if start_recording(state, cap=cap):
+                with capture.lock:
+                    started = start_recording(state, cap=cap)
+                if started:
                     show_toast("REC STARTED", COLOR_RED)
                 else:
                     show_toast("REC ERROR", COLOR_RED, 3.0)
 
         # ── Feed frame to HAT live view ──────────────────────────────
-        if hat and hat.grabber and not state.recording:
+        if hat and hat.grabber and fresh:
             hat.grabber.feed_frame(frame)
 
-        # Scale for display
-        display = cv2.resize(frame, (PW, PH), interpolation=cv2.INTER_LINEAR)
+        # Scale into the reused display buffer — normally the capture is
+        # already window-sized; overlays must not land on last_frame
+        if frame.shape[1] == PW and frame.shape[0] == PH:
+            np.copyto(display_buf, frame)
+        else:
+            cv2.resize(frame, (PW, PH), dst=display_buf, interpolation=cv2.INTER_LINEAR)
+        display = display_buf
+
+        # Peaking and histogram analysis refresh at their own rates; in
+        # between the last mask / curve is drawn over the new frame
+        refresh_peak = state.focus_peaking and now - peak_timer >= PEAKING_INTERVAL
+        refresh_hist = state.show_histogram and now - hist_timer >= HISTOGRAM_INTERVAL
 
         # Compute grayscale once if needed
         gray = None
-        if (state.focus_peaking or state.show_histogram) and CV2_OK:
-            gray = cv2.cvtColor(display, cv2.COLOR_BGR2GRAY)
+        if (refresh_peak or refresh_hist) and CV2_OK:
+            gray = cv2.cvtColor(display, cv2.COLOR_BGR2GRAY, dst=gray_buf)
 
         # ── Focus Peaking overlay (before all HUD text) ──
         if state.focus_peaking and NP_OK:
-            display = _apply_focus_peaking(display, gray=gray)
+            display = _apply_focus_peaking(display, gray=gray, refresh=refresh_peak)
+            if refresh_peak:
+                peak_timer = now
 
         # ── Tally Border (Recording Indicator) ──
         if state.recording:
             cv2.rectangle(display, (0, 0), (PW - 1, PH - 1), COLOR_RED, 10)
 
         # ── Blink REC dot every 0.5s ──
-        if time.time() - blink_timer > 0.5:
+        if now - blink_timer > 0.5:
             blink_state = not blink_state
-            blink_timer = time.time()
-
-        # ── Overlays ──
-        # Top-left: device & resolution
-        res_str = f"{actual_w}×{actual_h}  {state.fps}fps"
-        _shadow_text(display, res_str, (14, 30), FONT, 0.55, COLOR_WHITE)
+            blink_timer = now
 
         # ── Update Storage Info (every 2s) ──
-        if time.time() - storage_timer > 2.0:
+        if now - storage_timer > 2.0:
             storage_info = state.remaining_storage_info
-            storage_timer = time.time()
+            storage_timer = now
 
-        # Top-right: format label + remaining time
-        profile_label = state.format_label
+        # ── Overlays ──
+        # Static labels are laid out again only when what they show changes
         mins_left = storage_info[1]
-        label_col = COLOR_AMBER
-
-        if mins_left > 0:
-            h, m = divmod(mins_left, 60)
-            time_str = f"{h}h {m:02d}m"
-            profile_label = f"{profile_label}  {time_str}"
-            if mins_left < 10:
-                label_col = COLOR_RED  # Warn low space
-
-        (tw, th), _ = cv2.getTextSize(profile_label, FONT, 0.55, 1)
-        # Right-align with 20px margin
-        tx = PW - tw - 20
-        _shadow_text(display, profile_label, (tx, 30), FONT, 0.55, label_col)
+        hud_sig = (state.resolution, state.fps, state.output_format_idx, mins_left,
+                   state.exposure, state.gain, state.wb_temp, state.auto_focus,
+                   state.focus, state.clip_number)
+        if hud_sig != last_hud_sig:
+            hud_labels  = _hud_labels(state, PW, PH, mins_left, FONT)
+            last_hud_sig = hud_sig
+        for text, pos, scale, color in hud_labels:
+            _shadow_text(display, text, pos, FONT, scale, color)
 
         # Centre-top: REC indicator
         if state.recording:
             tc = state.rec_timecode
             if blink_state:
                 cv2.circle(display, (PW // 2 - 70, 22), 9, COLOR_RED, -1)
-            _shadow_text(display, f"REC  {tc}", (PW // 2 - 55, 30), FONT, 0.6, COLOR_RED, thickness=2)
+            _shadow_text(display, f"REC  {tc}", (PW // 2 - 55, 30), FONT, 0.6, COLOR_RED,
+                         thickness=2, cached=False)
         else:
             _shadow_text(display, "STANDBY", (PW // 2 - 40, 30), FONT, 0.6, COLOR_GREEN)
 
-        # Bottom bar: camera settings
-        exp_label   = f"EXP {state.exposure}  ({state.shutter_angle:.0f}°)"
-        gain_label  = f"ISO ~{state.gain * 10}"
-        wb_label    = f"WB {state.wb_temp}K"
-        clip_label  = f"Clip {state.clip_number:04d}"
-
-        if state.auto_focus:
-            focus_label = "AF  AUTO"
-            focus_color = COLOR_GREEN
-        else:
-            focus_label = f"MF  {state.focus_pct}%"
-            focus_color = COLOR_AMBER
-
-        bar_y = PH - 14
-        _shadow_text(display, exp_label,   (14,         bar_y), FONT, 0.5, COLOR_WHITE)
-        _shadow_text(display, gain_label,  (PW // 4,    bar_y), FONT, 0.5, COLOR_WHITE)
-        _shadow_text(display, wb_label,    (PW // 2,    bar_y), FONT, 0.5, COLOR_WHITE)
-        _shadow_text(display, focus_label, (PW - 200,   bar_y), FONT, 0.5, focus_color)
-        _shadow_text(display, clip_label,  (PW - 110,   bar_y), FONT, 0.5, COLOR_WHITE)
-
         # Focus pull bar (shown when in manual focus)
         if not state.auto_focus:
             _draw_focus_bar(display, PW, PH, state.focus_pct, state.focus_peaking)
@@ -1016,10 +1703,12 @@ def run_gui(state: CameraState, hat=None):
 
         # Live Histogram
         if state.show_histogram:
-            _draw_histogram(display, PW, PH, gray=gray)
+            _draw_histogram(display, PW, PH, gray=gray, refresh=refresh_hist)
+            if refresh_hist:
+                hist_timer = now
 
         # Format Menu
-        if time.time() - format_menu_timer < 3.0:
+        if now - format_menu_timer < 3.0:
             _draw_format_menu(display, PW, PH, state)
 
         # Audio meters (left side, vertical)
@@ -1031,152 +1720,119 @@ def run_gui(state: CameraState, hat=None):
             _draw_help(display, PW, PH, FONT)
 
         # Toast Message
-        if time.time() - toast_timer < toast_duration:
+        if now - toast_timer < toast_duration:
             _draw_toast(display, PW, PH, toast_msg, toast_color)
 
         cv2.imshow("ObsBot CineRig", display)
 
-        key = cv2.waitKey(1) & 0xFF
+        key = poll_key() & 0xFF
+        state.autosave()
+        if key == 255:                       # no key this frame
+            continue
 
         if key == ord('q') or key == 27:     # Q / ESC → quit
             break
         elif key == ord('r') or key == ord('R'):
             if state.recording:
                 n = state.clip_number
-                stop_recording(state, cap=cap,
-                               cap_w=actual_w, cap_h=actual_h, cap_fps=state.fps)
+                with capture.lock:
+                    stop_recording(state, cap=cap,
+                                   cap_w=actual_w, cap_h=actual_h, cap_fps=state.fps)
                 show_toast(f"CLIP {n:04d} SAVED", COLOR_GREEN)
             else:
-                if start_recording(state, cap=cap):
+                with capture.lock:
+                    started = start_recording(state, cap=cap)
+                if started:
                     show_toast("REC STARTED", COLOR_RED)
                 else:
                     show_toast("REC ERROR", COLOR_RED, 3.0)
         elif key == ord('h') or key == ord('H'):
             show_help = not show_help
 
-        # Exposure
-        elif key == ord('e'):                # exposure up
-            state.exposure = min(state.exposure + 50, 10000)
-            if not state.auto_exp:
-                v4l2_set(state.device, V4L2_EXPOSURE, state.exposure)
-            show_toast(f"EXP {state.exposure}")
-        elif key == ord('d'):                # exposure down
-            state.exposure = max(state.exposure - 50, 50)
-            if not state.auto_exp:
-                v4l2_set(state.device, V4L2_EXPOSURE, state.exposure)
-            show_toast(f"EXP {state.exposure}")
-
-        # Gain / ISO
-        elif key == ord('g'):
-            state.gain = min(state.gain + 10, 500)
-            v4l2_set(state.device, V4L2_GAIN, state.gain)
-            show_toast(f"ISO ~{state.gain * 10}")
-        elif key == ord('f'):
-            state.gain = max(state.gain - 10, 0)
-            v4l2_set(state.device, V4L2_GAIN, state.gain)
-            show_toast(f"ISO ~{state.gain * 10}")
-
-        # White balance
-        elif key == ord('w'):
-            state.wb_temp = min(state.wb_temp + 100, 10000)
-            if not state.auto_wb:
-                v4l2_set(state.device, V4L2_WB_TEMP, state.wb_temp)
-            show_toast(f"WB {state.wb_temp}K")
-        elif key == ord('s'):
-            state.wb_temp = max(state.wb_temp - 100, 2000)
-            if not state.auto_wb:
-                v4l2_set(state.device, V4L2_WB_TEMP, state.wb_temp)
-            show_toast(f"WB {state.wb_temp}K")
-
-        # Auto toggles
-        elif key == ord('a'):
-            state.auto_exp = not state.auto_exp
-            val = 3 if state.auto_exp else 1
-            v4l2_set(state.device, V4L2_EXPOSURE_AUTO, val)
-            show_toast("AUTO EXPOSURE" if state.auto_exp else "MANUAL EXP",
-                       COLOR_GREEN if state.auto_exp else COLOR_AMBER)
-        elif key == ord('b'):
-            state.auto_wb = not state.auto_wb
-            v4l2_set(state.device, V4L2_WB_AUTO, 1 if state.auto_wb else 0)
-            show_toast("AUTO WB" if state.auto_wb else "MANUAL WB",
-                       COLOR_GREEN if state.auto_wb else COLOR_AMBER)
-
-        # Focus
-        elif key == ord('t'):                # T = toggle autofocus
-            state.auto_focus = not state.auto_focus
-            v4l2_set(state.device, V4L2_FOCUS_AUTO, 1 if state.auto_focus else 0)
-            show_toast("AUTOFOCUS" if state.auto_focus else "MANUAL FOCUS",
-                       COLOR_GREEN if state.auto_focus else COLOR_AMBER)
-            if not state.auto_focus:         # seed manual position from camera
-                current = v4l2_get(state.device, V4L2_FOCUS_ABS)
-                if current is not None:
-                    state.focus = current
-        elif key == ord(']'):                # ] = focus farther (coarse)
-            if not state.auto_focus:
-                state.focus = min(state.focus + FOCUS_STEP_COARSE, state.focus_max)
-                v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                show_toast(f"FOCUS {state.focus_pct}%")
-        elif key == ord('['):                # [ = focus closer (coarse)
-            if not state.auto_focus:
-                state.focus = max(state.focus - FOCUS_STEP_COARSE, FOCUS_MIN)
-                v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                show_toast(f"FOCUS {state.focus_pct}%")
-        elif key == ord('.'):                # . = fine far
-            if not state.auto_focus:
-                state.focus = min(state.focus + FOCUS_STEP_FINE, state.focus_max)
-                v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                show_toast(f"FOCUS {state.focus_pct}%")
-        elif key == ord(','):                # , = fine near
-            if not state.auto_focus:
-                state.focus = max(state.focus - FOCUS_STEP_FINE, FOCUS_MIN)
-                v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                show_toast(f"FOCUS {state.focus_pct}%")
-        elif key == ord('k'):                # K = toggle focus peaking
-            state.focus_peaking = not state.focus_peaking
-            show_toast("PEAKING ON" if state.focus_peaking else "PEAKING OFF",
-                       COLOR_GREEN if state.focus_peaking else COLOR_RED)
-        elif key == ord('l'):                # L = toggle guides
-            state.show_guides = not state.show_guides
-            show_toast("GUIDES ON" if state.show_guides else "GUIDES OFF",
-                       COLOR_GREEN if state.show_guides else COLOR_RED)
-        elif key == ord('j'):                # J = toggle histogram
-            state.show_histogram = not state.show_histogram
-            show_toast("HISTOGRAM ON" if state.show_histogram else "HISTOGRAM OFF",
-                       COLOR_GREEN if state.show_histogram else COLOR_RED)
-
-        # Audio
-        elif key == ord('m'):                # M = mute/unmute mic
-            state.audio_muted = not state.audio_muted
-            show_toast("MIC MUTED" if state.audio_muted else "MIC LIVE",
-                       COLOR_RED if state.audio_muted else COLOR_GREEN)
-        elif key == ord('+') or key == ord('='):   # + = mic gain up
-            state.mic_gain_db = min(state.mic_gain_db + 3, 20)
-            show_toast(f"MIC {state.mic_gain_db}dB")
-        elif key == ord('-'):                # - = mic gain down
-            state.mic_gain_db = max(state.mic_gain_db - 3, -20)
-            show_toast(f"MIC {state.mic_gain_db}dB")
-
         # Output format cycle
         elif key == ord('p'):
             state.output_format_idx = (state.output_format_idx + 1) % N_FORMATS
-            format_menu_timer = time.time()
+            format_menu_timer = now
             fmt = state.output_format
             print(f"[FORMAT] → {fmt['label']}  ({fmt['note']})")
 
+        # Camera, focus, audio and overlay keys
+        elif key in GUI_KEY_ACTIONS:
+            toast = GUI_KEY_ACTIONS[key](state)
+            if toast:
+                show_toast(*toast)
+
+    capture.stop()
     if state.recording:
-        stop_recording(state, cap=cap, cap_w=actual_w, cap_h=actual_h, cap_fps=state.fps)
+        stop_recording(state)
     meter.stop()
     state.save_config()
     cap.release()
     cv2.destroyAllWindows()
 
 
+def _hud_labels(state, PW, PH, mins_left, FONT):
+    """Static HUD text → [(text, pos, scale, colour)] for _shadow_text."""
+    # Top-left: recording resolution (the preview may be smaller)
+    labels = [(f"{state.resolution.replace('x', '×')}  {state.fps}fps", (14, 30), 0.55, COLOR_WHITE)]
+
+    # Top-right: format label + remaining time
+    profile_label = state.format_label
+    label_col = COLOR_AMBER
+
+    if mins_left > 0:
+        h, m = divmod(mins_left, 60)
+        time_str = f"{h}h {m:02d}m"
+        profile_label = f"{profile_label}  {time_str}"
+        if mins_left < 10:
+            label_col = COLOR_RED  # Warn low space
+
+    (tw, _), _ = _text_size(profile_label, FONT, 0.55, 1)
+    # Right-align with 20px margin
+    labels.append((profile_label, (PW - tw - 20, 30), 0.55, label_col))
+
+    # Bottom bar: camera settings
+    if state.auto_focus:
+        focus_label = "AF  AUTO"
+        focus_color = COLOR_GREEN
+    else:
+        focus_label = f"MF  {state.focus_pct}%"
+        focus_color = COLOR_AMBER
+
+    bar_y = PH - 14
+    labels += [
+        (f"EXP {state.exposure}  ({state.shutter_angle:.0f}°)", (14,       bar_y), 0.5, COLOR_WHITE),
+        (f"ISO ~{state.gain * 10}",                           (PW // 4,  bar_y), 0.5, COLOR_WHITE),
+        (f"WB {state.wb_temp}K",                              (PW // 2,  bar_y), 0.5, COLOR_WHITE),
+        (focus_label,                                         (PW - 200, bar_y), 0.5, focus_color),
+        (f"Clip {state.clip_number:04d}",                     (PW - 110, bar_y), 0.5, COLOR_WHITE),
+    ]
+    return labels
+
+
+@functools.lru_cache(maxsize=256)
+def _text_size(text, font, scale, thickness):
+    """cv2.getTextSize, memoised — HUD labels repeat frame after frame."""
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
+def _roi_overlay(img, w, h, x1, y1, x2, y2):
+    """
+    View of ``img`` over the inclusive box (clipped to w×h) plus a copy to
+    draw on → (roi, overlay, x0, y0). Blending the pair back with
+    addWeighted(..., dst=roi) touches only the box, not the whole frame.
+    """
+    x0, y0 = max(0, x1), max(0, y1)
+    roi = img[y0:min(h, y2 + 1), x0:min(w, x2 + 1)]
+    return roi, roi.copy(), x0, y0
+
+
 def _draw_toast(img, w, h, text, color):
     """Draw a temporary message in the center of the screen."""
     font = cv2.FONT_HERSHEY_SIMPLEX
     scale = 1.0
     thickness = 2
-    (tw, th), _ = cv2.getTextSize(text, font, scale, thickness)
+    (tw, th), _ = _text_size(text, font, scale, thickness)
 
     # Center position (slightly above center to avoid covering subject)
     cx, cy = w // 2, h // 2 - 50
@@ -1187,60 +1843,140 @@ def _draw_toast(img, w, h, text, color):
     x2, y2 = cx + tw // 2 + pad_x, cy + th // 2 + pad_y
 
     # Draw semi-transparent background
-    overlay = img.copy()
-    cv2.rectangle(overlay, (x1, y1), (x2, y2), (20, 20, 20), -1)
-    cv2.addWeighted(overlay, 0.7, img, 0.3, 0, img)
+    roi, overlay, ox, oy = _roi_overlay(img, w, h, x1, y1, x2, y2)
+    cv2.rectangle(overlay, (x1 - ox, y1 - oy), (x2 - ox, y2 - oy), (20, 20, 20), -1)
+    cv2.addWeighted(overlay, 0.7, roi, 0.3, 0, roi)
 
     # Draw text
     cv2.putText(img, text, (cx - tw // 2, cy + th // 2), font, scale, color, thickness, cv2.LINE_AA)
 
 
-def _shadow_text(img, text, pos, font, scale, color, thickness=1):
-    """Draw text with a drop-shadow for readability over any background."""
+@functools.lru_cache(maxsize=256)
+def _text_sprite(text, font, scale, color, thickness):
+    """
+    Rasterise a drop-shadowed HUD string once as a blend tile: the frame is
+    drawn as frame * keep + paint, which reproduces _shadow_text's two
+    anti-aliased putText calls without re-rasterising the glyphs.
+    Returns (dx, dy, keep, paint); dx/dy locate the text origin in the tile.
+    """
+    (tw, th), base = _text_size(text, font, scale, thickness + 1)
+    pad = thickness + 3
+    w, h = tw + 2 * pad, th + base + 2 * pad
+    org = (pad, pad + th)
+
+    def coverage(pos, thick):
+        mask = np.zeros((h, w), np.uint8)
+        cv2.putText(mask, text, pos, font, scale, 255, thick, cv2.LINE_AA)
+        return cv2.merge([mask] * 3).astype(np.float32) * (1.0 / 255.0)
+
+    fill = coverage(org, thickness)
+    keep = (1.0 - coverage((org[0] + 1, org[1] + 1), thickness + 1)) * (1.0 - fill)
+    paint = fill * np.array(color, np.float32)
+    return org[0], org[1], keep, paint
+
+
+def _blit_sprite(img, sprite, pos):
+    """Composite a _text_sprite tile with its text origin at pos (clipped to img)."""
+    dx, dy, keep, paint = sprite
+    x0, y0 = pos[0] - dx, pos[1] - dy
+    h, w = keep.shape[:2]
+    sx0, sy0 = max(0, -x0), max(0, -y0)
+    sx1, sy1 = min(w, img.shape[1] - x0), min(h, img.shape[0] - y0)
+    if sx0 >= sx1 or sy0 >= sy1:
+        return
+    roi = img[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1]
+    blend = cv2.multiply(roi, keep[sy0:sy1, sx0:sx1], dtype=cv2.CV_32F)
+    cv2.add(blend, paint[sy0:sy1, sx0:sx1], dst=roi, dtype=cv2.CV_8U)
+
+
+def _shadow_text(img, text, pos, font, scale, color, thickness=1, cached=True):
+    """
+    Draw text with a drop-shadow for readability over any background.
+    cached=False for strings that change every frame (the timecode).
+    """
+    if cached:
+        _blit_sprite(img, _text_sprite(text, font, scale, tuple(color), thickness), pos)
+        return
     cv2.putText(img, text, (pos[0]+1, pos[1]+1), font, scale, (0,0,0), thickness+1, cv2.LINE_AA)
     cv2.putText(img, text, pos, font, scale, color, thickness, cv2.LINE_AA)
 
 
-def _apply_focus_peaking(frame, gray=None):
+_peak_layers = {}     # frame shape → reused BGR peaking layer
+_peak_planes = {}     # frame shape → reused (Laplacian int16, |Laplacian| uint8)
+
+
+def _apply_focus_peaking(frame, gray=None, refresh=True):
     """
     Highlight in-focus edges with a red overlay (focus peaking).
     Uses Laplacian edge detection — bright red = sharpest areas.
+    Draws into ``frame`` in place and returns it; refresh=False reuses the
+    previous mask.
     """
+    layer = _peak_layers.get(frame.shape)
+    if not refresh and layer is not None:
+        cv2.add(frame, layer, dst=frame)
+        return frame
+
     if gray is None:
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
-    # Use CV_16S (signed 16-bit) to save memory (vs CV_64F) and convertScaleAbs to handle saturation correctly
-    lap     = cv2.Laplacian(gray, cv2.CV_16S)
-    lap_abs = cv2.convertScaleAbs(lap)
-
-    # Use Histogram to find percentile (O(N) vs O(N log N) sorting)
-    hist = cv2.calcHist([lap_abs], [0], None, [256], [0, 256])
-
-    total_pixels = frame.shape[0] * frame.shape[1]
-    target_count = total_pixels * 0.15
-    current_count = 0
-    threshold = 0
-
-    # Iterate backwards from 255 to find the top 15% threshold
-    for i in range(255, -1, -1):
-        current_count += hist[i][0]
-        if current_count >= target_count:
-            threshold = i
-            break
-
-    # Apply threshold
-    _, mask = cv2.threshold(lap_abs, threshold, 255, cv2.THRESH_BINARY)
-
-    # Dilate slightly so peaking pixels are visible
-    kernel = np.ones((2, 2), np.uint8)
-    mask   = cv2.dilate(mask, kernel, iterations=1)
-
-    # Blend red highlight onto frame
-    peak_layer       = np.zeros_like(frame)
-    peak_layer[:, :, 2] = mask   # mask is already 0 or 255 (uint8)
-
-    result = cv2.addWeighted(frame, 1.0, peak_layer, 0.6, 0)
-    return result
+    # Use CV_16S (signed 16-bit) to save memory (vs CV_64F) and convertScaleAbs
+    # to handle saturation correctly — both into buffers reused per shape
+    planes = _peak_planes.get(frame.shape)
+    if planes is None:
+        planes = _peak_planes[frame.shape] = (np.empty(frame.shape[:2], np.int16),
+                                              np.empty(frame.shape[:2], np.uint8))
+    lap     = cv2.Laplacian(gray, cv2.CV_16S, dst=planes[0])
+    lap_abs = cv2.convertScaleAbs(lap, dst=planes[1])
+
+    # Use Histogram to find percentile (O(N) vs O(N log N) sorting); every
+    # other row and column is plenty for the threshold, the mask stays full-res
+    sample = lap_abs[::2, ::2]
+    hist   = cv2.calcHist([sample], [0], None, [256], [0, 256])
+    target_count = sample.size * 0.15
+
+    # Running count from the bright end; the first bin to reach the top 15%
+    # is the threshold (ravel: OpenCV 4 returns (256, 1), OpenCV 5 (256,))
+    cum       = np.cumsum(hist.ravel()[::-1])
+    threshold = max(0, 255 - int(np.searchsorted(cum, target_count)))
+
+    # Mask straight at the blend level (0.6 × 255) — the 2×2 dilate is dropped,
+    # the Laplacian response is already two pixels wide at an edge
+    if layer is None:
+        layer = _peak_layers[frame.shape] = np.zeros(frame.shape, np.uint8)
+    _, layer[:, :, 2] = cv2.threshold(lap_abs, threshold, 153, cv2.THRESH_BINARY)
+
+    # Saturating add in place; B and G of the layer stay zero
+    cv2.add(frame, layer, dst=frame)
+    return frame
+
+
+# Meter scale marks (dBFS) and their tick colours; 0 dBFS is highlighted
+_METER_TICKS = ((-48, (80, 80, 80)), (-24, (80, 80, 80)), (-12, (80, 80, 80)),
+                (-6, (80, 80, 80)), (0, (80, 80, 200)))
+
+HudGeometry = collections.namedtuple("HudGeometry", [
+    "bar_top", "bar_bot", "bar_h",      # shared span of the side bars
+    "focus_x", "focus_ticks",           # focus bar x, 25/50/75 % tick ys
+    "meter_x", "meter_ticks",           # (L, R) bar xs, ((y, colour), …)
+    "thirds_x", "thirds_y", "centre",   # framing guides
+    "hist_x", "hist_y",                 # histogram box top-left
+])
+
+
+@functools.lru_cache(maxsize=4)
+def _hud_geometry(w, h):
+    """Per-frame-invariant HUD layout for a ``w``×``h`` preview."""
+    bar_top, bar_bot = 60, h - 60
+    bar_h = bar_bot - bar_top
+    return HudGeometry(
+        bar_top, bar_bot, bar_h,
+        w - 22, tuple(bar_bot - int(bar_h * pct / 100) for pct in (25, 50, 75)),
+        (14, 14 + 8 + 4),
+        tuple((int(bar_bot - (db + 60) / 60 * bar_h), col) for db, col in _METER_TICKS),
+        (w//3, 2*w//3), (h//3, 2*h//3), (w//2, h//2),
+        w - 256 - 20, h - 100 - 50,
+    )
 
 
 def _draw_focus_bar(img, w, h, focus_pct, peaking_on):
@@ -1248,10 +1984,11 @@ def _draw_focus_bar(img, w, h, focus_pct, peaking_on):
     Draw a vertical focus pull bar on the right edge of the frame.
     Shows current focus position (0%=near, 100%=far) and peaking status.
     """
-    BAR_X   = w - 22
-    BAR_TOP = 60
-    BAR_BOT = h - 60
-    BAR_H   = BAR_BOT - BAR_TOP
+    g       = _hud_geometry(w, h)
+    BAR_X   = g.focus_x
+    BAR_TOP = g.bar_top
+    BAR_BOT = g.bar_bot
+    BAR_H   = g.bar_h
     BAR_W   = 8
 
     # Track background
@@ -1264,8 +2001,7 @@ def _draw_focus_bar(img, w, h, focus_pct, peaking_on):
     cv2.rectangle(img, (BAR_X, fill_top), (BAR_X + BAR_W, BAR_BOT), bar_col, -1)
 
     # Tick marks at 25% intervals
-    for pct in [25, 50, 75]:
-        tick_y = BAR_BOT - int(BAR_H * pct / 100)
+    for tick_y in g.focus_ticks:
         cv2.line(img, (BAR_X - 4, tick_y), (BAR_X + BAR_W + 4, tick_y), (160, 160, 160), 1)
 
     # Labels
@@ -1277,37 +2013,31 @@ def _draw_focus_bar(img, w, h, focus_pct, peaking_on):
         cv2.putText(img, "PKG", (BAR_X - 2, BAR_BOT + 28), FONT, 0.35, (50, 50, 255), 1, cv2.LINE_AA)
 
 
+def _level_db(level):
+    """Linear 0–1 level → dBFS (scalar math; -120 for silence)."""
+    return 20.0 * math.log10(max(level, 1e-6))
+
+
 def _draw_audio_meters(img, w, h, state):
     """
     Draw dual vertical audio level meters on the left edge.
     Green = safe, Amber = hot, Red = clipping.
     Shows peak hold markers and mute/gain labels.
     """
-    FONT    = cv2.FONT_HERSHEY_SIMPLEX
-    BAR_W   = 8
-    GAP     = 4
-    BAR_TOP = 60
-    BAR_BOT = h - 60
-    BAR_H   = BAR_BOT - BAR_TOP
-    X_L     = 14                   # left channel bar x
-    X_R     = X_L + BAR_W + GAP   # right channel bar x
-
-    # dBFS scale: map linear RMS (0–1) → display height
-    def rms_to_y(rms):
-        if rms < 1e-6:
-            return BAR_BOT
-        db = 20 * np.log10(rms)           # 0 dBFS at full scale
-        db = max(-60, min(0, db))
-        frac = (db + 60) / 60             # 0=silent, 1=0dBFS
+    FONT     = cv2.FONT_HERSHEY_SIMPLEX
+    BAR_W    = 8
+    g        = _hud_geometry(w, h)
+    BAR_TOP  = g.bar_top
+    BAR_BOT  = g.bar_bot
+    BAR_H    = g.bar_h
+    X_L, X_R = g.meter_x            # left / right channel bar x
+
+    # dBFS scale: -60..0 dBFS → display height
+    def db_to_y(db):
+        frac = (max(-60.0, min(0.0, db)) + 60) / 60   # 0=silent, 1=0dBFS
         return int(BAR_BOT - frac * BAR_H)
 
-    def bar_color(rms):
-        db = 20 * np.log10(max(rms, 1e-6))
-        if db > -6:   return (0, 50, 230)    # red  — clipping zone
-        if db > -18:  return (0, 180, 230)   # amber — hot
-        return (50, 200, 80)                  # green — safe
-
-    for ch, x in enumerate([X_L, X_R]):
+    for ch, x in enumerate(g.meter_x):
         rms  = state.audio_levels[ch] if ch < len(state.audio_levels) else 0.0
         peak = state.audio_peaks[ch]  if ch < len(state.audio_peaks)  else 0.0
 
@@ -1315,18 +2045,18 @@ def _draw_audio_meters(img, w, h, state):
         cv2.rectangle(img, (x, BAR_TOP), (x + BAR_W, BAR_BOT), (30, 30, 30), -1)
 
         if not state.audio_muted:
-            # RMS fill
-            fill_y = rms_to_y(rms)
-            col    = bar_color(rms)
+            # RMS fill — red clipping, amber hot, green safe
+            db     = _level_db(rms)
+            fill_y = db_to_y(db)
+            col    = (0, 50, 230) if db > -6 else (0, 180, 230) if db > -18 else (50, 200, 80)
             if fill_y < BAR_BOT:
                 cv2.rectangle(img, (x, fill_y), (x + BAR_W, BAR_BOT), col, -1)
 
             # Peak hold tick
-            peak_y = rms_to_y(peak)
+            peak_y = db_to_y(_level_db(peak))
             cv2.line(img, (x, peak_y), (x + BAR_W, peak_y), (255, 255, 255), 2)
 
             # CLIP warning text
-            db = 20 * np.log10(max(rms, 1e-6))
             if db > -6:
                 # Draw "CLIP" above the bar
                 cv2.putText(img, "CLIP", (X_L - 4, BAR_TOP - 20), FONT, 0.4, (0, 0, 255), 1, cv2.LINE_AA)
@@ -1339,11 +2069,8 @@ def _draw_audio_meters(img, w, h, state):
     cv2.putText(img, "L", (X_L + 1, BAR_TOP - 6), FONT, 0.35, (180,180,180), 1, cv2.LINE_AA)
     cv2.putText(img, "R", (X_R + 1, BAR_TOP - 6), FONT, 0.35, (180,180,180), 1, cv2.LINE_AA)
 
-    # dB scale ticks: -48, -24, -12, -6, 0
-    for db_mark in [-48, -24, -12, -6, 0]:
-        frac  = (db_mark + 60) / 60
-        tick_y = int(BAR_BOT - frac * BAR_H)
-        col   = (80, 80, 200) if db_mark == 0 else (80, 80, 80)
+    # dB scale ticks
+    for tick_y, col in g.meter_ticks:
         cv2.line(img, (X_L - 3, tick_y), (X_R + BAR_W + 3, tick_y), col, 1)
 
     # Gain / mute label at bottom
@@ -1357,52 +2084,74 @@ def _draw_audio_meters(img, w, h, state):
     cv2.putText(img, label, (X_L - 2, BAR_BOT + 14), FONT, 0.35, lcol, 1, cv2.LINE_AA)
 
 
+@functools.lru_cache(maxsize=4)
+def _guide_pixels(w, h):
+    """Rasterise the guide lines once per size → (rows, cols, line colour per pixel)."""
+    g    = _hud_geometry(w, h)
+    mask = np.zeros((h, w), np.uint8)
+    # Rule of thirds
+    for x in g.thirds_x:
+        cv2.line(mask, (x, 0), (x, h), 255, 1)
+    for y in g.thirds_y:
+        cv2.line(mask, (0, y), (w, y), 255, 1)
+    # Centre cross
+    cx, cy = g.centre
+    cv2.line(mask, (cx-20, cy), (cx+20, cy), 255, 1)
+    cv2.line(mask, (cx, cy-20), (cx, cy+20), 255, 1)
+    ys, xs = np.nonzero(mask)
+    return ys, xs, np.full((len(ys), 3), (180, 180, 180), np.uint8)
+
+
 def _draw_guides(img, w, h):
     """Draw rule-of-thirds lines and a centre crosshair."""
-    col = (180, 180, 180)
+    # Blend only the few thousand line pixels rather than a full-frame copy
     alpha = 0.2
-    overlay = img.copy()
-    # Rule of thirds
-    for x in [w//3, 2*w//3]:
-        cv2.line(overlay, (x, 0), (x, h), col, 1)
-    for y in [h//3, 2*h//3]:
-        cv2.line(overlay, (0, y), (w, y), col, 1)
-    # Centre cross
-    cx, cy = w//2, h//2
-    cv2.line(overlay, (cx-20, cy), (cx+20, cy), col, 1)
-    cv2.line(overlay, (cx, cy-20), (cx, cy+20), col, 1)
-    cv2.addWeighted(overlay, alpha, img, 1-alpha, 0, img)
+    ys, xs, col = _guide_pixels(w, h)
+    img[ys, xs] = cv2.addWeighted(col, alpha, img[ys, xs], 1-alpha, 0)
 
 
-def _draw_histogram(img, w, h, gray=None):
-    """Draw a small luminance histogram in the bottom-right corner."""
-    # Compute histogram for the whole image (luminance approximation)
-    if gray is None:
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    hist = cv2.calcHist([gray], [0], None, [256], [0, 256])
+_hist_curves = {}     # (x, baseline y) in the ROI → reused (256, 2) int32 polyline
 
-    # Normalize to fit in the box height
-    hist_h = 100
-    cv2.normalize(hist, hist, 0, hist_h, cv2.NORM_MINMAX)
 
+def _draw_histogram(img, w, h, gray=None, refresh=True):
+    """
+    Draw a small luminance histogram in the bottom-right corner.
+    refresh=False redraws the previous curve without re-measuring.
+    """
     # Draw parameters
     hist_w = 256
-    margin = 20
+    hist_h = 100
 
     # Position: Bottom Right, above the bottom bar
-    x_offset = w - hist_w - margin
-    y_offset = h - hist_h - 50
+    g = _hud_geometry(w, h)
+    x_offset, y_offset = g.hist_x, g.hist_y
 
     # Create a semi-transparent overlay
-    overlay = img.copy()
+    roi, overlay, ox, oy = _roi_overlay(img, w, h, x_offset, y_offset,
+                                        x_offset + hist_w, y_offset + hist_h)
+    x_offset -= ox
+    y_offset -= oy
     cv2.rectangle(overlay, (x_offset, y_offset), (x_offset + hist_w, y_offset + hist_h), (0, 0, 0), -1)
 
-    # Convert histogram points to a polyline for faster drawing
-    # Create an array of points (x, y)
-    pts = np.column_stack((
-        np.arange(x_offset, x_offset + 256),
-        y_offset + hist_h - hist.flatten().astype(int)
-    )).astype(np.int32)
+    # Polyline points (x, y), relative to the ROI, kept in a reused buffer;
+    # with no curve measured for this spot yet, refresh=False measures anyway
+    pts = _hist_curves.get((x_offset, y_offset + hist_h))
+    if pts is None:
+        refresh = True
+        pts = _hist_curves[(x_offset, y_offset + hist_h)] = np.empty((256, 2), np.int32)
+        pts[:, 0] = np.arange(x_offset, x_offset + 256)
+    if refresh:
+        # Compute histogram for the whole image (luminance approximation)
+        if gray is None:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # A quarter of the pixels gives the same normalised shape
+        hist = cv2.calcHist([gray[::2, ::2]], [0], None, [256], [0, 256])
+
+        # Normalize to fit in the box height; the float→int32 store
+        # truncates, then flip up from the baseline
+        cv2.normalize(hist, hist, 0, hist_h, cv2.NORM_MINMAX)
+        pts[:, 1] = hist.ravel()
+        np.subtract(y_offset + hist_h, pts[:, 1], out=pts[:, 1])
 
     # Draw the histogram curve as a polyline
     cv2.polylines(overlay, [pts], isClosed=False, color=(200, 200, 200), thickness=1)
@@ -1411,7 +2160,7 @@ def _draw_histogram(img, w, h, gray=None):
     # pts_fill = np.vstack([[x_offset, y_offset + hist_h], pts, [x_offset + 255, y_offset + hist_h]])
     # cv2.fillPoly(overlay, [pts_fill], color=(100, 100, 100))
 
-    cv2.addWeighted(overlay, 0.6, img, 0.4, 0, img)
+    cv2.addWeighted(overlay, 0.6, roi, 0.4, 0, roi)
 
 
 def _draw_format_menu(img, w, h, state):
@@ -1426,7 +2175,7 @@ def _draw_format_menu(img, w, h, state):
         label_text = fmt['label']
         detail_text = f"({fmt['ext']})  {fmt['note']}"
         full_text = f"{label_text}   {detail_text}"
-        (tw, th), _ = cv2.getTextSize(full_text, FONT, scale, thickness)
+        (tw, th), _ = _text_size(full_text, FONT, scale, thickness)
         max_w = max(max_w, tw)
 
     menu_w = max_w + 80
@@ -1434,27 +2183,31 @@ def _draw_format_menu(img, w, h, state):
     x = (w - menu_w) // 2
     y = (h - menu_h) // 2
 
-    # Draw background box
-    overlay = img.copy()
-    cv2.rectangle(overlay, (x, y), (x + menu_w, y + menu_h), (20, 20, 20), -1)
+    # Draw background box (ROI-relative coordinates)
+    roi, overlay, ox, oy = _roi_overlay(img, w, h, x, y, x + menu_w, y + menu_h)
+    rx, ry = x - ox, y - oy
+    cv2.rectangle(overlay, (rx, ry), (rx + menu_w, ry + menu_h), (20, 20, 20), -1)
 
     # Draw highlight bar for selected item
     row_h = 35
     sel_idx = state.output_format_idx
     # Calculate top-left of the selected row
-    bar_y1 = y + row_h * sel_idx + 8
-    bar_y2 = y + row_h * (sel_idx + 1) + 5
-    cv2.rectangle(overlay, (x + 2, bar_y1), (x + menu_w - 2, bar_y2), (60, 100, 60), -1)
+    bar_y1 = ry + row_h * sel_idx + 8
+    bar_y2 = ry + row_h * (sel_idx + 1) + 5
+    cv2.rectangle(overlay, (rx + 2, bar_y1), (rx + menu_w - 2, bar_y2), (60, 100, 60), -1)
 
-    cv2.rectangle(overlay, (x, y), (x + menu_w, y + menu_h), (100, 100, 100), 1)
-    cv2.addWeighted(overlay, 0.9, img, 0.1, 0, img)
+    cv2.rectangle(overlay, (rx, ry), (rx + menu_w, ry + menu_h), (100, 100, 100), 1)
+    cv2.addWeighted(overlay, 0.9, roi, 0.1, 0, roi)
 
     for i, fmt in enumerate(OUTPUT_FORMATS):
         is_selected = (i == state.output_format_idx)
 
-        # Colors: Brighter/Bold for selected, Gray/Normal for others
+        # Colors: Brighter/Bold for selected, Gray/Normal for others,
+        # dim for formats this FFmpeg build cannot encode
         color_label = (255, 255, 255) if is_selected else (200, 200, 200)
         color_detail = (200, 255, 200) if is_selected else (150, 150, 150)
+        if not format_available(fmt):
+            color_label = color_detail = (90, 90, 90)
         curr_thickness = 2 if is_selected else 1
 
         py = y + 35 * (i + 1)
@@ -1463,7 +2216,7 @@ def _draw_format_menu(img, w, h, state):
         cv2.putText(img, fmt["label"], (x + 20, py), FONT, scale, color_label, curr_thickness, cv2.LINE_AA)
 
         # Draw Details (ext + note) to the right of the label
-        (label_w, _), _ = cv2.getTextSize(fmt["label"], FONT, scale, curr_thickness)
+        (label_w, _), _ = _text_size(fmt["label"], FONT, scale, curr_thickness)
         detail_text = f"({fmt['ext']})  {fmt['note']}"
         cv2.putText(img, detail_text, (x + 20 + label_w + 20, py), FONT, 0.5, color_detail, 1, cv2.LINE_AA)
 
@@ -1513,18 +2266,19 @@ def _draw_help(img, w, h, font):
     line_h = int(28 * scale)
 
     # 1. Draw semi-transparent background
-    overlay = img.copy()
-    cv2.rectangle(overlay, (bx, by), (bx + BOX_W, by + BOX_H), (20, 20, 28), -1)
+    roi, overlay, ox, oy = _roi_overlay(img, w, h, bx, by, bx + BOX_W, by + BOX_H)
+    rx, ry = bx - ox, by - oy
+    cv2.rectangle(overlay, (rx, ry), (rx + BOX_W, ry + BOX_H), (20, 20, 28), -1)
     # Header strip
-    cv2.rectangle(overlay, (bx, by), (bx + BOX_W, by + int(40 * scale)), (40, 40, 50), -1)
-    cv2.addWeighted(overlay, 0.92, img, 0.08, 0, img)
+    cv2.rectangle(overlay, (rx, ry), (rx + BOX_W, ry + int(40 * scale)), (40, 40, 50), -1)
+    cv2.addWeighted(overlay, 0.92, roi, 0.08, 0, roi)
 
     # 2. Draw border
     cv2.rectangle(img, (bx, by), (bx + BOX_W, by + BOX_H), (100, 100, 100), 1)
 
     # 3. Draw Title
     title = "KEYBOARD SHORTCUTS"
-    (tw, th), _ = cv2.getTextSize(title, font, font_head, 2)
+    (tw, th), _ = _text_size(title, font, font_head, 2)
     cv2.putText(img, title, (bx + (BOX_W - tw)//2, by + int(28 * scale)),
                 font, font_head, (220, 220, 220), 2, cv2.LINE_AA)
 
@@ -1541,7 +2295,7 @@ def _draw_help(img, w, h, font):
                 y += int(24 * scale)
             else:
                 # Key (Right aligned in col_w space)
-                (kw, kh), _ = cv2.getTextSize(key, font, font_s, 1)
+                (kw, kh), _ = _text_size(key, font, font_s, 1)
                 cv2.putText(img, key, (x_start + col_w - kw, y), font, font_s, (220, 220, 220), 1, cv2.LINE_AA)
                 # Description
                 cv2.putText(img, desc, (x_start + col_x_off, y), font, font_s, (180, 180, 180), 1, cv2.LINE_AA)
@@ -1558,7 +2312,7 @@ def _draw_help(img, w, h, font):
 
     # Footer hint
     footer = "Press H to close"
-    (fw, fh), _ = cv2.getTextSize(footer, font, font_s - 0.1, 1)
+    (fw, fh), _ = _text_size(footer, font, font_s - 0.1, 1)
     cv2.putText(img, footer, (bx + (BOX_W - fw)//2, by + BOX_H - int(12 * scale)),
                 font, font_s - 0.1, (120, 120, 120), 1, cv2.LINE_AA)
 
@@ -1572,6 +2326,12 @@ def run_headless(state: CameraState):
         sys.exit(1)
 
     import termios, tty, select
+    from rich.console import Console
+    from rich.live import Live
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich import box
 
     console = Console()
     detect_focus_range(state)
@@ -1686,66 +2446,12 @@ def run_headless(state: CameraState):
                             stop_recording(state)
                         else:
                             start_recording(state)
-                    elif k == 'e':
-                        state.exposure = min(state.exposure + 50, 10000)
-                        if not state.auto_exp:
-                            v4l2_set(state.device, V4L2_EXPOSURE, state.exposure)
-                    elif k == 'd':
-                        state.exposure = max(state.exposure - 50, 50)
-                        if not state.auto_exp:
-                            v4l2_set(state.device, V4L2_EXPOSURE, state.exposure)
-                    elif k == 'g':
-                        state.gain = min(state.gain + 10, 500)
-                        v4l2_set(state.device, V4L2_GAIN, state.gain)
-                    elif k == 'f':
-                        state.gain = max(state.gain - 10, 0)
-                        v4l2_set(state.device, V4L2_GAIN, state.gain)
-                    elif k == 'w':
-                        state.wb_temp = min(state.wb_temp + 100, 10000)
-                        if not state.auto_wb:
-                            v4l2_set(state.device, V4L2_WB_TEMP, state.wb_temp)
-                    elif k == 's':
-                        state.wb_temp = max(state.wb_temp - 100, 2000)
-                        if not state.auto_wb:
-                            v4l2_set(state.device, V4L2_WB_TEMP, state.wb_temp)
-                    elif k == 'a':
-                        state.auto_exp = not state.auto_exp
-                        v4l2_set(state.device, V4L2_EXPOSURE_AUTO, 3 if state.auto_exp else 1)
-                    elif k == 'b':
-                        state.auto_wb = not state.auto_wb
-                        v4l2_set(state.device, V4L2_WB_AUTO, 1 if state.auto_wb else 0)
-                    elif k == 't':
-                        state.auto_focus = not state.auto_focus
-                        v4l2_set(state.device, V4L2_FOCUS_AUTO, 1 if state.auto_focus else 0)
-                        if not state.auto_focus:
-                            current = v4l2_get(state.device, V4L2_FOCUS_ABS)
-                            if current is not None:
-                                state.focus = current
-                    elif k == ']':
-                        if not state.auto_focus:
-                            state.focus = min(state.focus + FOCUS_STEP_COARSE, state.focus_max)
-                            v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                    elif k == '[':
-                        if not state.auto_focus:
-                            state.focus = max(state.focus - FOCUS_STEP_COARSE, FOCUS_MIN)
-                            v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                    elif k == '.':
-                        if not state.auto_focus:
-                            state.focus = min(state.focus + FOCUS_STEP_FINE, state.focus_max)
-                            v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
-                    elif k == ',':
-                        if not state.auto_focus:
-                            state.focus = max(state.focus - FOCUS_STEP_FINE, FOCUS_MIN)
-                            v4l2_set(state.device, V4L2_FOCUS_ABS, state.focus)
                     elif k == 'p':
                         state.output_format_idx = (state.output_format_idx + 1) % N_FORMATS
-                    elif k == 'm':
-                        state.audio_muted = not state.audio_muted
-                    elif k in ('+', '='):
-                        state.mic_gain_db = min(state.mic_gain_db + 3, 20)
-                    elif k == '-':
-                        state.mic_gain_db = max(state.mic_gain_db - 3, -20)
+                    elif k in KEY_ACTIONS:
+                        KEY_ACTIONS[k](state)
 
+                state.autosave()
                 live.update(make_dashboard())
 
     finally:
@@ -1753,44 +2459,73 @@ def run_headless(state: CameraState):
         meter.stop()
         if state.recording:
             stop_recording(state)
+        close_ffmpeg_log(state)
         state.save_config()
 
 
 # ─────────────────────────────────────────────
 #  Diagnostics
 # ─────────────────────────────────────────────
-def run_diagnostics(state: CameraState):
+def run_diagnostics(state: CameraState, verbose=False):
     print("\n── OBSBOT CineRig Diagnostics ──\n")
 
+    # The probes are independent subprocess / ALSA waits: start them all
+    # at once and print each result in report order as it is needed.
+    # Tool presence is the PATH lookup done at import; only --verbose
+    # spawns the tools to read their version banners.
+    device_ok = os.path.exists(state.device)
+    sd = _sounddevice() if SD_OK else None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as pool:
+        probes = {
+            "ffmpeg":   pool.submit(tool_version, FFMPEG_PATH, "-version")
+                        if verbose and FFMPEG_PATH else None,
+            "v4l2-ctl": pool.submit(tool_version, V4L2_CTL_PATH, "--version")
+                        if verbose and V4L2_CTL_PATH else None,
+            "controls": pool.submit(_diag_controls, state.device) if device_ok else None,
+            "arecord":  pool.submit(list_audio_devices),
+            "sd":       pool.submit(sd.query_devices) if sd is not None else None,
+        }
+        _print_diagnostics(state, device_ok, probes)
+
+
+def _diag_controls(device):
+    """Control table for diag — the ioctl dict, else v4l2-ctl's text listing."""
+    ctrls = v4l2_query_controls(device)
+    return ctrls if ctrls is not None else v4l2_list_controls(device)
+
+
+def _print_diagnostics(state: CameraState, device_ok, probes):
+    """The diag report, reading each probe's future as its section comes up."""
     # Check device exists
-    if os.path.exists(state.device):
+    if device_ok:
         print(f"✓ Camera device found: {state.device}")
     else:
         print(f"✗ Camera device NOT found: {state.device}")
         print("  Try: ls /dev/video* to find the correct device")
 
-    # Check ffmpeg
-    r = subprocess.run(["ffmpeg", "-version"], capture_output=True)
-    if r.returncode == 0:
-        ver = r.stdout.decode().split('\n')[0]
-        print(f"✓ FFmpeg: {ver}")
-    else:
-        print("✗ FFmpeg not found — install with: sudo apt install ffmpeg")
-
-    # Check v4l2-ctl
-    r = subprocess.run(["v4l2-ctl", "--version"], capture_output=True)
-    if r.returncode == 0:
-        print(f"✓ v4l2-ctl found")
-    else:
-        print("✗ v4l2-ctl not found — install with: sudo apt install v4l-utils")
+    # Check ffmpeg / v4l2-ctl
+    for name, path, pkg in (("FFmpeg", FFMPEG_PATH, "ffmpeg"),
+                            ("v4l2-ctl", V4L2_CTL_PATH, "v4l-utils")):
+        if path is None:
+            print(f"✗ {name} not found — install with: sudo apt install {pkg}")
+            continue
+        print(f"✓ {name} found at {path}")
+        probe = probes[name.lower()]
+        ver = probe.result() if probe is not None else None
+        if ver:
+            print(f"    {ver}")
 
     # List controls
-    if os.path.exists(state.device):
+    if device_ok:
         print(f"\n── Camera Controls ({state.device}) ──\n")
-        raw = v4l2_list_controls(state.device)
-        print(raw)
+        raw = probes["controls"].result()
+        if isinstance(raw, dict):
+            for name, (cid, lo, hi, step, default) in raw.items():
+                print(f"{name:>32} 0x{cid:08x} : min={lo} max={hi} step={step} default={default}")
+        else:
+            print(raw)
 
-        # Specifically call out focus support
+        # Specifically call out focus support (dict keys or v4l2-ctl text)
         if "focus_absolute" in raw:
             print("✓ Manual focus (focus_absolute) supported")
         else:
@@ -1809,12 +2544,12 @@ def run_diagnostics(state: CameraState):
 
     # Audio devices
     print(f"\n── Audio Capture Devices ──\n")
-    print(list_audio_devices() or "  None found (is 'alsa-utils' installed?)")
+    print(probes["arecord"].result() or "  None found (is 'alsa-utils' installed?)")
 
-    if SD_OK:
+    if probes["sd"] is not None:
         print("── sounddevice input devices ──")
         try:
-            for i, dev in enumerate(sd.query_devices()):
+            for i, dev in enumerate(probes["sd"].result()):
                 if dev["max_input_channels"] > 0:
                     print(f"  [{i}] {dev['name']}  ({dev['max_input_channels']}ch)")
         except Exception as e:
@@ -1834,7 +2569,8 @@ def run_diagnostics(state: CameraState):
 # ─────────────────────────────────────────────
 #  Entry Point
 # ─────────────────────────────────────────────
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """The command-line parser — built once, reused by every --mode shell line."""
     parser = argparse.ArgumentParser(
         description="OBSBOT Meet 2 — Pi5 CineRig Capture Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1843,13 +2579,15 @@ Examples:
   python3 obsbot_capture.py --mode gui
   python3 obsbot_capture.py --mode headless
   python3 obsbot_capture.py --mode diag
+  python3 obsbot_capture.py --mode shell   (one set of options per stdin line)
   python3 obsbot_capture.py --mode gui --device /dev/video2 --fps 24
   python3 obsbot_capture.py --mode gui --profile 1   (LT)
         """
     )
-    parser.add_argument("--mode",    choices=["gui","headless","diag"], default="gui",
-                        help="gui=preview+record  headless=TUI only  diag=diagnostics")
-    parser.add_argument("--device",  default=DEFAULT_DEVICE,
+    parser.add_argument("--mode",    choices=["gui","headless","diag","shell"], default="gui",
+                        help="gui=preview+record  headless=TUI only  diag=diagnostics  "
+                             "shell=read commands from stdin")
+    parser.add_argument("--device",  default=None,
                         help=f"V4L2 device (default: {DEFAULT_DEVICE})")
     parser.add_argument("--fps",     type=int, default=None,
                         help="Frame rate (default: from saved config or 30)")
@@ -1857,38 +2595,96 @@ Examples:
                         help="Resolution WxH (default: 3840x2160)")
     parser.add_argument("--profile", type=int, choices=[0,1,2,3], default=None,
                         help="(Legacy) ProRes profile — use --format instead")
-    parser.add_argument("--format", default=None,
-                        choices=[f["key"] for f in OUTPUT_FORMATS],
-                        help="Output format: " + ", ".join(
-                            f"{f['key']} ({f['label']})" for f in OUTPUT_FORMATS))
+    parser.add_argument("--format", default=None, choices=FORMAT_KEYS, help=_FORMAT_HELP)
+    parser.add_argument("--encoder-threads", type=int, default=None, metavar="N",
+                        help="Cap FFmpeg encoder threads (default: 0 = one per core)")
     parser.add_argument("--outdir",  default=None,
                         help="Output directory (default: ~/obsbot_footage)")
     parser.add_argument("--audio-device", default=None,
                         help="ALSA audio device override, e.g. hw:2,0 (default: auto-detect OBSBOT mic)")
-    parser.add_argument("--no-audio", action="store_true",
-                        help="Disable audio recording entirely")
+    parser.add_argument("--audio", action=argparse.BooleanOptionalAction, default=None,
+                        help="Record audio (default: on); --no-audio disables it entirely")
     parser.add_argument("--hat", action="store_true",
                         help="Enable Waveshare 1.44inch LCD HAT display and controls")
+    parser.add_argument("--verbose", action="store_true",
+                        help="diag: also print FFmpeg / v4l2-ctl version banners")
+    return parser
 
-    args = parser.parse_args()
 
-    state = CameraState()
+def apply_args(state: CameraState, args) -> None:
+    """
+    Copy parsed command-line options onto ``state``.  Options not given are
+    None and keep the state's value — CameraState's DEFAULT_DEVICE and
+    audio-on for main(), the previous line's settings in --mode shell.
+    """
     state.mode   = args.mode
-    state.device = args.device
+    if args.device:  state.device          = args.device
     if args.fps:     state.fps             = args.fps
     if args.res:     state.resolution      = args.res
     if args.profile is not None:
         # Legacy: map old ProRes profile numbers to new format keys
         legacy_map = {0: "prores_proxy", 1: "prores_lt", 2: "prores_lt", 3: "prores_hq"}
         key = legacy_map.get(args.profile, "prores_hq")
-        state.output_format_idx = next(
-            (i for i, f in enumerate(OUTPUT_FORMATS) if f["key"] == key), 0)
+        state.output_format_idx = FORMAT_IDX_BY_KEY.get(key, 0)
     if args.format:
-        state.output_format_idx = next(
-            (i for i, f in enumerate(OUTPUT_FORMATS) if f["key"] == args.format), 0)
+        state.output_format_idx = FORMAT_IDX_BY_KEY.get(args.format, 0)
     if args.outdir:  state.output_dir      = Path(args.outdir)
+    if args.encoder_threads is not None: state.encoder_threads = max(0, args.encoder_threads)
     if args.audio_device: state.audio_device = args.audio_device
-    if args.no_audio:     state.audio_enabled = False
+    if args.audio is not None: state.audio_enabled = args.audio
+
+
+def run_mode(state: CameraState, args, hat=None) -> None:
+    """Run the entry point --mode selects."""
+    if args.mode == "diag":
+        run_diagnostics(state, verbose=args.verbose)
+    elif args.mode == "gui":
+        run_gui(state, hat=hat)
+    elif args.mode == "headless":
+        run_headless(state)
+
+
+def run_shell(parser, state: CameraState, hat=None, stream=None) -> None:
+    """
+    --mode shell: each stdin line is a set of options, e.g. "--mode diag
+    --device /dev/video2", run in this process — the imports, parser and
+    state are paid for once instead of per invocation.  "quit" or EOF ends.
+    """
+    for line in stream or sys.stdin:
+        try:
+            tokens = shlex.split(line, comments=True)
+        except ValueError as e:
+            print(f"[SHELL] {e}")
+            continue
+        if not tokens:
+            continue
+        if tokens[0] in ("quit", "exit"):
+            break
+        try:
+            args = parser.parse_args(tokens)
+        except SystemExit:
+            continue            # argparse already printed the usage / --help
+        if args.mode == "shell":
+            print("[SHELL] already in shell mode")
+            continue
+        if args.hat and hat is None:
+            print("[SHELL] --hat is ignored here; start the shell with --hat instead")
+        apply_args(state, args)
+        state.refresh_clip_number()
+        try:
+            run_mode(state, args, hat=hat)
+        except SystemExit as e:
+            # GUI/headless exit when the camera or a dependency is missing —
+            # that ends this command, not the session
+            print(f"[SHELL] {args.mode} exited ({e.code})")
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    state = CameraState()
+    apply_args(state, args)
 
     # Ensure we don't overwrite existing clips
     state.refresh_clip_number()
@@ -1897,6 +2693,7 @@ Examples:
     hat = None
     if args.hat:
         if HAT_OK:
+            from hat_ui import HatUI
             hat = HatUI(state)
             hat.start()
         else:
@@ -1907,18 +2704,19 @@ Examples:
             stop_recording(state)
         if hat:
             hat.stop()
+        close_ffmpeg_log(state)
         state.save_config()
         sys.exit(0)
 
     signal.signal(signal.SIGINT,  _exit)
     signal.signal(signal.SIGTERM, _exit)
 
-    if args.mode == "diag":
-        run_diagnostics(state)
-    elif args.mode == "gui":
-        run_gui(state, hat=hat)
-    elif args.mode == "headless":
-        run_headless(state)
+    if args.mode == "shell":
+        run_shell(parser, state, hat=hat)
+        close_ffmpeg_log(state)
+        state.save_config()
+    else:
+        run_mode(state, args, hat=hat)
 
 
 if __name__ == "__main__":
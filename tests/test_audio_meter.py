@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    NP_REAL = not isinstance(np, MagicMock) and hasattr(np, "einsum")
+except ImportError:
+    NP_REAL = False
+
+import obsbot_capture
+
+
+@unittest.skipUnless(NP_REAL, "needs real numpy")
+class TestAudioMeter(unittest.TestCase):
+    def setUp(self):
+        # Other test modules swap numpy for a mock in sys.modules
+        np_patcher = patch.object(obsbot_capture, "np", np, create=True)
+        np_patcher.start()
+        self.addCleanup(np_patcher.stop)
+        # Don't pin / reschedule the test runner's own thread
+        pin_patcher = patch.object(obsbot_capture, "_pin_realtime")
+        pin_patcher.start()
+        self.addCleanup(pin_patcher.stop)
+        with patch.object(obsbot_capture.CameraState, "load_config"):
+            self.state = obsbot_capture.CameraState()
+        self.state.audio_device_sd = 1
+        self.meter = obsbot_capture.AudioMeter(self.state)
+
+    def _run_blocks(self, blocks, channels=2):
+        """Feed ``blocks`` to the callback AudioMeter._run hands a fake InputStream."""
+        sd = MagicMock()
+        self.state.audio_input_channels = channels
+        self.meter._stop.set()      # _run returns as soon as the stream is open
+        with patch.object(obsbot_capture, "sd", sd, create=True):
+            self.meter._run()
+        # Channel count comes from detection — no device re-enumeration here
+        sd.query_devices.assert_not_called()
+        kwargs = sd.InputStream.call_args.kwargs
+        self.assertEqual(kwargs["channels"], channels)
+        for block in blocks:
+            kwargs["callback"](block, len(block), None, None)
+
+    def test_levels_are_per_channel_rms(self):
+        block = np.zeros((1024, 2), np.int16)
+        block[:, 0] = 16384
+        block[::2, 1] = 32767
+        block[1::2, 1] = -32768
+        self._run_blocks([block])
+        self.assertAlmostEqual(self.state.audio_levels[0], 0.5, places=5)
+        self.assertAlmostEqual(self.state.audio_levels[1], 1.0, places=4)
+        self.assertIsInstance(self.state.audio_levels, list)
+
+    def test_peak_holds_then_decays(self):
+        loud  = np.full((1024, 2), 26214, np.int16)    # 0.8 full scale
+        quiet = np.zeros((1024, 2), np.int16)
+        self._run_blocks([loud, quiet])
+        self.assertEqual(self.state.audio_levels, [0.0, 0.0])
+        self.assertAlmostEqual(self.state.audio_peaks[0],
+                               0.8 * obsbot_capture.AUDIO_METER_DECAY, places=4)
+
+
+class TestScheduling(unittest.TestCase):
+    @unittest.skipUnless(hasattr(os, "sched_getaffinity"), "Linux-only")
+    def test_cpu_lists_use_taskset_syntax(self):
+        allowed = os.sched_getaffinity(0)
+        with patch.object(obsbot_capture.os, "sched_getaffinity", return_value={0, 1, 2, 3}):
+            self.assertEqual(obsbot_capture._parse_cpus("1-3"), {1, 2, 3})
+            self.assertEqual(obsbot_capture._parse_cpus("0, 2"), {0, 2})
+            self.assertEqual(obsbot_capture._parse_cpus("7"), set())
+            self.assertEqual(obsbot_capture._parse_cpus(""), set())
+            self.assertEqual(obsbot_capture._parse_cpus("x"), set())
+        self.assertEqual(os.sched_getaffinity(0), allowed)
+
+    def test_ffmpeg_affinity_is_opt_in(self):
+        with patch.object(obsbot_capture, "FFMPEG_CPUS", ""):
+            self.assertEqual(obsbot_capture._ffmpeg_taskset(), [])
+        with patch.object(obsbot_capture, "FFMPEG_CPUS", "1-3"), \
+             patch.object(obsbot_capture, "_parse_cpus", return_value={3, 1, 2}), \
+             patch.object(obsbot_capture.shutil, "which", return_value="/usr/bin/taskset"):
+            self.assertEqual(obsbot_capture._ffmpeg_taskset(), ["taskset", "-c", "1,2,3"])
+
+
+class TestAudioDetection(unittest.TestCase):
+    def test_detection_records_input_channels(self):
+        with patch.object(obsbot_capture.CameraState, "load_config"):
+            state = obsbot_capture.CameraState()
+        arecord = MagicMock(stdout=b"**** List of CAPTURE Hardware Devices ****\n"
+                                   b"card 2: OBSBOT_Meet2 [OBSBOT Meet2], device 0: USB Audio\n"
+                                   b"  Subdevices: 1/1\n")
+        sd = MagicMock()
+        sd.query_devices.return_value = [
+            {"name": "bcm2835 HDMI", "max_input_channels": 0},
+            {"name": "OBSBOT Meet2: USB Audio", "max_input_channels": 1},
+        ]
+        with patch.object(obsbot_capture.subprocess, "run", return_value=arecord), \
+             patch.object(obsbot_capture, "ASOUND_DIR", Path("/nonexistent/asound")), \
+             patch.object(obsbot_capture, "sd", sd, create=True), \
+             patch.object(obsbot_capture, "SD_OK", True):
+            obsbot_capture.detect_audio_device(state)
+        self.assertEqual(state.audio_device_sd, 1)
+        self.assertEqual(state.audio_input_channels, 1)
+
+    def test_detection_reads_proc_asound(self):
+        """With /proc/asound present the card is found without running arecord."""
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "cards").write_text(
+                " 0 [vc4hdmi0       ]: vc4-hdmi - vc4-hdmi-0\n"
+                "                      vc4-hdmi-0\n"
+                " 2 [Meet2          ]: USB-Audio - OBSBOT Meet2\n"
+                "                      OBSBOT Meet2 at usb-xhci-hcd.0-1, high speed\n")
+            Path(tmp, "pcm").write_text(
+                "00-00: MAI PCM i2s-hifi-0 : MAI PCM i2s-hifi-0 : playback 1\n"
+                "02-00: USB Audio : USB Audio : playback 1 : capture 1\n")
+            with patch.object(obsbot_capture, "ASOUND_DIR", Path(tmp)), \
+                 patch.object(obsbot_capture, "SD_OK", False), \
+                 patch.object(obsbot_capture.subprocess, "run") as run:
+                with patch.object(obsbot_capture.CameraState, "load_config"):
+                    state = obsbot_capture.CameraState()
+                obsbot_capture.detect_audio_device(state)
+                listing = obsbot_capture.list_audio_devices()
+            run.assert_not_called()
+        self.assertEqual(state.audio_device, "hw:2,0")
+        self.assertEqual(listing, "card 2: Meet2 [OBSBOT Meet2], device 0: USB Audio [USB Audio]\n")
+
+    def test_missing_portaudio_disables_metering(self):
+        """sounddevice loads on first use; a broken install turns metering off."""
+        with patch.dict(obsbot_capture.__dict__), \
+             patch.object(obsbot_capture.importlib, "import_module",
+                          side_effect=OSError("PortAudio library not found")):
+            obsbot_capture.__dict__.pop("sd", None)
+            obsbot_capture.SD_OK = True
+            self.assertIsNone(obsbot_capture._sounddevice())
+            self.assertFalse(obsbot_capture.SD_OK)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
 
 import unittest
 from unittest.mock import patch
+from pathlib import Path
 from obsbot_capture import detect_audio_device, CameraState, list_audio_devices
 
+# No /proc/asound either, so device listing has to go through arecord
+NO_ASOUND = patch('obsbot_capture.ASOUND_DIR', Path('/nonexistent/asound'))
+
+@NO_ASOUND
 class TestAudioResilience(unittest.TestCase):
     @patch('subprocess.run')
     def test_detect_audio_device_missing_arecord(self, mock_run):
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 import os
 import sys
+import io
 import subprocess
 from pathlib import Path
 
@@ -101,11 +102,11 @@ class TestCameraLifecycle(unittest.TestCase):
         initial_clip = self.state.clip_number
 
         # Call stop_recording
-        obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
+        with patch.object(obsbot_capture.os, "write") as mock_write:
+            obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
 
-        # Verify process interaction
-        mock_proc.stdin.write.assert_called_with(b"q")
-        mock_proc.stdin.flush.assert_called()
+        # Verify process interaction — "q" goes straight to the stdin fd
+        mock_write.assert_called_once_with(mock_proc.stdin.fileno.return_value, b"q")
         mock_proc.wait.assert_called()
 
         # Verify state update
@@ -134,9 +135,11 @@ class TestCameraLifecycle(unittest.TestCase):
         mock_proc.returncode = 1
         self.state.ffmpeg_proc = mock_proc
 
-        obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
+        with patch.object(obsbot_capture.os, "write") as mock_write:
+            obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
 
         # Verify no attempt to write to stdin
+        mock_write.assert_not_called()
         mock_proc.stdin.write.assert_not_called()
 
         # State should still clean up
@@ -166,9 +169,9 @@ class TestCameraLifecycle(unittest.TestCase):
         # Verify
         self.assertTrue(result)
 
-        # Verify log file opened
+        # Verify log file opened (line-buffered, kept for the session)
         log_path = self.state.output_dir / "ffmpeg.log"
-        mock_open.assert_called_with(log_path, "a")
+        mock_open.assert_called_with(log_path, "a", buffering=1)
 
         # Verify log written
         mock_file.write.assert_called()
@@ -179,8 +182,112 @@ class TestCameraLifecycle(unittest.TestCase):
         args, kwargs = mock_popen.call_args
         self.assertEqual(kwargs['stderr'], mock_file)
 
-        # Verify file closed
-        mock_file.close.assert_called()
+        # The next clip reuses the open log instead of reopening it
+        with patch.object(obsbot_capture.os, "write"):
+            obsbot_capture.stop_recording(self.state)
+        self.assertTrue(obsbot_capture.start_recording(self.state, cap=self.mock_cap))
+        mock_open.assert_called_once()
+        self.assertEqual(mock_popen.call_args.kwargs['stderr'], mock_file)
+        mock_file.close.assert_not_called()
+
+        # Verify file closed once the session ends
+        obsbot_capture.close_ffmpeg_log(self.state)
+        mock_file.close.assert_called_once()
+        self.assertIsNone(self.state.ffmpeg_log)
+
+    def test_preview_size_capped_by_recording_resolution(self):
+        """Preview captures at 1080p, but never above the recording size."""
+        self.state.resolution = "3840x2160"
+        self.assertEqual(obsbot_capture.preview_size(self.state), (1920, 1080))
+        self.state.resolution = "1280x720"
+        self.assertEqual(obsbot_capture.preview_size(self.state), (1280, 720))
+
+    def test_read_frame_decodes_raw_mjpeg(self):
+        """Raw MJPEG buffers are decoded by TurboJPEG; decoded frames pass through."""
+        decoder = MagicMock()
+        raw, bgr = MagicMock(ndim=2), MagicMock(ndim=3)
+        decoder.decode.return_value = bgr
+        with patch.object(obsbot_capture, "_jpeg_decoder", return_value=decoder), \
+             patch.object(obsbot_capture, "TJPF_BGR", 0, create=True), \
+             patch.object(obsbot_capture, "TJFLAG_FASTDCT", 1, create=True), \
+             patch.object(obsbot_capture, "TJFLAG_FASTUPSAMPLE", 2, create=True):
+            self.mock_cap.read.return_value = (True, raw)
+            self.assertEqual(obsbot_capture.read_frame(self.mock_cap), (True, bgr))
+            decoder.decode.assert_called_once()
+
+            self.mock_cap.read.return_value = (True, bgr)
+            self.assertEqual(obsbot_capture.read_frame(self.mock_cap), (True, bgr))
+            decoder.decode.assert_called_once()
+
+            decoder.decode.side_effect = OSError("corrupt JPEG")
+            self.mock_cap.read.return_value = (True, raw)
+            self.assertEqual(obsbot_capture.read_frame(self.mock_cap), (False, None))
+
+    @patch("obsbot_capture.subprocess.Popen")
+    def test_start_recording_tees_preview_in_gui(self, mock_popen):
+        """GUI recording pipes a raw preview back; headless keeps stdout closed."""
+        mock_popen.return_value.poll.return_value = None
+        with patch.object(obsbot_capture, "NP_OK", True):
+            self.assertTrue(obsbot_capture.start_recording(self.state, cap=self.mock_cap))
+        args, kwargs = mock_popen.call_args
+        self.assertEqual(kwargs["stdout"], subprocess.PIPE)
+        self.assertEqual(kwargs["bufsize"], obsbot_capture.FFMPEG_PIPE_SIZE)
+        self.assertEqual(args[0][-1], "pipe:1")
+        self.assertIsNotNone(self.state.preview_tap)
+
+        with patch.object(obsbot_capture.os, "write"):
+            obsbot_capture.stop_recording(self.state)
+        self.assertIsNone(self.state.preview_tap)
+
+        mock_popen.reset_mock()
+        self.state.mode = "headless"
+        with patch("obsbot_capture.open"):
+            self.assertTrue(obsbot_capture.start_recording(self.state))
+        self.assertEqual(mock_popen.call_args.kwargs["stdout"], subprocess.DEVNULL)
+        self.assertIsNone(self.state.preview_tap)
+
+    def test_capture_thread_keeps_newest_frame(self):
+        """The producer overwrites one slot and leaves the camera alone while recording."""
+        frames = [MagicMock(ndim=3) for _ in range(3)]
+        self.mock_cap.read.side_effect = [(True, f) for f in frames] + [(False, None)] * 1000
+        capture = obsbot_capture.CaptureThread(self.state, self.mock_cap, 1920, 1080)
+        with patch.object(obsbot_capture, "print", create=True):
+            capture.start()
+            deadline = obsbot_capture.time.time() + 2.0
+            while capture.latest()[0] < 3 and obsbot_capture.time.time() < deadline:
+                obsbot_capture.time.sleep(0.01)
+            capture.stop()
+        self.assertEqual(capture.latest(), (3, frames[-1]))
+
+        self.mock_cap.read.reset_mock()
+        self.state.recording = True
+        capture.start()
+        obsbot_capture.time.sleep(0.1)
+        capture.stop()
+        self.mock_cap.read.assert_not_called()
+
+    @unittest.skipUnless(obsbot_capture.FCNTL_OK and sys.platform.startswith("linux"),
+                         "F_SETPIPE_SZ is Linux-only")
+    def test_grow_pipe(self):
+        """FFmpeg pipes get a 1 MiB kernel buffer; non-pipes are ignored."""
+        r, w = os.pipe()
+        with os.fdopen(r, "rb") as rf, os.fdopen(w, "wb"):
+            obsbot_capture._grow_pipe(rf)
+            self.assertEqual(obsbot_capture.fcntl.fcntl(rf.fileno(), 1032),   # F_GETPIPE_SZ
+                             obsbot_capture.FFMPEG_PIPE_SIZE)
+        obsbot_capture._grow_pipe(MagicMock())
+        obsbot_capture._grow_pipe(None)
+
+    def test_preview_tap_keeps_newest_frame(self):
+        """The tap drains whole frames until EOF and exposes only the last."""
+        pipe = io.BytesIO(b"\x01" * 12 + b"\x02" * 12 + b"\x03" * 5)
+        with patch.object(obsbot_capture, "np", create=True) as np_mock:
+            tap = obsbot_capture.PreviewTap(pipe, 2, 2)
+            tap.join()
+        seq, frame = tap.latest()
+        self.assertEqual(seq, 2)
+        self.assertEqual(np_mock.frombuffer.call_args[0][0], b"\x02" * 12)
+        self.assertIs(frame, np_mock.frombuffer.return_value.reshape.return_value)
 
 if __name__ == "__main__":
     unittest.main()
@@ -32,5 +32,19 @@ class TestDataLoss(unittest.TestCase):
         # 3. Verify that CameraState now safely starts at 2
         self.assertEqual(self.state.clip_number, 2, "CameraState should increment to 2 to avoid collision")
 
+    def test_clip_scan_ignores_other_days_and_names(self):
+        today_str = datetime.datetime.now().strftime("%Y%m%d")
+        for name in (f"CLIP_{today_str}_0007.mov", f"CLIP_19990101_0042.mp4",
+                     f"CLIP_{today_str}_notes.txt", "ffmpeg.log"):
+            (Path(self.test_dir) / name).touch()
+        self.state.refresh_clip_number()
+        self.assertEqual(self.state.clip_number, 8)
+
+    def test_missing_output_dir_keeps_clip_number(self):
+        self.state.output_dir = Path(self.test_dir) / "missing"
+        self.state.clip_number = 1
+        self.state.refresh_clip_number()
+        self.assertEqual(self.state.clip_number, 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -77,6 +77,13 @@ class TestFFmpegCmd(unittest.TestCase):
         val = float(volume_arg.split("=")[1])
         self.assertAlmostEqual(val, 1.9953, places=3)
 
+    def test_unity_gain_has_no_filter(self):
+        """At 0 dB the audio goes straight to the encoder — no volume filter."""
+        self.state.mic_gain_db = 0
+        cmd = obsbot_capture.build_ffmpeg_cmd(self.state, "output.mp4")
+        self.assertIn("alsa", cmd)
+        self.assertNotIn("-af", cmd)
+
     def test_prores_format(self):
         """Test ProRes codec selection."""
         # Find index for prores_hq
@@ -88,6 +95,9 @@ class TestFFmpegCmd(unittest.TestCase):
         self.assertIn("prores_ks", cmd)
         self.assertIn("pcm_s24le", cmd)
         self.assertNotIn("libx264", cmd)
+        # Single process straight from the device, with a buffered demux queue
+        self.assertEqual(cmd.count("-i"), 2)
+        self.assertLess(cmd.index("-thread_queue_size"), cmd.index("v4l2"))
 
     def test_h264_format(self):
         """Test H.264 codec selection."""
@@ -101,5 +111,116 @@ class TestFFmpegCmd(unittest.TestCase):
         self.assertIn("aac", cmd)
         self.assertNotIn("prores_ks", cmd)
 
+    def test_software_realtime_tuning(self):
+        """Software presets carry realtime params; thread count follows state."""
+        cmd = obsbot_capture.build_ffmpeg_cmd(self.state, "output.mp4")
+        self.assertIn("zerolatency", cmd)
+        self.assertIn("-x264-params", cmd)
+        self.assertEqual(cmd[cmd.index("-threads") + 1], "0")
+
+        self.state.encoder_threads = 2
+        self.state.output_format_idx = next(
+            i for i, f in enumerate(obsbot_capture.OUTPUT_FORMATS) if f["key"] == "h265")
+        cmd = obsbot_capture.build_ffmpeg_cmd(self.state, "output.mp4")
+        self.assertIn("-x265-params", cmd)
+        self.assertEqual(cmd[cmd.index("-threads") + 1], "2")
+
+    def test_hw_h264_format(self):
+        """Test the V4L2 M2M hardware H.264 preset."""
+        idx = next(i for i, f in enumerate(obsbot_capture.OUTPUT_FORMATS) if f["key"] == "h264_hw")
+        self.state.output_format_idx = idx
+
+        cmd = obsbot_capture.build_ffmpeg_cmd(self.state, "output.mp4")
+
+        self.assertIn("h264_v4l2m2m", cmd)
+        self.assertNotIn("libx264", cmd)
+        self.assertEqual(cmd[cmd.index("-input_format") + 1], "mjpeg")
+
+    def test_preview_tee_output(self):
+        """A preview size adds a scaled raw BGR second output on stdout."""
+        cmd = obsbot_capture.build_ffmpeg_cmd(self.state, "output.mp4", preview=(960, 540))
+        out = cmd.index("output.mp4")
+        self.assertEqual(cmd[out + 1:], ["-map", "0:v", "-vf", "scale=960:540",
+                                         "-pix_fmt", "bgr24", "-f", "rawvideo", "pipe:1"])
+        self.assertNotIn("pipe:1", obsbot_capture.build_ffmpeg_cmd(self.state, "output.mp4"))
+
+    def test_encoder_detection(self):
+        """Formats whose encoder FFmpeg lacks are reported unavailable."""
+        listing = (" V..... = Video\n ------\n"
+                   " V....D libx264              libx264 H.264 / AVC\n"
+                   " V....D prores_ks            Apple ProRes (iCodec Pro)\n")
+        obsbot_capture.ffmpeg_encoders.cache_clear()
+        self.addCleanup(obsbot_capture.ffmpeg_encoders.cache_clear)
+        with patch("obsbot_capture.subprocess.run",
+                   return_value=MagicMock(stdout=listing)) as run:
+            hw = obsbot_capture.FORMAT_BY_KEY["h264_hw"]
+            self.assertFalse(obsbot_capture.format_available(hw))
+            self.assertTrue(obsbot_capture.format_available(obsbot_capture.FORMAT_BY_KEY["h264_high"]))
+            run.assert_called_once()
+
+    def test_encoder_detection_without_ffmpeg(self):
+        """Without an ffmpeg binary nothing is greyed out."""
+        obsbot_capture.ffmpeg_encoders.cache_clear()
+        self.addCleanup(obsbot_capture.ffmpeg_encoders.cache_clear)
+        with patch("obsbot_capture.subprocess.run", side_effect=FileNotFoundError), \
+             patch.object(obsbot_capture.os.path, "exists", return_value=True):
+            self.assertTrue(obsbot_capture.format_available(obsbot_capture.FORMAT_BY_KEY["h264_hw"]))
+
+    def test_hw_format_needs_encoder_node(self):
+        """FFmpeg lists h264_v4l2m2m on a Pi 5 too: no encode node means no HW format."""
+        self.state.output_format_idx = obsbot_capture.FORMAT_IDX_BY_KEY["h264_hw"]
+        hw = self.state.output_format
+        with patch.object(obsbot_capture, "ffmpeg_encoders", return_value=frozenset({"h264_v4l2m2m"})):
+            with patch.object(obsbot_capture.os.path, "exists", return_value=False):
+                self.assertFalse(obsbot_capture.format_available(hw))
+                self.assertIn("/dev/video11", obsbot_capture.format_refusal(self.state))
+            with patch.object(obsbot_capture.os.path, "exists", return_value=True):
+                self.assertTrue(obsbot_capture.format_available(hw))
+                self.assertIn("1080p", obsbot_capture.format_refusal(self.state))
+                self.state.resolution = "1920x1080"
+                self.assertIsNone(obsbot_capture.format_refusal(self.state))
+        self.state.output_format_idx = 0
+        self.assertIsNone(obsbot_capture.format_refusal(self.state))
+
+    def test_format_index_lookup(self):
+        """FORMAT_IDX_BY_KEY points back at the same OUTPUT_FORMATS entry."""
+        for key, idx in obsbot_capture.FORMAT_IDX_BY_KEY.items():
+            self.assertIs(obsbot_capture.OUTPUT_FORMATS[idx], obsbot_capture.FORMAT_BY_KEY[key])
+        self.assertEqual(len(obsbot_capture.FORMAT_IDX_BY_KEY), obsbot_capture.N_FORMATS)
+
+    def test_tool_version_probe_is_cached(self):
+        """Version probes run once per argv; a missing tool reads as None."""
+        obsbot_capture.tool_version.cache_clear()
+        self.addCleanup(obsbot_capture.tool_version.cache_clear)
+        banner = MagicMock(returncode=0, stdout="ffmpeg version 6.1 Copyright\nbuilt with gcc\n")
+        with patch("obsbot_capture.subprocess.run", return_value=banner) as run:
+            self.assertEqual(obsbot_capture.tool_version("ffmpeg", "-version"),
+                             "ffmpeg version 6.1 Copyright")
+            obsbot_capture.tool_version("ffmpeg", "-version")
+            run.assert_called_once()
+        with patch("obsbot_capture.subprocess.run", side_effect=FileNotFoundError):
+            self.assertIsNone(obsbot_capture.tool_version("v4l2-ctl", "--version"))
+
+    def test_diag_only_spawns_tools_when_verbose(self):
+        """Plain diag reports tool paths from the PATH lookup; --verbose adds versions."""
+        obsbot_capture.tool_version.cache_clear()
+        self.addCleanup(obsbot_capture.tool_version.cache_clear)
+        self.state.device = "/nonexistent/video0"
+        with patch.object(obsbot_capture, "FFMPEG_PATH", "/usr/bin/ffmpeg"), \
+             patch.object(obsbot_capture, "V4L2_CTL_PATH", None), \
+             patch.object(obsbot_capture, "SD_OK", False), \
+             patch.object(obsbot_capture, "list_audio_devices", return_value=""), \
+             patch.object(obsbot_capture.Path, "mkdir"), \
+             patch("obsbot_capture.subprocess.run",
+                   return_value=MagicMock(returncode=0, stdout="ffmpeg version 6.1\n")) as run, \
+             patch("builtins.print") as out:
+            obsbot_capture.run_diagnostics(self.state)
+            run.assert_not_called()
+            obsbot_capture.run_diagnostics(self.state, verbose=True)
+            run.assert_called_once()
+        lines = [c.args[0] for c in out.call_args_list if c.args]
+        self.assertIn("✓ FFmpeg found at /usr/bin/ffmpeg", lines)
+        self.assertIn("    ffmpeg version 6.1", lines)
+
 if __name__ == "__main__":
     unittest.main()
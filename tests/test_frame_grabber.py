@@ -16,55 +16,76 @@ except ImportError:
     FrameGrabber = None
     hat_ui = None
 
-class TestFrameGrabber(unittest.TestCase):
-    def setUp(self):
-        if FrameGrabber is None:
-            self.skipTest("hat_ui could not be imported")
+class FakeImage:
+    """Stand-in PIL image: FrameGrabber only stores and hands these on."""
+    __slots__ = ()
+
+    def resize(self, *_args, **_kwargs):
+        return self
+
+    def convert(self, *_args, **_kwargs):
+        return self
+
+    def copy(self):
+        return self
+
+
+class _Frame:
+    """Stand-in camera frame: FrameGrabber only reads its shape."""
+    __slots__ = ("shape",)
+
+    def __init__(self, shape):
+        self.shape = shape
 
-        # Create mocks
-        self.mock_image_cls = MagicMock()
-        self.mock_draw_cls = MagicMock()
-        self.mock_font_cls = MagicMock()
-        self.mock_cv2 = MagicMock()
+
+class TestFrameGrabber(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The mock tree is the same for every test: build it once, and
+        # only clear recorded calls between tests (see setUp)
+        cls.mock_image_cls = MagicMock()
+        cls.mock_draw_cls = MagicMock()
+        cls.mock_font_cls = MagicMock()
+        cls.mock_cv2 = MagicMock()
 
         # Setup standard mock behaviors
-        self.mock_image = MagicMock()
-        self.mock_image_cls.new.return_value = self.mock_image
-        self.mock_image_cls.fromarray.return_value = self.mock_image
-        self.mock_image.resize.return_value = self.mock_image
-        self.mock_image.convert.return_value = self.mock_image
-        self.mock_image.copy.return_value = self.mock_image
+        cls.mock_image = FakeImage()
+        cls.mock_image_cls.new.return_value = cls.mock_image
+        cls.mock_image_cls.fromarray.return_value = cls.mock_image
+        cls.mock_image_cls.frombuffer.return_value = cls.mock_image
 
-        self.mock_draw_instance = MagicMock()
-        self.mock_draw_cls.Draw.return_value = self.mock_draw_instance
+        cls.mock_draw_instance = MagicMock()
+        cls.mock_draw_cls.Draw.return_value = cls.mock_draw_instance
 
         # Mock cv2 constants and behaviors
-        self.mock_cv2.CAP_V4L2 = 200
-        self.mock_cv2.CAP_PROP_FRAME_WIDTH = 3
-        self.mock_cv2.CAP_PROP_FRAME_HEIGHT = 4
-        self.mock_cv2.CAP_PROP_FPS = 5
-        self.mock_cv2.CAP_PROP_BUFFERSIZE = 38
-        self.mock_cv2.COLOR_BGR2RGB = 4
-        self.mock_cv2.VideoWriter_fourcc.return_value = 12345
-        self.mock_cv2.cvtColor.return_value = MagicMock(shape=(100, 100, 3))
+        cls.mock_cv2.CAP_V4L2 = 200
+        cls.mock_cv2.CAP_PROP_FRAME_WIDTH = 3
+        cls.mock_cv2.CAP_PROP_FRAME_HEIGHT = 4
+        cls.mock_cv2.CAP_PROP_FPS = 5
+        cls.mock_cv2.CAP_PROP_BUFFERSIZE = 38
+        cls.mock_cv2.COLOR_BGR2RGB = 4
+        cls.mock_cv2.VideoWriter_fourcc.return_value = 12345
+        cls.mock_cv2.cvtColor.return_value = _Frame((100, 100, 3))
+        cls.mock_np = MagicMock()
+
+    def setUp(self):
+        if FrameGrabber is None:
+            self.skipTest("hat_ui could not be imported")
+
+        # Recorded calls are per test; configured return values are shared
+        for m in (self.mock_image_cls, self.mock_draw_cls, self.mock_font_cls,
+                  self.mock_cv2, self.mock_np):
+            m.reset_mock()
+        self.mock_cv2.VideoCapture.return_value = MagicMock()
 
         # Patch dependencies directly in hat_ui module
         # create=True handles cases where the module failed to import optional deps originally
-        self.patchers = [
-            patch.object(hat_ui, 'Image', self.mock_image_cls, create=True),
-            patch.object(hat_ui, 'ImageDraw', self.mock_draw_cls, create=True),
-            patch.object(hat_ui, 'ImageFont', self.mock_font_cls, create=True),
-            patch.object(hat_ui, 'cv2', self.mock_cv2, create=True),
-            patch.object(hat_ui, 'CV2_OK', True, create=True),
-            patch.object(hat_ui, 'PIL_OK', True, create=True),
-        ]
-
-        for p in self.patchers:
-            p.start()
-
-    def tearDown(self):
-        for p in self.patchers:
-            p.stop()
+        patcher = patch.multiple(hat_ui, create=True,
+                                 Image=self.mock_image_cls, ImageDraw=self.mock_draw_cls,
+                                 ImageFont=self.mock_font_cls, cv2=self.mock_cv2,
+                                 np=self.mock_np, CV2_OK=True, PIL_OK=True, NP_OK=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_init_state(self):
         fg = FrameGrabber("/dev/video0")
@@ -84,16 +105,28 @@ class TestFrameGrabber(unittest.TestCase):
         """
         fg = FrameGrabber("/dev/video0")
 
-        mock_frame = MagicMock()
+        mock_frame = _Frame((240, 320, 3))
         fg.feed_frame(mock_frame)
 
         self.assertTrue(fg._fed, "Should be marked as fed")
         self.assertTrue(fg._ok, "Should be marked as OK")
-        self.assertIsNotNone(fg._frame, "Frame should be stored")
+        self.assertIs(fg._frame, self.mock_image, "Frame should be stored")
 
-        # Verify conversions happened
+        # Verify conversions happened — crop/resize fused into one warp,
+        # colour conversion done on the small output only
+        self.mock_cv2.warpAffine.assert_called_once()
         self.mock_cv2.cvtColor.assert_called_once()
-        self.mock_image_cls.fromarray.assert_called_once()
+        self.mock_image_cls.frombuffer.assert_called_once()
+        self.assertEqual(fg.gen, 1, "each fed frame bumps the generation")
+        self.assertIs(fg.get_bgr(), self.mock_cv2.warpAffine.return_value,
+                      "small BGR frame kept for the raw LIVE path")
+
+    def test_affine_cached_per_shape(self):
+        fg = FrameGrabber("/dev/video0")
+        m1 = fg._affine((240, 320, 3))
+        self.assertIs(fg._affine((240, 320, 3)), m1)
+        fg._affine((480, 640, 3))
+        self.assertEqual(fg._M_shape, (480, 640))
 
     @patch('time.time')
     @patch('time.sleep')
@@ -139,7 +172,7 @@ class TestFrameGrabber(unittest.TestCase):
         # Mock read() to stop the loop after one frame
         def read_side_effect():
             fg._stop.set() # Stop after first read
-            return True, MagicMock()
+            return True, _Frame((240, 320, 3))
 
         mock_cap.read.side_effect = read_side_effect
 
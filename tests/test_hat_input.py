@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Mock hardware modules BEFORE importing hat_ui
+sys.modules.setdefault('RPi', MagicMock())
+sys.modules.setdefault('RPi.GPIO', MagicMock())
+sys.modules.setdefault('spidev', MagicMock())
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hat_ui
+from hat_ui import HatInput, ALL_INPUT_PINS, PIN_KEY1, PIN_JOY_UP
+
+
+class TestHatInput(unittest.TestCase):
+    def setUp(self):
+        self.gpio = MagicMock()
+        self.gpio.LOW = 0
+        self.held = set()
+        self.gpio.input.side_effect = lambda pin: 0 if pin in self.held else 1
+        self.now = 1_000_000_000_000
+        self.patchers = [
+            patch.object(hat_ui, 'GPIO', self.gpio, create=True),
+            patch.object(hat_ui, 'GPIO_OK', True, create=True),
+            patch.object(HatInput, '_map_levels', staticmethod(lambda: None)),
+            patch.object(hat_ui.time, 'monotonic_ns', lambda: self.now),
+        ]
+        for p in self.patchers:
+            p.start()
+        self.inp = HatInput()
+
+    def tearDown(self):
+        for p in self.patchers:
+            p.stop()
+
+    def poll(self, dt=0.0):
+        self.now += int(dt * 1e9)
+        return self.inp.get_events()
+
+    def test_idle_has_no_events(self):
+        self.assertEqual(self.poll(), [])
+
+    def test_press_fires_once(self):
+        self.held.add(PIN_KEY1)
+        self.assertEqual(self.poll(), [(PIN_KEY1, 'press')])
+        self.assertEqual(self.poll(0.5), [], "KEY1 does not auto-repeat")
+
+    def test_bounce_inside_debounce_window_is_ignored(self):
+        self.held.add(PIN_KEY1)
+        self.poll()
+        self.held.clear()
+        self.poll(0.01)
+        self.held.add(PIN_KEY1)
+        self.assertEqual(self.poll(0.01), [])
+        self.held.clear()
+        self.poll(0.01)
+        self.held.add(PIN_KEY1)
+        self.assertEqual(self.poll(0.1), [(PIN_KEY1, 'press')])
+
+    def test_joy_up_repeats_when_held(self):
+        self.held.add(PIN_JOY_UP)
+        self.assertEqual(self.poll(), [(PIN_JOY_UP, 'press')])
+        self.assertEqual(self.poll(0.3), [], "no repeat before HOLD_DELAY_NS")
+        self.assertEqual(self.poll(0.2), [(PIN_JOY_UP, 'repeat')])
+        self.assertEqual(self.poll(0.05), [], "repeat rate limited")
+        self.assertEqual(self.poll(0.1), [(PIN_JOY_UP, 'repeat')])
+
+    def test_all_pins_reported(self):
+        self.held.update(ALL_INPUT_PINS)
+        self.assertEqual([p for p, _ in self.poll()], ALL_INPUT_PINS)
+
+
+if __name__ == '__main__':
+    unittest.main()
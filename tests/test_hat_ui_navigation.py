@@ -2,17 +2,13 @@ import unittest
 from unittest.mock import MagicMock
 import sys
 import os
+from types import SimpleNamespace
 
-# 1. Mock hardware/library modules BEFORE importing hat_ui
-sys.modules['RPi'] = MagicMock()
-sys.modules['RPi.GPIO'] = MagicMock()
-sys.modules['spidev'] = MagicMock()
-sys.modules['cv2'] = MagicMock()
-sys.modules['numpy'] = MagicMock()
-sys.modules['PIL'] = MagicMock()
-sys.modules['PIL.Image'] = MagicMock()
-sys.modules['PIL.ImageDraw'] = MagicMock()
-sys.modules['PIL.ImageFont'] = MagicMock()
+# 1. Mock hardware/library modules BEFORE importing hat_ui — only where
+#    nothing is loaded yet, so modules imported by earlier tests stay intact
+for _name in ('RPi', 'RPi.GPIO', 'spidev', 'cv2', 'numpy',
+              'PIL', 'PIL.Image', 'PIL.ImageDraw', 'PIL.ImageFont'):
+    sys.modules.setdefault(_name, MagicMock())
 
 # 2. Add project root to path so we can import hat_ui
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -46,5 +42,25 @@ class TestHatUINavigation(unittest.TestCase):
         # Assert page incremented to 2
         self.assertEqual(ui._page, 2, "JOY_RIGHT should increment page index")
 
+    def test_frame_key_tracks_changes(self):
+        """An unchanged UI re-uses its last frame; input, audio and time do not."""
+        state = SimpleNamespace(device="/dev/video0", recording=False,
+                                audio_levels=[0.1, 0.1], exposure=500)
+        ui = HatUI(state)
+        ui.inp = MagicMock()
+        key = ui._frame_key(100.0)
+        self.assertEqual(ui._frame_key(100.1), key)
+
+        state.audio_levels[0] = 0.5          # mutated in place by AudioMeter
+        self.assertNotEqual(ui._frame_key(100.1), key)
+        key = ui._frame_key(100.1)
+
+        ui.inp.get_events.return_value = [(PIN_JOY_RIGHT, 'press')]
+        ui._handle_input()
+        self.assertNotEqual(ui._frame_key(100.1), key)
+
+        self.assertNotEqual(ui._frame_key(100.1), ui._frame_key(100.6),
+                            "half-second clock forces a refresh")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import obsbot_capture
+
+
+class TestKeyActions(unittest.TestCase):
+    def setUp(self):
+        with patch.object(obsbot_capture.CameraState, "load_config"):
+            self.state = obsbot_capture.CameraState()
+        patcher = patch.object(obsbot_capture, "v4l2_set")
+        self.v4l2_set = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def press(self, key):
+        return obsbot_capture.KEY_ACTIONS[key](self.state)
+
+    def test_exposure_clamps_and_reports(self):
+        self.state.auto_exp = False
+        self.state.exposure = 9980
+        self.assertEqual(self.press("e"), ("EXP 10000", obsbot_capture.COLOR_WHITE))
+        self.v4l2_set.assert_called_once_with(self.state.device,
+                                              obsbot_capture.V4L2_EXPOSURE, 10000)
+        self.state.exposure = 60
+        self.press("d")
+        self.assertEqual(self.state.exposure, 50)
+
+    def test_focus_keys_ignored_in_autofocus(self):
+        self.state.auto_focus = True
+        focus = self.state.focus
+        self.assertIsNone(self.press("]"))
+        self.assertEqual(self.state.focus, focus)
+        self.v4l2_set.assert_not_called()
+
+    def test_gui_table_adds_overlay_toggles(self):
+        table = obsbot_capture.GUI_KEY_ACTIONS
+        self.assertIs(table[ord("+")], obsbot_capture.KEY_ACTIONS["+"])
+        self.assertNotIn("k", obsbot_capture.KEY_ACTIONS)
+        self.state.show_guides = False
+        self.assertEqual(table[ord("l")](self.state), ("GUIDES ON", obsbot_capture.COLOR_GREEN))
+        self.assertTrue(self.state.show_guides)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,46 +1,53 @@
 import sys
 import unittest
-import importlib
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-# Define mocks globally so they persist
+# cv2/numpy are patched onto obsbot_capture per class; sounddevice and
+# hat_ui are only imported on demand, so sys.modules is left alone
 mock_cv2 = MagicMock()
 mock_numpy = MagicMock()
-mock_sd = MagicMock()
-mock_hat = MagicMock()
 
-sys.modules["cv2"] = mock_cv2
-sys.modules["numpy"] = mock_numpy
-sys.modules["sounddevice"] = mock_sd
-sys.modules["hat_ui"] = mock_hat
-
-# We must import obsbot_capture AFTER mocking
-# If it was already imported, we must reload it to ensure it sees the mocks and sets CV2_OK = True
 try:
     import obsbot_capture
-    importlib.reload(obsbot_capture)
 except ImportError:
     # If not in path, try adding current dir
     sys.path.append(".")
     import obsbot_capture
-    importlib.reload(obsbot_capture)
+
 
 class TestPerfOpt(unittest.TestCase):
-    def setUp(self):
-        # Reset mocks
-        obsbot_capture.cv2.reset_mock()
-        obsbot_capture.cv2.cvtColor.side_effect = None
+    @classmethod
+    def setUpClass(cls):
+        # Point the already-imported module at the mocks for this class only
+        # rather than reloading it (a reload re-runs the whole module and
+        # swaps out classes that other test modules already imported)
+        patcher = patch.multiple(obsbot_capture, create=True, cv2=mock_cv2, np=mock_numpy,
+                                 CV2_OK=True, NP_OK=True)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
 
+        # The cv2 return-value tree is the same for every test: wire it once;
+        # reset_mock() in setUp clears calls but keeps it
         # 1. Mock calcHist for _apply_focus_peaking
-        mock_hist = MagicMock()
-        mock_hist.__getitem__.side_effect = lambda i: [10]
+        cls.mock_hist = MagicMock()
+        cls.mock_hist.__getitem__.side_effect = lambda i: [10]
         # Ensure flatten().astype(int) returns a Mock
-        mock_hist.flatten.return_value.astype.return_value = MagicMock()
-
-        obsbot_capture.cv2.calcHist.return_value = mock_hist
+        cls.mock_hist.flatten.return_value.astype.return_value = MagicMock()
+        mock_cv2.calcHist.return_value = cls.mock_hist
 
         # 2. Mock threshold for _apply_focus_peaking
-        obsbot_capture.cv2.threshold.return_value = (None, MagicMock())
+        mock_cv2.threshold.return_value = (None, MagicMock())
+
+    def setUp(self):
+        # Peaking / histogram buffers are cached per shape — start empty so
+        # nothing built from real numpy elsewhere in the run is reused here
+        obsbot_capture._peak_layers.clear()
+        obsbot_capture._peak_planes.clear()
+        obsbot_capture._hist_curves.clear()
+
+        # Reset recorded calls (hist is a child of cv2 via calcHist)
+        obsbot_capture.cv2.reset_mock()
+        obsbot_capture.cv2.cvtColor.side_effect = None
 
     def test_apply_focus_peaking_calls_cvtColor_when_gray_is_none(self):
         frame = MagicMock()
@@ -70,5 +77,30 @@ class TestPerfOpt(unittest.TestCase):
         obsbot_capture._draw_histogram(img, w, h, gray=gray)
         obsbot_capture.cv2.cvtColor.assert_not_called()
 
+    def test_peaking_without_refresh_reuses_last_mask(self):
+        frame = MagicMock()
+        frame.shape = (1080, 1920, 3)
+        obsbot_capture._apply_focus_peaking(frame, gray=MagicMock())
+        obsbot_capture.cv2.reset_mock()
+        obsbot_capture._apply_focus_peaking(frame, refresh=False)
+        obsbot_capture.cv2.Laplacian.assert_not_called()
+        obsbot_capture.cv2.cvtColor.assert_not_called()
+        obsbot_capture.cv2.add.assert_called_once()
+
+    def test_histogram_without_refresh_skips_analysis(self):
+        img = MagicMock()
+        obsbot_capture._draw_histogram(img, 1920, 1080, gray=MagicMock())
+        obsbot_capture.cv2.reset_mock()
+        obsbot_capture._draw_histogram(img, 1920, 1080, refresh=False)
+        obsbot_capture.cv2.cvtColor.assert_not_called()
+        obsbot_capture.cv2.calcHist.assert_not_called()
+        obsbot_capture.cv2.polylines.assert_called_once()
+
+    def test_histogram_without_refresh_measures_first_curve(self):
+        img = MagicMock()
+        obsbot_capture._draw_histogram(img, 1920, 1080, refresh=False)
+        obsbot_capture.cv2.calcHist.assert_called_once()
+        obsbot_capture.cv2.polylines.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, mock_open
+import io
 import os
 import sys
 import json
@@ -10,6 +11,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import obsbot_capture
 
+
+class _ConfigBuffer(io.StringIO):
+    """Real text buffer for json.dump to write into; counts flushes."""
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
 class TestSaveConfig(unittest.TestCase):
     def setUp(self):
         # Create a mock CameraState instance
@@ -29,8 +40,8 @@ class TestSaveConfig(unittest.TestCase):
         mock_fd = 123
         mock_os_open.return_value = mock_fd
 
-        mock_file_obj = MagicMock()
-        mock_os_fdopen.return_value.__enter__.return_value = mock_file_obj
+        buf = _ConfigBuffer()
+        mock_os_fdopen.return_value.__enter__.return_value = buf
 
         # Call the method under test
         self.camera_state.save_config()
@@ -47,12 +58,11 @@ class TestSaveConfig(unittest.TestCase):
         # Verify os.fdopen called with the file descriptor
         mock_os_fdopen.assert_called_once_with(mock_fd, 'w')
 
-        # Verify data was written to the file object
-        # json.dump writes to the file object. We can check write calls on the mock file object.
-        self.assertTrue(mock_file_obj.write.called)
+        # Verify the settings were written as JSON
+        self.assertEqual(json.loads(buf.getvalue()), self.camera_state._config_data())
 
         # Verify flush and fsync were called
-        mock_file_obj.flush.assert_called_once()
+        self.assertEqual(buf.flushes, 1)
         mock_os_fsync.assert_called_once_with(mock_fd)
 
         # Verify atomic rename
@@ -76,5 +86,31 @@ class TestSaveConfig(unittest.TestCase):
         # Verify error was logged
         mock_print.assert_called_with("[WARN] Failed to save config: Disk full")
 
+    @patch("obsbot_capture.os.replace")
+    @patch("obsbot_capture.os.fsync")
+    @patch("obsbot_capture.os.fdopen")
+    @patch("obsbot_capture.os.open", return_value=123)
+    def test_autosave_only_writes_changes(self, mock_os_open, mock_os_fdopen, mock_os_fsync, mock_os_replace):
+        """
+        Verify autosave skips unchanged settings, is rate-limited, and
+        writes without fsync.
+        """
+        state = self.camera_state
+        state._last_save = 0.0
+        state.autosave()
+        mock_os_open.assert_not_called()
+
+        state.gain += 10
+        state._last_save = 0.0
+        state.autosave()
+        mock_os_open.assert_called_once()
+        mock_os_replace.assert_called_once()
+        mock_os_fsync.assert_not_called()
+
+        # Within the interval nothing is written, even if settings change
+        state.gain += 10
+        state.autosave()
+        mock_os_open.assert_called_once()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+import io
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import obsbot_capture
+
+
+class TestShellMode(unittest.TestCase):
+    def setUp(self):
+        with patch.object(obsbot_capture.CameraState, "load_config"):
+            self.state = obsbot_capture.CameraState()
+        self.parser = obsbot_capture.build_parser()
+
+    def run_lines(self, text):
+        with patch.object(obsbot_capture, "run_diagnostics") as diag, \
+             patch.object(obsbot_capture.CameraState, "refresh_clip_number"), \
+             patch("sys.stderr", new_callable=io.StringIO), \
+             patch("builtins.print"):
+            obsbot_capture.run_shell(self.parser, self.state, stream=io.StringIO(text))
+        return diag
+
+    def test_each_line_reuses_parser_and_state(self):
+        diag = self.run_lines("--mode diag --fps 24\n"
+                              "# comment\n\n"
+                              "--mode diag --format prores_lt --verbose\n")
+        self.assertEqual(diag.call_count, 2)
+        self.assertEqual(diag.call_args.kwargs, {"verbose": True})
+        self.assertEqual(self.state.fps, 24, "options carry over between lines")
+        self.assertEqual(self.state.output_format["key"], "prores_lt")
+
+    def test_device_and_audio_carry_over(self):
+        """Options left off a line keep the previous line's value; --audio undoes --no-audio."""
+        self.run_lines("--mode diag --device /dev/video2 --no-audio\n--mode diag\n")
+        self.assertEqual(self.state.device, "/dev/video2")
+        self.assertFalse(self.state.audio_enabled)
+        self.run_lines("--mode diag --audio\n")
+        self.assertTrue(self.state.audio_enabled)
+        self.assertEqual(self.state.device, "/dev/video2")
+
+    def test_bad_lines_are_skipped_and_quit_stops(self):
+        diag = self.run_lines("--fps fast\n"
+                              "--mode 'diag\n"
+                              "--mode shell\n"
+                              "quit\n"
+                              "--mode diag\n")
+        diag.assert_not_called()
+
+    def test_failed_command_keeps_shell_running(self):
+        """A mode that sys.exit()s (no camera, no cv2) ends that line only."""
+        with patch.object(obsbot_capture, "run_gui", side_effect=SystemExit(1)) as gui:
+            diag = self.run_lines("--mode gui\n--mode gui --hat\n--mode diag\n")
+        self.assertEqual(gui.call_count, 2)
+        diag.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
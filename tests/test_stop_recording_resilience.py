@@ -9,6 +9,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import obsbot_capture
 
+# FFmpeg ignoring "q" past the stop timeout — raised as-is, so build it once
+_FFMPEG_TIMEOUT = subprocess.TimeoutExpired(cmd='ffmpeg', timeout=10)
+
 class TestStopRecordingResilience(unittest.TestCase):
     def setUp(self):
         # Patch CameraState dependencies to avoid side effects
@@ -45,7 +48,7 @@ class TestStopRecordingResilience(unittest.TestCase):
         # Arrange
         # First call to wait() raises TimeoutExpired, second call returns None
         self.state.ffmpeg_proc.wait.side_effect = [
-            subprocess.TimeoutExpired(cmd='ffmpeg', timeout=10),
+            _FFMPEG_TIMEOUT,
             None
         ]
 
@@ -53,11 +56,12 @@ class TestStopRecordingResilience(unittest.TestCase):
         mock_proc = self.state.ffmpeg_proc
 
         # Act
-        obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
+        with patch.object(obsbot_capture.os, "write") as mock_write:
+            obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
 
         # Assert
         # 1. Graceful quit attempted
-        mock_proc.stdin.write.assert_called_with(b"q")
+        mock_write.assert_called_with(mock_proc.stdin.fileno.return_value, b"q")
 
         # 2. wait() called with timeout first
         mock_proc.wait.assert_any_call(timeout=10)
@@ -79,13 +83,12 @@ class TestStopRecordingResilience(unittest.TestCase):
         """
         # Arrange
         # Simulate an error during the graceful shutdown attempt
-        self.state.ffmpeg_proc.stdin.write.side_effect = OSError("Pipe error")
-
         # Keep a reference to the mock process before it's cleared from state
         mock_proc = self.state.ffmpeg_proc
 
         # Act
-        obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
+        with patch.object(obsbot_capture.os, "write", side_effect=OSError("Pipe error")):
+            obsbot_capture.stop_recording(self.state, cap=self.mock_cap)
 
         # Assert
         # kill() should be called in the except block
@@ -10,35 +10,37 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import obsbot_capture
 
 class TestStorageCalculation(unittest.TestCase):
-    def setUp(self):
-        # Prevent actual file I/O for config loading
-        self.mock_exists_patcher = patch.object(Path, 'exists', return_value=False)
-        self.mock_exists = self.mock_exists_patcher.start()
-
-        self.mock_read_patcher = patch.object(Path, 'read_text')
-        self.mock_read = self.mock_read_patcher.start()
+    @classmethod
+    def setUpClass(cls):
+        # Prevent actual file I/O for config loading — once for the class
+        patcher = patch.multiple(Path, exists=MagicMock(return_value=False),
+                                 read_text=MagicMock())
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
 
-    def tearDown(self):
-        self.mock_exists_patcher.stop()
-        self.mock_read_patcher.stop()
+    def setUp(self):
+        # One state per test (each has its own free-space cache), with an
+        # output dir that exists unless a test swaps it out
+        self.state = obsbot_capture.CameraState()
+        self.state.output_dir = self._output_dir("/tmp/fake_storage")
+
+    @staticmethod
+    def _output_dir(path, exists=True):
+        out = MagicMock()
+        out.exists.return_value = exists
+        out.__str__.return_value = path
+        return out
 
     @patch('shutil.disk_usage')
-    def test_remaining_storage_4k(self, mock_disk_usage):
+    def test_remaining_storage_by_resolution(self, mock_disk_usage):
         """
-        Verify storage calculation for 4K resolution.
+        Verify storage calculation for 4K, and for 1080p (halves bitrate).
         """
         # Mock 100GB free space
         # disk_usage returns (total, used, free)
         mock_disk_usage.return_value = (200 * 1024**3, 100 * 1024**3, 100 * 1024**3)
 
-        state = obsbot_capture.CameraState()
-
-        # Override output_dir with a MagicMock that exists
-        state.output_dir = MagicMock()
-        state.output_dir.exists.return_value = True
-        state.output_dir.__str__.return_value = "/tmp/fake_storage"
-
-        state.resolution = "3840x2160"
+        state = self.state
 
         # Manually set output format to something predictable (h264_high)
         # Check obsbot_capture.OUTPUT_FORMATS[0] is h264_high (~50Mbps)
@@ -48,42 +50,17 @@ class TestStorageCalculation(unittest.TestCase):
         fmt = state.output_format
         self.assertIn("50Mbps", fmt["note"])
 
-        free_gb, mins = state.remaining_storage_info
-
-        # Check free space calculation (100GB)
-        self.assertAlmostEqual(free_gb, 100.0)
+        # 4K:    mins = (100 * 8000 / 50) / 60 = 266.66... -> int(266)
+        # 1080p: mbps = max(1, 50 // 2) = 25
+        #        mins = (100 * 8000 / 25) / 60 = 533.33... -> int(533)
+        for resolution, expected_mins in (("3840x2160", 266), ("1920x1080", 533)):
+            with self.subTest(resolution=resolution):
+                state.resolution = resolution
+                free_gb, mins = state.remaining_storage_info
 
-        # Calculation:
-        # mbps = 50 (from note)
-        # mins = (100 * 8000 / 50) / 60
-        #      = (16000) / 60
-        #      = 266.66... -> int(266)
-        self.assertEqual(mins, 266)
-
-    @patch('shutil.disk_usage')
-    def test_remaining_storage_1080p(self, mock_disk_usage):
-        """
-        Verify storage calculation for 1080p resolution (halves bitrate).
-        """
-        # Mock 100GB free space
-        mock_disk_usage.return_value = (100 * 1024**3, 0, 100 * 1024**3)
-
-        state = obsbot_capture.CameraState()
-
-        state.output_dir = MagicMock()
-        state.output_dir.exists.return_value = True
-        state.output_dir.__str__.return_value = "/tmp/fake_storage"
-
-        state.resolution = "1920x1080"
-        state.output_format_idx = 0 # 50Mbps base
-
-        # 1080p logic: mbps = max(1, 50 // 2) = 25
-        # mins = (100 * 8000 / 25) / 60
-        #      = 32000 / 60
-        #      = 533.33... -> int(533)
-
-        free_gb, mins = state.remaining_storage_info
-        self.assertEqual(mins, 533)
+                # Check free space calculation (100GB)
+                self.assertAlmostEqual(free_gb, 100.0)
+                self.assertEqual(mins, expected_mins)
 
     @patch('shutil.disk_usage')
     def test_disk_usage_error(self, mock_disk_usage):
@@ -92,11 +69,7 @@ class TestStorageCalculation(unittest.TestCase):
         """
         mock_disk_usage.side_effect = OSError("Disk error")
 
-        state = obsbot_capture.CameraState()
-        state.output_dir = MagicMock()
-        state.output_dir.exists.return_value = True
-        state.output_dir.__str__.return_value = "/tmp/fake_storage"
-
+        state = self.state
         free_gb, mins = state.remaining_storage_info
 
         self.assertEqual(free_gb, 0)
@@ -110,17 +83,12 @@ class TestStorageCalculation(unittest.TestCase):
         # 50GB free
         mock_disk_usage.return_value = (100 * 1024**3, 50 * 1024**3, 50 * 1024**3)
 
-        state = obsbot_capture.CameraState()
+        state = self.state
 
         # We need output_dir.exists() -> False
         # But output_dir.parent.exists() -> True
-        mock_out = MagicMock()
-        mock_out.exists.return_value = False
-        mock_out.__str__.return_value = "/tmp/missing"
-
-        mock_parent = MagicMock()
-        mock_parent.exists.return_value = True
-        mock_parent.__str__.return_value = "/tmp"
+        mock_out = self._output_dir("/tmp/missing", exists=False)
+        mock_parent = self._output_dir("/tmp")
         # Prevent infinite recursion in parent traversal
         mock_parent.parent = mock_parent
 
@@ -139,15 +107,40 @@ class TestStorageCalculation(unittest.TestCase):
         # Verify it checked the parent path
         mock_disk_usage.assert_called_with("/tmp")
 
+    @patch('shutil.disk_usage')
+    def test_free_space_probe_is_cached(self, mock_disk_usage):
+        """
+        Verify repeated reads reuse one disk_usage() call until the TTL
+        lapses or output_dir changes; the estimate still follows the format.
+        """
+        mock_disk_usage.return_value = (200 * 1024**3, 100 * 1024**3, 100 * 1024**3)
+        state = self.state
+        state.resolution = "3840x2160"
+        state.output_format_idx = 0
+
+        self.assertEqual(state.remaining_storage_info[1], 266)
+        state.output_format_idx = next(i for i, f in enumerate(obsbot_capture.OUTPUT_FORMATS)
+                                       if f["est_mbps"] == 100)
+        self.assertEqual(state.remaining_storage_info[1], 133)
+        self.assertEqual(mock_disk_usage.call_count, 1)
+
+        state.output_dir = MagicMock()
+        state.remaining_storage_info
+        self.assertEqual(mock_disk_usage.call_count, 2)
+
+        with patch.object(obsbot_capture.time, 'monotonic',
+                          return_value=obsbot_capture.time.monotonic() + obsbot_capture.STORAGE_TTL):
+            state.remaining_storage_info
+        self.assertEqual(mock_disk_usage.call_count, 3)
+
     def test_storage_fails_if_no_parent_exists(self):
         """
         Verify (0,0) is returned if neither output dir nor parents exist.
         """
-        state = obsbot_capture.CameraState()
+        state = self.state
 
         # output_dir and its parent both fail exists()
-        mock_out = MagicMock()
-        mock_out.exists.return_value = False
+        mock_out = self._output_dir("/nonexistent", exists=False)
         mock_out.parent = mock_out # simulating root that doesn't exist
         state.output_dir = mock_out
 
@@ -13,9 +13,9 @@ import obsbot_capture
 class TestStorageFragility(unittest.TestCase):
 
     @patch('shutil.disk_usage')
-    @patch.object(Path, 'exists', return_value=True) # Mock Config File existence check
-    @patch.object(Path, 'read_text', return_value="{}") # Mock Config File read
-    def test_bitrate_parsing_robustness(self, mock_read, mock_exists, mock_disk_usage):
+    # Config file "exists" and reads as empty — one patch for both
+    @patch.multiple(Path, exists=lambda self: True, read_text=lambda self: "{}")
+    def test_bitrate_parsing_robustness(self, mock_disk_usage):
         """
         Demonstrate that changing the note format NO LONGER breaks bitrate estimation.
         """
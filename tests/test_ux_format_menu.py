@@ -1,64 +1,29 @@
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
-
-# Add project root to sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Mock cv2 before importing obsbot_capture
-if "cv2" not in sys.modules:
-    sys.modules["cv2"] = MagicMock()
-
-# Ensure numpy is mocked if missing
-if "numpy" not in sys.modules:
-    sys.modules["numpy"] = MagicMock()
+from unittest.mock import MagicMock
 
+from ux_support import UXTestCase  # also puts the project root on sys.path
 import obsbot_capture
 
-class TestUXFormatMenu(unittest.TestCase):
-    def setUp(self):
-        # Force CV2_OK to True
-        self.original_cv2_ok = obsbot_capture.CV2_OK
-        obsbot_capture.CV2_OK = True
-
-        # Patch cv2 inside obsbot_capture
-        self.cv2_patcher = patch('obsbot_capture.cv2')
-        self.mock_cv2 = self.cv2_patcher.start()
+# The frame is only handed to cv2 (and sliced), never inspected: one for all tests
+_IMG_SENTINEL = MagicMock(name="img")
 
-        # Set constants
-        self.mock_cv2.FONT_HERSHEY_SIMPLEX = 0
-        self.mock_cv2.LINE_AA = 16
+_FORMAT_LABELS = frozenset(fmt["label"] for fmt in obsbot_capture.OUTPUT_FORMATS)
 
-        # Configure getTextSize to return a dummy size (width, height) + baseline
-        self.mock_cv2.getTextSize.return_value = ((100, 20), 5)
-
-        # Mock image
-        self.img = MagicMock()
-        self.w = 1920
-        self.h = 1080
-
-        # State setup
-        self.state = obsbot_capture.CameraState()
+class TestUXFormatMenu(UXTestCase):
+    def setUp(self):
+        super().setUp()
+        self.img = _IMG_SENTINEL
+        _IMG_SENTINEL.reset_mock()
         self.state.output_format_idx = 0 # Select first item
 
-    def tearDown(self):
-        obsbot_capture.CV2_OK = self.original_cv2_ok
-        self.cv2_patcher.stop()
-
     def test_format_menu_draws_items(self):
         """Test that format menu draws all items."""
         obsbot_capture._draw_format_menu(self.img, self.w, self.h, self.state)
 
         # Check that putText was called for each format label
-        labels_found = 0
-        for call in self.mock_cv2.putText.call_args_list:
-            args, _ = call
-            text = args[1]
-            if text in [fmt["label"] for fmt in obsbot_capture.OUTPUT_FORMATS]:
-                labels_found += 1
+        labels_found = sum(text in _FORMAT_LABELS for text in self.texts_drawn())
 
-        self.assertEqual(labels_found, len(obsbot_capture.OUTPUT_FORMATS),
+        self.assertEqual(labels_found, obsbot_capture.N_FORMATS,
                          "Should draw all format labels")
 
     def test_format_menu_selection_highlight(self):
@@ -69,15 +34,8 @@ class TestUXFormatMenu(unittest.TestCase):
         obsbot_capture._draw_format_menu(self.img, self.w, self.h, self.state)
 
         # Check that '>' is NOT drawn
-        indicator_found = False
-        for call in self.mock_cv2.putText.call_args_list:
-            args, _ = call
-            text = args[1]
-            if text == ">":
-                indicator_found = True
-                break
-
-        self.assertFalse(indicator_found, "Should NOT draw '>' selection indicator anymore")
+        self.assertNotIn(">", self.texts_drawn(),
+                         "Should NOT draw '>' selection indicator anymore")
 
         # Verify we draw 3 rectangles: Background, Highlight Bar, Border
         # (Original code drew 2)
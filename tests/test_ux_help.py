@@ -1,53 +1,32 @@
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
-
-# Add project root to sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Mock cv2 before importing obsbot_capture
-if "cv2" not in sys.modules:
-    sys.modules["cv2"] = MagicMock()
-
-# Ensure numpy is mocked if missing
-if "numpy" not in sys.modules:
-    sys.modules["numpy"] = MagicMock()
+from unittest.mock import MagicMock
 
+from ux_support import UXTestCase  # also puts the project root on sys.path
 import obsbot_capture
 
-class TestUXHelp(unittest.TestCase):
-    def setUp(self):
-        # Force CV2_OK to True
-        self.original_cv2_ok = obsbot_capture.CV2_OK
-        obsbot_capture.CV2_OK = True
+class _ImgStub:
+    """Stand-in frame: _draw_help only slices it and copies the slice."""
+    __slots__ = ("shape",)
 
-        # Patch cv2 inside obsbot_capture
-        self.cv2_patcher = patch('obsbot_capture.cv2')
-        self.mock_cv2 = self.cv2_patcher.start()
+    def __init__(self, shape):
+        self.shape = shape
 
-        # Set constants
-        self.mock_cv2.FONT_HERSHEY_SIMPLEX = 0
-        self.mock_cv2.LINE_AA = 16
+    def __getitem__(self, _key):
+        return self
 
-        # Configure getTextSize to return a dummy size (width, height) + baseline
-        self.mock_cv2.getTextSize.return_value = ((100, 20), 5)
-        # Mock addWeighted to just return the first image (simplified)
-        self.mock_cv2.addWeighted.return_value = MagicMock()
+    def copy(self):
+        return self
 
-        # Mock image
-        self.img = MagicMock()
-        self.img.copy.return_value = MagicMock()
-        self.img.shape = (1080, 1920, 3)
-        self.w = 1920
-        self.h = 1080
 
-        # State setup
-        self.state = obsbot_capture.CameraState()
+class TestUXHelp(UXTestCase):
+    @classmethod
+    def configure_cv2(cls, cv2):
+        # addWeighted just hands back an image (simplified)
+        cv2.addWeighted.return_value = MagicMock()
 
-    def tearDown(self):
-        obsbot_capture.CV2_OK = self.original_cv2_ok
-        self.cv2_patcher.stop()
+    def setUp(self):
+        super().setUp()
+        self.img = _ImgStub((1080, 1920, 3))
 
     def test_help_overlay_calls_drawing_functions(self):
         """Test that _draw_help calls cv2 drawing functions."""
@@ -65,10 +44,7 @@ class TestUXHelp(unittest.TestCase):
         obsbot_capture._draw_help(self.img, self.w, self.h, font)
 
         # Collect all text passed to putText
-        drawn_text = []
-        for call in self.mock_cv2.putText.call_args_list:
-            args, _ = call
-            drawn_text.append(args[1])
+        drawn_text = set(self.texts_drawn())
 
         # Verify specific new elements
         self.assertIn("KEYBOARD SHORTCUTS", drawn_text, "Should display title")
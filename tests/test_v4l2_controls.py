@@ -0,0 +1,154 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import struct
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import obsbot_capture
+
+# Fake camera: (id, type, name, min, max, step, default, flags)
+CONTROLS = [
+    (0x00980001, 6, b"User Controls",              0,    0,   0,    0, 0),
+    (0x00980913, 1, b"Gain",                       0,  100,   1,   50, 0),
+    (0x009a0902, 1, b"Exposure Time, Absolute",    1, 5000,   1,  156, 0),
+    (0x009a090a, 1, b"Focus, Absolute",            0, 1023,   1,  512, 0),
+    (0x009a090c, 2, b"Focus, Automatic Continuous", 0,   1,   1,    1, 1),
+]
+
+
+class FakeCamera:
+    def __init__(self):
+        self.values = {c[0]: c[6] for c in CONTROLS}
+        self.calls  = []
+
+    def ioctl(self, fd, req, buf, *args):
+        self.calls.append(req)
+        if req == obsbot_capture.VIDIOC_QUERYCTRL:
+            qid = struct.unpack_from("=I", buf)[0]
+            if not qid & obsbot_capture.V4L2_CTRL_FLAG_NEXT_CTRL:
+                raise OSError(22, "EINVAL")
+            base = qid & ~obsbot_capture.V4L2_CTRL_FLAG_NEXT_CTRL
+            nxt = next((c for c in CONTROLS if c[0] > base), None)
+            if nxt is None:
+                raise OSError(22, "EINVAL")
+            obsbot_capture._V4L2_QUERYCTRL.pack_into(buf, 0, *nxt, 0, 0)
+        elif req == obsbot_capture.VIDIOC_S_CTRL:
+            cid, val = obsbot_capture._V4L2_CONTROL.unpack(buf)
+            self.values[cid] = val
+        elif req == obsbot_capture.VIDIOC_G_CTRL:
+            cid, _ = obsbot_capture._V4L2_CONTROL.unpack(buf)
+            obsbot_capture._V4L2_CONTROL.pack_into(buf, 0, cid, self.values[cid])
+        return 0
+
+
+class TestV4L2Controls(unittest.TestCase):
+    def setUp(self):
+        self.cam = FakeCamera()
+        fcntl_mock = MagicMock()
+        fcntl_mock.ioctl.side_effect = self.cam.ioctl
+        for p in (patch.object(obsbot_capture, "fcntl", fcntl_mock, create=True),
+                  patch.object(obsbot_capture, "FCNTL_OK", True),
+                  patch.object(obsbot_capture.os, "open", return_value=99),
+                  patch.object(obsbot_capture.os, "close"),
+                  patch.dict(obsbot_capture._v4l2_devices, clear=True)):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_control_names_match_v4l2_ctl(self):
+        self.assertEqual(obsbot_capture._ctrl_var(b"Exposure Time, Absolute\0\0"),
+                         "exposure_time_absolute")
+        self.assertEqual(obsbot_capture._ctrl_var(b"White Balance Temperature, Auto"),
+                         "white_balance_temperature_auto")
+
+    def test_enumerate_skips_classes_and_disabled(self):
+        dev = obsbot_capture._v4l2_device("/dev/video0")
+        self.assertEqual(set(dev.controls), {"gain", "exposure_time_absolute", "focus_absolute"})
+        self.assertEqual(dev.query("focus_absolute")[2], 1023)
+
+    def test_set_and_get_use_ioctls(self):
+        with patch.object(obsbot_capture.subprocess, "run") as run:
+            self.assertTrue(obsbot_capture.v4l2_set("/dev/video0", "gain", 42))
+            self.assertEqual(obsbot_capture.v4l2_get("/dev/video0", "gain"), 42)
+            self.assertFalse(obsbot_capture.v4l2_set("/dev/video0", "no_such_control", 1))
+            run.assert_not_called()
+        # One open and enumeration, shared by every call
+        obsbot_capture.os.open.assert_called_once()
+
+    def test_query_controls_without_v4l2_ctl(self):
+        with patch.object(obsbot_capture.subprocess, "run") as run:
+            ctrls = obsbot_capture._diag_controls("/dev/video0")
+            run.assert_not_called()
+        self.assertEqual(ctrls["focus_absolute"], (0x009a090a, 0, 1023, 1, 512))
+        self.assertNotIn("focus_automatic_continuous", ctrls)
+        obsbot_capture.os.open.side_effect = OSError(2, "ENOENT")
+        obsbot_capture._v4l2_devices.clear()
+        self.assertIsNone(obsbot_capture.v4l2_query_controls("/dev/video0"))
+
+    def test_detect_focus_range(self):
+        state = MagicMock(device="/dev/video0", focus=2000)
+        obsbot_capture.detect_focus_range(state)
+        self.assertEqual(state.focus_max, 1023)
+        self.assertEqual(state.focus, 1023)
+
+    def test_focus_range_from_v4l2_ctl(self):
+        obsbot_capture.os.open.side_effect = OSError(2, "ENOENT")
+        listing = (b"User Controls\n\n"
+                   b"                     brightness 0x00980900 (int)    : min=0 max=100 step=1\n"
+                   b"                 focus_absolute 0x009a090a (int)    : min=0 max=1023 step=1"
+                   b" default=0 value=512 flags=inactive\n")
+        state = MagicMock(device="/dev/video0", focus=2000)
+        with patch.object(obsbot_capture.subprocess, "run",
+                          return_value=MagicMock(stdout=listing)):
+            obsbot_capture.detect_focus_range(state)
+        self.assertEqual(state.focus_max, 1023)
+        self.assertEqual(state.focus, 1023)
+
+    def test_falls_back_to_v4l2_ctl(self):
+        obsbot_capture.os.open.side_effect = OSError(2, "ENOENT")
+        with patch.object(obsbot_capture.subprocess, "run",
+                          return_value=MagicMock(returncode=0)) as run:
+            self.assertTrue(obsbot_capture.v4l2_set("/dev/video0", "gain", 42))
+            self.assertEqual(run.call_args[0][0][0], "v4l2-ctl")
+
+    def test_get_parses_v4l2_ctl_output(self):
+        obsbot_capture.os.open.side_effect = OSError(2, "ENOENT")
+        with patch.object(obsbot_capture.subprocess, "run",
+                          return_value=MagicMock(returncode=0, stdout="gain: 42\n")):
+            self.assertEqual(obsbot_capture.v4l2_get("/dev/video0", "gain"), 42)
+        with patch.object(obsbot_capture.subprocess, "run",
+                          return_value=MagicMock(returncode=0, stdout="garbage\n")):
+            self.assertIsNone(obsbot_capture.v4l2_get("/dev/video0", "gain"))
+
+    def test_apply_settings_batches_v4l2_ctl(self):
+        obsbot_capture.os.open.side_effect = OSError(2, "ENOENT")
+        state = MagicMock(device="/dev/video0", auto_exp=False, auto_wb=True, auto_focus=True,
+                          exposure=156, gain=50)
+        with patch.object(obsbot_capture.subprocess, "run",
+                          return_value=MagicMock(returncode=0)) as run:
+            obsbot_capture.apply_camera_settings(state)
+        self.assertEqual([c.args[0][-1] for c in run.call_args_list], [
+            "--set-ctrl=exposure_auto=1,white_balance_temperature_auto=1,"
+            "focus_automatic_continuous=1",
+            "--set-ctrl=gain=50,exposure_time_absolute=156",
+        ])
+
+    def test_rejected_value_keeps_fd(self):
+        obsbot_capture.v4l2_set("/dev/video0", "gain", 1)
+        obsbot_capture.fcntl.ioctl.side_effect = OSError(16, "EBUSY")
+        self.assertFalse(obsbot_capture.v4l2_set("/dev/video0", "gain", 2))
+        self.assertIsNone(obsbot_capture.v4l2_get("/dev/video0", "gain"))
+        self.assertIn("/dev/video0", obsbot_capture._v4l2_devices)
+        obsbot_capture.os.close.assert_not_called()
+
+    def test_failed_ioctl_reopens(self):
+        obsbot_capture.v4l2_set("/dev/video0", "gain", 1)
+        obsbot_capture.fcntl.ioctl.side_effect = OSError(19, "ENODEV")
+        self.assertFalse(obsbot_capture.v4l2_set("/dev/video0", "gain", 2))
+        self.assertNotIn("/dev/video0", obsbot_capture._v4l2_devices)
+
+
+if __name__ == "__main__":
+    unittest.main()
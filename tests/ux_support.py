@@ -0,0 +1,48 @@
+"""Shared fixture for the overlay (UX) tests."""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import obsbot_capture
+
+
+class UXTestCase(unittest.TestCase):
+    """Draws against a configured cv2 mock, patched into obsbot_capture once
+    per class. Subclasses add module attributes via ``module_patches`` and
+    extra cv2 return values via ``configure_cv2``."""
+    module_patches = {}
+    w = 1920
+    h = 1080
+
+    @classmethod
+    def configure_cv2(cls, cv2):
+        """Hook for per-class cv2 return values."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cv2 = MagicMock()
+        cv2.FONT_HERSHEY_SIMPLEX = 0
+        cv2.LINE_AA = 16
+        # Dummy size (width, height) + baseline
+        cv2.getTextSize.return_value = ((100, 20), 5)
+        cls.configure_cv2(cv2)
+        cls.mock_cv2 = cv2
+
+        patcher = patch.multiple(obsbot_capture, create=True,
+                                 cv2=cv2, CV2_OK=True, **cls.module_patches)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+    def setUp(self):
+        # reset_mock keeps constants and return values, drops call history
+        self.mock_cv2.reset_mock()
+        self.state = obsbot_capture.CameraState()
+
+    def texts_drawn(self):
+        """Every string passed to putText, in call order."""
+        return [call.args[1] for call in self.mock_cv2.putText.call_args_list]